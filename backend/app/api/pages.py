@@ -96,7 +96,10 @@ async def update_page(
 ):
     """Update a story page"""
     
-    updated_page = await db.update_page(page_id, updates)
+    try:
+        updated_page = await db.update_page(page_id, updates)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated_page:
         raise HTTPException(status_code=404, detail="Page not found")
     
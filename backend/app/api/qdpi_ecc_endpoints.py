@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional, Tuple
 import time
 import json
+import base64
 import logging
 
 # Import our ECC integration
@@ -20,6 +21,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from app.qdpi_ecc_integration import QDPIECCBackend, ProtectedQDPIMessage
+from app.qdpi_ecc_pool import QDPIECCWorkerPool
+from app.qdpi_canon import CANON, QDPINarrative
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,6 +33,12 @@ router = APIRouter(prefix="/qdpi/ecc", tags=["QDPI Error Correction"])
 # Global backend instance (in production, this would be dependency-injected)
 ecc_backend = QDPIECCBackend()
 
+# CPU-bound ECC work runs in worker processes; ecc_backend keeps ids and storage
+ecc_pool = QDPIECCWorkerPool(ecc_backend)
+
+# Upper bound on messages per batch request
+MAX_BATCH_SIZE = 1000
+
 # Pydantic models for API
 class SymbolSequenceItem(BaseModel):
     """Single symbol in a QDPI sequence"""
@@ -48,6 +57,14 @@ class NarrativeDecodeRequest(BaseModel):
     original_length: int = Field(..., description="Original sequence length")
     block_id: Optional[int] = Field(None, description="Block identifier for tracking")
 
+class NarrativeEncodeBatchRequest(BaseModel):
+    """Request to encode many narratives in one call"""
+    narratives: List[NarrativeEncodeRequest] = Field(..., description="Narratives to encode")
+
+class NarrativeDecodeBatchRequest(BaseModel):
+    """Request to decode many protected narratives in one call"""
+    messages: List[NarrativeDecodeRequest] = Field(..., description="Protected narratives to decode")
+
 class TransmissionTestRequest(BaseModel):
     """Request to test transmission error simulation"""
     block_id: int = Field(..., description="Block ID to test")
@@ -71,6 +88,19 @@ class DecodedNarrativeResponse(BaseModel):
     recovery_successful: bool
     performance_target_met: bool
 
+class ProtectedNarrativeBatchResponse(BaseModel):
+    """Response containing many protected narratives"""
+    results: List[ProtectedNarrativeResponse]
+    count: int
+    total_time_ms: float
+
+class DecodedNarrativeBatchResponse(BaseModel):
+    """Response containing many decoded narratives"""
+    results: List[DecodedNarrativeResponse]
+    count: int
+    recovered_count: int
+    total_time_ms: float
+
 class TransmissionTestResponse(BaseModel):
     """Response containing transmission test results"""
     test_successful: bool
@@ -97,22 +127,8 @@ async def encode_narrative_with_protection(
         # Convert Pydantic models to tuples
         symbol_sequence = [(item.symbol_name, item.rotation) for item in request.symbol_sequence]
         
-        # Encode with protection
-        protected_msg = ecc_backend.encode_narrative_with_protection(
-            request.description, 
-            symbol_sequence
-        )
-        
-        # Generate response
-        symbol_sequence_str = []
-        for sym_data in protected_msg.original_symbols:
-            symbol_sequence_str.append(f"{sym_data['symbol']['name']}@{sym_data['symbol']['rotation']}°")
-        
-        narrative_meaning = " → ".join([sym['canon_meaning'] for sym in protected_msg.original_symbols])
-        
-        # Encode protected data as base64 for JSON transport
-        import base64
-        protected_data_b64 = base64.b64encode(protected_msg.protected_data).decode('utf-8')
+        # Encode with protection in the worker pool
+        protected_msg = await ecc_pool.encode(request.description, symbol_sequence)
         
         # Log the encoding for monitoring
         background_tasks.add_task(
@@ -122,15 +138,7 @@ async def encode_narrative_with_protection(
             protected_msg.protection_metadata['encoding_time_ms']
         )
         
-        return ProtectedNarrativeResponse(
-            block_id=protected_msg.block_id,
-            original_symbols=protected_msg.original_symbols,
-            narrative_meaning=narrative_meaning,
-            symbol_sequence=" → ".join(symbol_sequence_str),
-            protection_metadata=protected_msg.protection_metadata,
-            encoding_time_ms=protected_msg.protection_metadata['encoding_time_ms'],
-            protected_data_base64=protected_data_b64
-        )
+        return _protected_response(protected_msg)
         
     except Exception as e:
         log.error(f"Error encoding narrative: {e}")
@@ -151,19 +159,15 @@ async def decode_protected_narrative(
     """
     try:
         # Decode base64 data
-        import base64
         protected_data = base64.b64decode(request.protected_data.encode('utf-8'))
         
-        # Decode with error correction
-        recovered_symbols, decode_stats = ecc_backend.decode_protected_narrative(
+        # Decode with error correction in the worker pool
+        recovered, decode_stats = await ecc_pool.decode(
             protected_data,
             request.original_length,
             request.block_id
         )
         
-        # Generate narrative meaning
-        narrative_meaning = " → ".join([sym['canon_meaning'] for sym in recovered_symbols])
-        
         # Log the decoding for monitoring
         background_tasks.add_task(
             log_narrative_decoding,
@@ -172,18 +176,70 @@ async def decode_protected_narrative(
             decode_stats['recovery_successful']
         )
         
-        return DecodedNarrativeResponse(
-            recovered_symbols=recovered_symbols,
-            narrative_meaning=narrative_meaning,
-            decode_statistics=decode_stats,
-            recovery_successful=decode_stats['recovery_successful'],
-            performance_target_met=decode_stats['meets_performance_target']
-        )
+        return _decoded_response(recovered, decode_stats)
         
     except Exception as e:
         log.error(f"Error decoding narrative: {e}")
         raise HTTPException(status_code=400, detail=f"Decoding failed: {str(e)}")
 
+@router.post("/encode-batch", response_model=ProtectedNarrativeBatchResponse)
+async def encode_narrative_batch(
+    request: NarrativeEncodeBatchRequest
+) -> ProtectedNarrativeBatchResponse:
+    """
+    Encode many QDPI narratives with error correction in one request.
+    
+    Narratives are spread across the ECC worker processes; results come back
+    in request order with consecutive block ids.
+    """
+    _check_batch_size(len(request.narratives))
+    start_time = time.time()
+    try:
+        protected_msgs = await ecc_pool.encode_batch([
+            (narrative.description, [(item.symbol_name, item.rotation) for item in narrative.symbol_sequence])
+            for narrative in request.narratives
+        ])
+        
+        return ProtectedNarrativeBatchResponse(
+            results=[_protected_response(msg) for msg in protected_msgs],
+            count=len(protected_msgs),
+            total_time_ms=(time.time() - start_time) * 1000
+        )
+        
+    except Exception as e:
+        log.error(f"Error encoding narrative batch: {e}")
+        raise HTTPException(status_code=400, detail=f"Batch encoding failed: {str(e)}")
+
+@router.post("/decode-batch", response_model=DecodedNarrativeBatchResponse)
+async def decode_narrative_batch(
+    request: NarrativeDecodeBatchRequest
+) -> DecodedNarrativeBatchResponse:
+    """
+    Decode and error-correct many protected QDPI narratives in one request.
+    
+    Messages are spread across the ECC worker processes; results come back
+    in request order.
+    """
+    _check_batch_size(len(request.messages))
+    start_time = time.time()
+    try:
+        decoded = await ecc_pool.decode_batch([
+            (base64.b64decode(message.protected_data.encode('utf-8')), message.original_length, message.block_id)
+            for message in request.messages
+        ])
+        
+        results = [_decoded_response(recovered, stats) for recovered, stats in decoded]
+        return DecodedNarrativeBatchResponse(
+            results=results,
+            count=len(results),
+            recovered_count=sum(1 for result in results if result.recovery_successful),
+            total_time_ms=(time.time() - start_time) * 1000
+        )
+        
+    except Exception as e:
+        log.error(f"Error decoding narrative batch: {e}")
+        raise HTTPException(status_code=400, detail=f"Batch decoding failed: {str(e)}")
+
 @router.post("/test-transmission", response_model=TransmissionTestResponse)
 async def test_transmission_errors(
     request: TransmissionTestRequest
@@ -203,8 +259,8 @@ async def test_transmission_errors(
         
         protected_msg = ecc_backend.protected_messages[request.block_id]
         
-        # Simulate transmission and recovery
-        result = ecc_backend.simulate_transmission_and_recovery(
+        # Simulate transmission and recovery in the worker pool
+        result = await ecc_pool.simulate_transmission(
             protected_msg, 
             request.error_rate
         )
@@ -240,6 +296,8 @@ async def get_performance_summary() -> Dict[str, Any]:
             "system_status": "operational",
             "performance_summary": perf_summary,
             "total_messages_processed": ecc_backend.message_counter,
+            "worker_pool": ecc_pool.get_stats(),
+            "message_store": ecc_backend.protected_messages.get_stats(),
             "meets_specifications": {
                 "decode_time_target": perf_summary['combined_performance']['meets_4ms_target'],
                 "error_correction_capacity": "16 byte errors per 255-byte block",
@@ -251,6 +309,24 @@ async def get_performance_summary() -> Dict[str, Any]:
         log.error(f"Error getting performance summary: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get performance summary: {str(e)}")
 
+@router.get("/stats")
+async def get_latency_stats() -> Dict[str, Any]:
+    """
+    Get latency percentiles for every ECC stage across all workers.
+
+    Each stage reports count, p50/p95/p99/max and the share of calls under the
+    4ms target, read from fixed-size histograms.
+    """
+    try:
+        return {
+            "stages": ecc_backend.get_latency_stats(),
+            "worker_pool": ecc_pool.get_stats()
+        }
+
+    except Exception as e:
+        log.error(f"Error getting latency stats: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get latency stats: {str(e)}")
+
 @router.get("/health")
 async def health_check() -> Dict[str, str]:
     """
@@ -259,13 +335,14 @@ async def health_check() -> Dict[str, str]:
     try:
         # Test basic encoding/decoding
         test_sequence = [("glyph_marrow", 0), ("VALIDATE", 270)]
-        test_protected = ecc_backend.encode_narrative_with_protection(
+        test_protected = ecc_pool.backend.build_protected_message(
             "Health check test", 
-            test_sequence
+            test_sequence,
+            block_id=-1
         )
         
-        # Test decoding
-        recovered, _ = ecc_backend.decode_protected_narrative(
+        # Test decoding through the worker pool
+        recovered, _ = await ecc_pool.decode(
             test_protected.protected_data,
             len(test_sequence)
         )
@@ -285,34 +362,24 @@ async def validate_symbol_against_canon(symbol_name: str) -> Dict[str, Any]:
     Validate a symbol name against the QDPI Canon.
     """
     try:
-        symbol_id = ecc_backend._get_symbol_id_from_canon(symbol_name)
+        symbol_id = CANON.symbol_id(symbol_name)
         
-        if symbol_id == 0 and symbol_name != "an_author":
+        if symbol_id is None:
             return {
                 "valid": False,
                 "symbol_name": symbol_name,
                 "error": "Symbol not found in QDPI Canon"
             }
-        
-        # Get symbol type and meaning
-        if symbol_id <= 15:
-            symbol_type = "character"
-        elif 16 <= symbol_id <= 47:
-            symbol_type = "hidden_symbol" 
-        else:
-            symbol_type = "meta_verb"
             
         return {
             "valid": True,
             "symbol_name": symbol_name,
             "symbol_id": symbol_id,
-            "symbol_type": symbol_type,
+            "symbol_type": CANON.symbol_types[symbol_id],
             "available_rotations": [0, 90, 180, 270],
             "canonical_meanings": {
-                0: ecc_backend._get_canon_meaning(symbol_name, 0),
-                90: ecc_backend._get_canon_meaning(symbol_name, 90),
-                180: ecc_backend._get_canon_meaning(symbol_name, 180),
-                270: ecc_backend._get_canon_meaning(symbol_name, 270)
+                rotation: CANON.meaning(symbol_name, rotation)
+                for rotation in (0, 90, 180, 270)
             }
         }
         
@@ -320,6 +387,49 @@ async def validate_symbol_against_canon(symbol_name: str) -> Dict[str, Any]:
         log.error(f"Error validating symbol {symbol_name}: {e}")
         raise HTTPException(status_code=400, detail=f"Validation failed: {str(e)}")
 
+async def close_ecc_pool():
+    """Stop ECC worker processes and close the message store (on application shutdown)"""
+    ecc_pool.shutdown(wait=False)
+    ecc_backend.protected_messages.close()
+
+# Response helpers
+def _protected_response(protected_msg: ProtectedQDPIMessage) -> ProtectedNarrativeResponse:
+    """Build the API response for a protected narrative"""
+    symbol_sequence_str = [
+        f"{sym_data['symbol']['name']}@{sym_data['symbol']['rotation']}°"
+        for sym_data in protected_msg.original_symbols
+    ]
+    narrative_meaning = " → ".join([sym['canon_meaning'] for sym in protected_msg.original_symbols])
+    
+    return ProtectedNarrativeResponse(
+        block_id=protected_msg.block_id,
+        original_symbols=protected_msg.original_symbols,
+        narrative_meaning=narrative_meaning,
+        symbol_sequence=" → ".join(symbol_sequence_str),
+        protection_metadata=protected_msg.protection_metadata,
+        encoding_time_ms=protected_msg.protection_metadata['encoding_time_ms'],
+        # Encode protected data as base64 for JSON transport
+        protected_data_base64=base64.b64encode(protected_msg.protected_data).decode('utf-8')
+    )
+
+def _decoded_response(recovered: QDPINarrative,
+                      decode_stats: Dict[str, Any]) -> DecodedNarrativeResponse:
+    """Build the API response for a columnar decoded narrative"""
+    return DecodedNarrativeResponse(
+        recovered_symbols=recovered.to_records(),
+        narrative_meaning=recovered.narrative_meaning(),
+        decode_statistics=decode_stats,
+        recovery_successful=decode_stats['recovery_successful'],
+        performance_target_met=decode_stats['meets_performance_target']
+    )
+
+def _check_batch_size(size: int):
+    """Reject empty or oversized batch requests"""
+    if size == 0:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+    if size > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch too large: {size} > {MAX_BATCH_SIZE}")
+
 # Background task functions
 async def log_narrative_encoding(block_id: int, sequence_length: int, encoding_time_ms: float):
     """Log narrative encoding for monitoring"""
@@ -9,12 +9,11 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
-# Import retrieval functionality from retrieval_api module
-from ..retrieval_api import (
-    SearchQuery, SearchResponse, PageResponse,
-    cassandra_session, get_embedding, truncate_to_tokens,
-    tokenizer_service
-)
+# Import retrieval functionality from retrieval_api module. Services are read
+# through the module at request time, since they are created in its lifespan.
+from .. import retrieval_api
+from ..retrieval_api import SearchQuery, SearchResponse, PageResponse, truncate_to_tokens
+from ..cassandra_async import execute_async, execute_one
 
 logger = logging.getLogger(__name__)
 
@@ -31,19 +30,13 @@ async def read_page(page_id: str):
     Returns:
         PageResponse with title, content, symbol_id, tokens, and page_index
     """
+    cassandra_session = retrieval_api.cassandra_session
     if not cassandra_session:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    # Query page by primary key
-    query = """
-    SELECT page_id, title, content, symbol_id, tokens, page_index
-    FROM pages 
-    WHERE page_id = ?
-    """
-    
     try:
-        result = cassandra_session.execute(query, [page_id])
-        row = result.one()
+        # Query page by primary key (token-aware: goes straight to a replica)
+        row = await execute_one(cassandra_session, retrieval_api.get_statements().bind('pages.read', [page_id]))
         
         if not row:
             raise HTTPException(status_code=404, detail=f"Page {page_id} not found")
@@ -80,10 +73,12 @@ async def semantic_search(query: SearchQuery):
     """
     start_time = time.time()
     
+    cassandra_session = retrieval_api.cassandra_session
     if not cassandra_session:
         raise HTTPException(status_code=503, detail="Database not available")
     
     # Validate query length
+    tokenizer_service = retrieval_api.tokenizer_service
     if tokenizer_service:
         query_tokens = tokenizer_service.count_tokens(query.q)
         if query_tokens > 200:
@@ -94,30 +89,24 @@ async def semantic_search(query: SearchQuery):
     
     try:
         # Generate embedding for query
-        query_embedding = get_embedding(query.q)
+        query_embedding = await retrieval_api.get_embedding_async(query.q)
         
-        # Prepare CQL query with vector search
+        # Bind the vector search statement
         if query.symbol_id:
             # Filter by character symbol
-            cql_query = """
-            SELECT page_id, title, content, symbol_id, page_index, 
-                   similarity_cosine(embedding, ?) as score
-            FROM pages 
-            WHERE symbol_id = ? AND embedding ANN OF ? LIMIT ?
-            """
-            params = [query_embedding, query.symbol_id, query_embedding, query.top_k]
+            statement = retrieval_api.get_statements().bind(
+                'pages.search_by_symbol',
+                [query_embedding, query.symbol_id, query_embedding, query.top_k]
+            )
         else:
             # Search all pages
-            cql_query = """
-            SELECT page_id, title, content, symbol_id, page_index,
-                   similarity_cosine(embedding, ?) as score
-            FROM pages 
-            WHERE embedding ANN OF ? LIMIT ?
-            """
-            params = [query_embedding, query_embedding, query.top_k]
+            statement = retrieval_api.get_statements().bind(
+                'pages.search',
+                [query_embedding, query_embedding, query.top_k]
+            )
         
         # Execute search
-        result = cassandra_session.execute(cql_query, params)
+        result = await execute_async(cassandra_session, statement)
         
         # Process results
         search_results = []
@@ -151,42 +140,20 @@ async def get_corpus_stats():
     """
     Get statistics about the corpus.
     
+    Served from the in-memory rollup of the corpus_stats table, so this is a
+    constant-time read that never scans the pages table.
+    
     Returns:
-        Dictionary with total_pages, total_tokens, pages_by_character, and model info
+        Dictionary with total_pages, total_tokens, pages_by_character,
+        embedding coverage and model info
     """
-    if not cassandra_session:
+    if not retrieval_api.cassandra_session:
         raise HTTPException(status_code=503, detail="Database not available")
+    if retrieval_api.corpus_stats.loaded_at is None:
+        raise HTTPException(status_code=503, detail="Corpus statistics not loaded yet")
     
-    try:
-        # Count total pages
-        total_pages_result = cassandra_session.execute("SELECT COUNT(*) FROM pages")
-        total_pages = total_pages_result.one().count
-        
-        # Count pages by character (Note: This query might be slow without proper indexing)
-        symbol_counts_result = cassandra_session.execute("""
-            SELECT symbol_id, COUNT(*) as count 
-            FROM pages 
-            GROUP BY symbol_id 
-            ALLOW FILTERING
-        """)
-        
-        symbol_counts = {}
-        for row in symbol_counts_result:
-            if row.symbol_id:
-                symbol_counts[row.symbol_id] = row.count
-        
-        # Get total token count
-        token_sum_result = cassandra_session.execute("SELECT SUM(tokens) FROM pages")
-        total_tokens = token_sum_result.one().system_sum_tokens or 0
-        
-        return {
-            "total_pages": total_pages,
-            "total_tokens": total_tokens,
-            "pages_by_character": symbol_counts,
-            "embedding_model": os.getenv("EMBED_MODEL", "text-embedding-3-small"),
-            "tokenizer_available": tokenizer_service is not None
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get statistics")
\ No newline at end of file
+    return {
+        **retrieval_api.corpus_stats.get_stats(),
+        "embedding_model": os.getenv("EMBED_MODEL", "text-embedding-3-small"),
+        "tokenizer_available": retrieval_api.tokenizer_service is not None
+    }
\ No newline at end of file
@@ -7,10 +7,12 @@ from pathlib import Path
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File
 from pydantic import BaseModel
 import chromadb
-from sentence_transformers import SentenceTransformer
 from PIL import Image
 import io
 
+from ..embedding_cache import get_embedding_cache
+from ..model_registry import get_model_registry
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/symbol-search", tags=["symbol-search"])
@@ -18,7 +20,6 @@ router = APIRouter(prefix="/api/v1/symbol-search", tags=["symbol-search"])
 # Global clients
 _client = None
 _collection = None
-_model = None
 
 def get_chromadb_client():
     """Get or create ChromaDB client."""
@@ -33,13 +34,13 @@ def get_chromadb_client():
         )
     return _client, _collection
 
+def get_embedding_model_name() -> str:
+    """Name of the CLIP model used for symbol embeddings."""
+    return os.getenv("SREC_EMBED_MODEL", "sentence-transformers/clip-ViT-B-32")
+
 def get_embedding_model():
-    """Get or create embedding model."""
-    global _model
-    if _model is None:
-        model_name = os.getenv("SREC_EMBED_MODEL", "sentence-transformers/clip-ViT-B-32")
-        _model = SentenceTransformer(model_name)
-    return _model
+    """Get the shared CLIP model from the process-wide registry."""
+    return get_model_registry().get(get_embedding_model_name())
 
 class SymbolSearchRequest(BaseModel):
     """Request for symbol search by embedding."""
@@ -113,11 +114,14 @@ async def search_symbols_by_text(request: TextSearchRequest) -> SymbolSearchResp
     The text is converted to an embedding using CLIP.
     """
     try:
-        model = get_embedding_model()
         _, collection = get_chromadb_client()
         
-        # Convert text to embedding
-        query_embedding = model.encode(request.query_text).tolist()
+        # Convert text to embedding (repeat queries skip the model entirely)
+        query_embedding = get_embedding_cache().get_or_compute(
+            get_embedding_model_name(),
+            request.query_text,
+            lambda text: get_embedding_model().encode(text).tolist()
+        )
         
         # Query ChromaDB
         results = collection.query(
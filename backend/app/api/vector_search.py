@@ -220,23 +220,29 @@ async def explore_content(
         )
     
     try:
-        if not themes:
-            # Default exploration query
-            query = "consciousness mystery philosophy narrative meaning"
-        else:
-            # Combine themes into search query
-            query = " ".join(themes)
-        
         # Add character context if specified
-        if character:
-            query += f" character:{character.replace('-', ' ')}"
+        context = f" character:{character.replace('-', ' ')}" if character else ""
         
-        # Perform semantic search
-        results = await db.search_similar_pages(
-            query_text=query,
-            limit=limit,
-            content_type='page'
-        )
+        if len(themes) > 1 and db.vector_service:
+            # One query vector per theme, all scored against the index in one kernel call
+            embedded = await db.vector_service.embed_batch([
+                (theme + context, f"theme-{i}", 'query') for i, theme in enumerate(themes)
+            ])
+            results = await db.search_similar_embeddings(
+                [result.embedding for result in embedded],
+                limit=limit,
+                content_type='page'
+            )
+        else:
+            # Default exploration query, or the single theme
+            query = " ".join(themes) if themes else "consciousness mystery philosophy narrative meaning"
+            
+            # Perform semantic search
+            results = await db.search_similar_pages(
+                query_text=query + context,
+                limit=limit,
+                content_type='page'
+            )
         
         # If character filter specified, apply post-filtering
         if character:
@@ -276,6 +282,7 @@ async def get_search_status(db = Depends(get_database)):
                 "database_type": "cassandra",
                 "vector_service": "enabled",
                 "default_model": getattr(vector_service, 'default_model', 'unknown'),
+                "embedding_batchers": vector_service.get_batcher_stats(),
                 "features": [
                     "semantic_search",
                     "similarity_matching", 
@@ -0,0 +1,164 @@
+"""
+Incremental BM25 inverted index for keyword retrieval.
+
+Postings map each term to the documents (integer rows) containing it and the
+term frequency there. Scoring only touches the postings of the query terms,
+so a keyword query costs time proportional to those posting lists rather
+than to the size of the corpus.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+
+class BM25Index:
+    """Okapi BM25 over integer document ids with incremental updates."""
+
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization strength
+        """
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._lengths
+
+    @property
+    def average_length(self) -> float:
+        return self._total_length / len(self._lengths) if self._lengths else 0.0
+
+    def add(self, doc_id: int, tokens: Sequence[str]):
+        """Index a document, replacing any previous version with the same id."""
+        with self._lock:
+            if doc_id in self._lengths:
+                self.remove(doc_id)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._doc_terms[doc_id] = tuple(counts)
+            self._lengths[doc_id] = len(tokens)
+            self._total_length += len(tokens)
+
+    def remove(self, doc_id: int) -> bool:
+        """Drop a document from the posting lists of its terms."""
+        with self._lock:
+            length = self._lengths.pop(doc_id, None)
+            if length is None:
+                return False
+            self._total_length -= length
+            for term in self._doc_terms.pop(doc_id):
+                postings = self._postings[term]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[term]
+            return True
+
+    def document_frequency(self, term: str) -> int:
+        return len(self._postings.get(term, ()))
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (always positive)."""
+        df = self.document_frequency(term)
+        return math.log(1.0 + (len(self._lengths) - df + 0.5) / (df + 0.5))
+
+    def intersect(self, terms: Iterable[str], restrict: Optional[Set[int]] = None) -> Set[int]:
+        """Documents containing every term, walking the shortest posting list first."""
+        with self._lock:
+            lists = [self._postings.get(term, {}) for term in set(terms)]
+            if restrict is not None:
+                lists.append(restrict)
+            if not lists:
+                return set()
+            lists.sort(key=len)
+            matches = set(lists[0])
+            for postings in lists[1:]:
+                matches = {doc_id for doc_id in matches if doc_id in postings}
+                if not matches:
+                    break
+            return matches
+
+    def search(self, terms: Sequence[str], restrict: Optional[Set[int]] = None,
+               require_all: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BM25 scores for the documents matching a query.
+
+        Args:
+            terms: Query tokens (repeats count as extra weight, as in BM25)
+            restrict: Only score documents in this set
+            require_all: Only score documents containing every term
+
+        Returns:
+            (doc_ids, scores) arrays for matching documents, unordered
+        """
+        with self._lock:
+            if not self._lengths or not terms:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+            if require_all:
+                allowed = self.intersect(terms, restrict)
+                if not allowed:
+                    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+            else:
+                allowed = restrict
+
+            avgdl = self.average_length or 1.0
+            doc_parts: List[np.ndarray] = []
+            score_parts: List[np.ndarray] = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                if allowed is not None:
+                    if len(allowed) < len(postings):
+                        items = [(d, postings[d]) for d in allowed if d in postings]
+                    else:
+                        items = [(d, tf) for d, tf in postings.items() if d in allowed]
+                    if not items:
+                        continue
+                    doc_ids = np.fromiter((d for d, _ in items), dtype=np.int64, count=len(items))
+                    tfs = np.fromiter((tf for _, tf in items), dtype=np.float32, count=len(items))
+                else:
+                    doc_ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                    tfs = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+                lengths = np.fromiter((self._lengths[d] for d in doc_ids.tolist()),
+                                      dtype=np.float32, count=len(doc_ids))
+                norm = self.k1 * (1.0 - self.b + self.b * lengths / avgdl)
+                doc_parts.append(doc_ids)
+                score_parts.append(self.idf(term) * tfs * (self.k1 + 1.0) / (tfs + norm))
+
+            if not doc_parts:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+            doc_ids, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(score_parts)).astype(np.float32)
+            return doc_ids, scores
+
+    def get_stats(self) -> Dict[str, float]:
+        """Index size."""
+        with self._lock:
+            return {
+                'documents': len(self._lengths),
+                'terms': len(self._postings),
+                'average_length': self.average_length
+            }
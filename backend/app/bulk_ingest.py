@@ -0,0 +1,212 @@
+"""
+Bulk writes for corpus ingest.
+
+Creating one page through Stargate costs six sequential-ish HTTP requests. For
+bulk loads the rows of many pages are instead written over the native driver:
+rows that share a partition are grouped into small UNLOGGED batches (one
+mutation per partition, no batchlog), and the batches run with a bounded
+number of requests in flight. The bound adapts: it shrinks sharply when the
+cluster answers with timeouts or overload errors and grows back slowly while
+writes succeed, so a load runs as fast as the cluster absorbs it.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cassandra.query import BatchStatement, BatchType, UNSET_VALUE
+
+from .cassandra_async import execute_async
+from .cql_statements import StatementRegistry
+
+logger = logging.getLogger(__name__)
+
+# Partition key columns of every table bulk ingest writes to
+PARTITION_KEYS: Dict[str, Tuple[str, ...]] = {
+    'story_pages': ('id',),
+    'pages_by_symbol': ('symbol_id', 'page_type'),
+    'pages_by_section': ('section',),
+    'pages_by_parent': ('parent_id',),
+    'recent_pages': ('bucket',),
+    'vector_embeddings_by_bucket': ('content_type', 'bucket'),
+}
+
+DEFAULT_MAX_IN_FLIGHT = 64
+DEFAULT_MAX_BATCH_STATEMENTS = 20
+DEFAULT_MAX_RETRIES = 5
+
+# Errors that mean "slow down" rather than "this write is wrong"
+BACKPRESSURE_ERRORS = {
+    'OperationTimedOut', 'WriteTimeout', 'ReadTimeout', 'Unavailable',
+    'OverloadedErrorMessage', 'CoordinationFailure', 'TimeoutError'
+}
+
+
+def is_backpressure(error: BaseException) -> bool:
+    return type(error).__name__ in BACKPRESSURE_ERRORS
+
+
+class AdaptiveWindow:
+    """Limit on requests in flight: additive increase, multiplicative decrease."""
+
+    def __init__(self, maximum: int = DEFAULT_MAX_IN_FLIGHT, minimum: int = 1, initial: Optional[int] = None):
+        """
+        Initialize the window.
+
+        Args:
+            maximum: Upper bound on requests in flight
+            minimum: Lower bound the window never shrinks below
+            initial: Starting size (defaults to a quarter of maximum)
+        """
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = float(initial if initial is not None else max(self.minimum, self.maximum // 4))
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        # Roughly +1 per window's worth of successful requests
+        self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+    def on_backpressure(self):
+        self.limit = max(float(self.minimum), self.limit / 2.0)
+
+
+@dataclass
+class IngestReport:
+    """What a bulk ingest wrote and how fast."""
+    pages: int = 0
+    rows: int = 0
+    requests: int = 0
+    batches: int = 0
+    retries: int = 0
+    elapsed_seconds: float = 0.0
+    window: float = 0.0
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pages': self.pages,
+            'rows': self.rows,
+            'requests': self.requests,
+            'batches': self.batches,
+            'retries': self.retries,
+            'elapsed_seconds': round(self.elapsed_seconds, 3),
+            'pages_per_second': round(self.pages_per_second, 1),
+            'window': round(self.window, 1),
+            'failed': list(self.failed)
+        }
+
+
+class BulkRowWriter:
+    """Writes (table, row dict) pairs grouped by partition with adaptive concurrency."""
+
+    def __init__(self,
+                 session: Any,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 max_batch_statements: int = DEFAULT_MAX_BATCH_STATEMENTS,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_delay: float = 0.05):
+        """
+        Initialize the writer.
+
+        Args:
+            session: Cassandra session bound to the keyspace
+            max_in_flight: Upper bound on concurrent requests
+            max_batch_statements: Rows per UNLOGGED batch (all in one partition)
+            max_retries: Attempts per request after a backpressure error
+            retry_delay: Base delay before a retry (doubles per attempt)
+        """
+        self.session = session
+        self.statements = StatementRegistry(session, statements={})
+        self.window = AdaptiveWindow(maximum=max_in_flight)
+        self.max_batch_statements = max(1, max_batch_statements)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def _statement_for(self, table: str, columns: Tuple[str, ...]) -> str:
+        name = f"bulk.{table}({','.join(columns)})"
+        if name not in self.statements.statements:
+            placeholders = ', '.join('?' for _ in columns)
+            self.statements.register(
+                name, f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+            )
+        return name
+
+    def _bind(self, name: str, columns: Tuple[str, ...], row: Dict[str, Any]) -> Any:
+        # Unset (not null) for missing values, so bulk loads write no tombstones
+        return self.statements.bind(name, [
+            UNSET_VALUE if row.get(column) is None else row[column]
+            for column in columns
+        ])
+
+    def _requests(self, rows: Sequence[Tuple[str, Dict[str, Any]]]) -> Tuple[List[Any], int]:
+        """Group rows by partition into single statements and UNLOGGED batches."""
+        partitions: Dict[Tuple[str, Tuple[Any, ...]], List[Any]] = {}
+        for table, row in rows:
+            columns = tuple(row)
+            name = self._statement_for(table, columns)
+            key = tuple(row.get(column) for column in PARTITION_KEYS.get(table, columns[:1]))
+            partitions.setdefault((table, key), []).append(self._bind(name, columns, row))
+
+        requests, batches = [], 0
+        for statements in partitions.values():
+            for start in range(0, len(statements), self.max_batch_statements):
+                chunk = statements[start:start + self.max_batch_statements]
+                if len(chunk) == 1:
+                    requests.append(chunk[0])
+                    continue
+                batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+                for statement in chunk:
+                    batch.add(statement)
+                requests.append(batch)
+                batches += 1
+        return requests, batches
+
+    async def _execute(self, request: Any, report: IngestReport):
+        attempt = 0
+        while True:
+            await self.window.acquire()
+            try:
+                await execute_async(self.session, request, all_pages=False)
+            except Exception as e:
+                if not is_backpressure(e) or attempt >= self.max_retries:
+                    raise
+                self.window.on_backpressure()
+                report.retries += 1
+            else:
+                self.window.on_success()
+                return
+            finally:
+                await self.window.release()
+            await asyncio.sleep(self.retry_delay * (2 ** attempt))
+            attempt += 1
+
+    async def write(self, rows: Sequence[Tuple[str, Dict[str, Any]]], report: IngestReport):
+        """Write rows, adding request counts to the report; raises on a failed request."""
+        if not rows:
+            return
+        # Preparing is a blocking round trip per new statement; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        requests, batches = await loop.run_in_executor(None, self._requests, rows)
+        await asyncio.gather(*(self._execute(request, report) for request in requests))
+        report.rows += len(rows)
+        report.requests += len(requests)
+        report.batches += batches
+        report.window = self.window.limit
+
@@ -0,0 +1,62 @@
+"""
+Asyncio bridge for the Cassandra driver.
+
+`session.execute` blocks the calling thread until the coordinator answers,
+which inside an `async def` handler freezes the whole event loop. The driver's
+own `execute_async` returns a ResponseFuture resolved on its I/O thread; this
+module turns that into an awaitable, following result pages as they arrive.
+"""
+
+import asyncio
+from typing import Any, List, Optional, Sequence
+
+
+def _set_result(future: asyncio.Future, result: Any):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, error: BaseException):
+    if not future.done():
+        future.set_exception(error)
+
+
+async def execute_async(session: Any,
+                        query: Any,
+                        parameters: Optional[Sequence[Any]] = None,
+                        all_pages: bool = True) -> List[Any]:
+    """
+    Run a CQL statement without blocking the event loop.
+
+    Args:
+        session: Cassandra session
+        query: Query string or (bound) statement
+        parameters: Values bound at execute time
+        all_pages: Keep fetching until the result set is exhausted
+
+    Returns:
+        All rows of the result (just the first page if all_pages is False)
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    rows: List[Any] = []
+    response = session.execute_async(query, parameters)
+
+    def on_page(page):
+        rows.extend(page)
+        if all_pages and response.has_more_pages:
+            response.start_fetching_next_page()
+        else:
+            loop.call_soon_threadsafe(_set_result, future, rows)
+
+    def on_error(error):
+        loop.call_soon_threadsafe(_set_exception, future, error)
+
+    response.add_callbacks(on_page, on_error)
+    return await future
+
+
+async def execute_one(session: Any, query: Any, parameters: Optional[Sequence[Any]] = None) -> Any:
+    """First row of a statement's result, or None."""
+    rows = await execute_async(session, query, parameters, all_pages=False)
+    return rows[0] if rows else None
@@ -10,16 +10,37 @@ from datetime import datetime, timezone
 import uuid
 import json
 import os
+import time
 
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.policies import DCAwareRoundRobinPolicy
-import httpx
 
 from .models import StoryPage, PromptOption, User, SessionData, Branch, Motif
+from .bulk_ingest import BulkRowWriter, IngestReport
+from .http_transport import get_http_transport, loads
+from .page_cache import PageCache
+from .vector_buckets import BUCKETED_TABLE, EMBEDDING_BUCKETS, LEGACY_TABLE, MIGRATIONS_TABLE, embedding_bucket
+from .vector_index import VectorIndex
 
 logger = logging.getLogger(__name__)
 
+# Rows per Stargate request when loading vector_embeddings into the resident index
+VECTOR_INDEX_PAGE_SIZE = 1000
+
+# Page IDs per `$in` request when fetching many pages, and such requests in flight at once
+MULTIGET_BATCH_SIZE = int(os.getenv('PAGE_MULTIGET_BATCH_SIZE', '50'))
+MULTIGET_CONCURRENCY = int(os.getenv('PAGE_MULTIGET_CONCURRENCY', '4'))
+
+# Pages embedded and written together by create_pages, and the write window's upper bound
+BULK_CHUNK_SIZE = int(os.getenv('BULK_INGEST_CHUNK_SIZE', '256'))
+BULK_MAX_IN_FLIGHT = int(os.getenv('BULK_INGEST_MAX_IN_FLIGHT', '64'))
+
+# story_pages columns that key an index table; update_page cannot move index rows
+INDEX_KEY_COLUMNS = frozenset({'id', 'symbol_id', 'page_type', 'section', 'parent_id', 'created_at'})
+# story_pages columns copied into the index tables' page summaries
+SUMMARY_COLUMNS = frozenset({'text', 'title', 'author', 'rotation'})
+
 # Vector service imports - optional for now
 try:
     from .vector_service import get_vector_service, EmbeddingResult
@@ -50,7 +71,11 @@ class ProductionCassandraDatabase:
         # Database connections
         self.cluster = None
         self.session = None
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # Pooled HTTP transport shared with every other Stargate caller
+        self.transport = get_http_transport()
+        
+        # Read-through cache in front of get_page / get_pages_many
+        self.page_cache = PageCache.from_env()
         
         # Vector service
         if VECTOR_SERVICE_AVAILABLE:
@@ -58,6 +83,13 @@ class ProductionCassandraDatabase:
         else:
             self.vector_service = None
         
+        # Resident vector indexes per content type, loaded once from vector_embeddings
+        self.vector_index_mode = os.getenv('VECTOR_INDEX_MODE', 'exact')
+        self.embedding_buckets = EMBEDDING_BUCKETS
+        self.vector_indexes: Dict[str, VectorIndex] = {}
+        self._loading_indexes: Dict[str, VectorIndex] = {}
+        self._index_load_locks: Dict[str, asyncio.Lock] = {}
+        
         # Connection status
         self._connected = False
     
@@ -81,11 +113,15 @@ class ProductionCassandraDatabase:
             
             # Test Stargate connection
             health_url = f"{self.stargate_url}/health"
-            response = await self.http_client.get(health_url)
+            response = await self.transport.request('GET', health_url, endpoint='GET health')
             
             if response.status_code == 200:
                 self._connected = True
                 logger.info("Connected to Cassandra via Stargate and native driver")
+                
+                # Warm the page index so the first search doesn't pay for the load
+                if self.vector_service:
+                    await self._get_vector_index('page')
                 return True
             else:
                 logger.error(f"Stargate health check failed: {response.status_code}")
@@ -98,8 +134,7 @@ class ProductionCassandraDatabase:
     async def disconnect(self):
         """Disconnect from Cassandra"""
         try:
-            if self.http_client:
-                await self.http_client.aclose()
+            # The shared HTTP transport outlives this database (closed on app shutdown)
             
             if self.session:
                 loop = asyncio.get_event_loop()
@@ -121,6 +156,43 @@ class ProductionCassandraDatabase:
     
     # ========================= STORY PAGES =========================
     
+    def _mock_embedding(self, page: StoryPage):
+        """Placeholder embedding used when the vector service is unavailable"""
+        return type('MockEmbedding', (), {
+            'embedding': [0.1] * 384,  # Mock 384-dimensional embedding
+            'model': 'mock',
+            'content_id': page.id,
+            'content_type': 'page',
+            'metadata': {}
+        })()
+    
+    def _page_data(self, page: StoryPage, embedding_result=None) -> Dict:
+        """story_pages row for a page and its embedding (left out when None)"""
+        page_data = {
+            'id': page.id,
+            'symbol_id': page.symbol_id,
+            'rotation': page.rotation,
+            'page_type': page.page_type,
+            'parent_id': page.parent_id,
+            'prompt_type': page.prompt_type,
+            'text': page.text,
+            'author': page.author or 'AI',
+            'branch_id': page.branch_id,
+            'created_at': int(page.created_at.timestamp() * 1000) if page.created_at else int(datetime.now(timezone.utc).timestamp() * 1000),
+            'canonical': page.canonical,
+            'version': page.version,
+            'title': page.title,
+            'section': page.section,
+            'child_ids': list(page.child_ids) if page.child_ids else [],
+            'branches': [dict(b) for b in page.branches] if page.branches else [],
+            'prompts': [dict(p) for p in page.prompts] if page.prompts else [],
+            'last_updated': int(datetime.now(timezone.utc).timestamp() * 1000)
+        }
+        if embedding_result is not None:
+            page_data['embedding'] = embedding_result.embedding
+            page_data['embedding_model'] = embedding_result.model
+        return page_data
+    
     async def create_page(self, page: StoryPage) -> StoryPage:
         """Create a new story page with vector embedding"""
         try:
@@ -128,38 +200,10 @@ class ProductionCassandraDatabase:
             if self.vector_service:
                 embedding_result = await self.vector_service.embed_story_page(page.model_dump())
             else:
-                # Mock embedding result
-                embedding_result = type('MockEmbedding', (), {
-                    'embedding': [0.1] * 384,  # Mock 384-dimensional embedding
-                    'model': 'mock',
-                    'content_id': page.id,
-                    'content_type': 'page',
-                    'metadata': {}
-                })()
+                embedding_result = self._mock_embedding(page)
             
             # Prepare page data
-            page_data = {
-                'id': page.id,
-                'symbol_id': page.symbol_id,
-                'rotation': page.rotation,
-                'page_type': page.page_type,
-                'parent_id': page.parent_id,
-                'prompt_type': page.prompt_type,
-                'text': page.text,
-                'author': page.author or 'AI',
-                'branch_id': page.branch_id,
-                'created_at': int(page.created_at.timestamp() * 1000) if page.created_at else int(datetime.now(timezone.utc).timestamp() * 1000),
-                'canonical': page.canonical,
-                'version': page.version,
-                'title': page.title,
-                'section': page.section,
-                'child_ids': list(page.child_ids) if page.child_ids else [],
-                'branches': [dict(b) for b in page.branches] if page.branches else [],
-                'prompts': [dict(p) for p in page.prompts] if page.prompts else [],
-                'embedding': embedding_result.embedding,
-                'embedding_model': embedding_result.model,
-                'last_updated': int(datetime.now(timezone.utc).timestamp() * 1000)
-            }
+            page_data = self._page_data(page, embedding_result)
             
             # Insert into main table
             await self._stargate_request('POST', 'story_pages', data=page_data)
@@ -172,6 +216,9 @@ class ProductionCassandraDatabase:
                 self._insert_vector_embedding(embedding_result),
                 self._insert_recent_page(page_data)
             )
+            self._index_embedding(embedding_result)
+            # Drops a cached "missing" entry for the new ID
+            await self.page_cache.invalidate([page.id])
             
             logger.info(f"Created page {page.id} with embedding")
             return page
@@ -180,26 +227,184 @@ class ProductionCassandraDatabase:
             logger.error(f"Failed to create page {page.id}: {e}")
             raise
     
+    def _page_rows(self, page: StoryPage, embedding_result) -> List[Tuple[str, Dict]]:
+        """Every (table, row) create_page writes for a page, for the bulk writer"""
+        page_data = self._page_data(page, embedding_result)
+        rows = [
+            ('story_pages', page_data),
+            ('pages_by_symbol', self._page_by_symbol_row(page_data)),
+            ('pages_by_section', self._page_by_section_row(page_data)),
+            ('pages_by_parent', self._page_by_parent_row(page_data)),
+            (BUCKETED_TABLE, self._vector_embedding_row(embedding_result)),
+            ('recent_pages', self._recent_page_row(page_data))
+        ]
+        return [(table, row) for table, row in rows if row is not None]
+    
+    async def _embed_pages(self, pages: List[StoryPage]) -> List[Any]:
+        if self.vector_service:
+            return await self.vector_service.embed_story_pages([page.model_dump() for page in pages])
+        return [self._mock_embedding(page) for page in pages]
+    
+    async def create_pages(self, pages: List[StoryPage], chunk_size: int = BULK_CHUNK_SIZE) -> IngestReport:
+        """Bulk-create story pages over the native driver
+        
+        Pages are embedded a chunk at a time in one batched call (the next
+        chunk embeds while the current one is written). Their rows are grouped
+        by partition into UNLOGGED batches and written with an adaptive
+        in-flight window. A chunk whose writes fail is reported in
+        report.failed and the load continues.
+        
+        Returns:
+            IngestReport with request counts and pages per second
+        """
+        if self.session is None:
+            raise RuntimeError("create_pages needs the native Cassandra session - call connect() first")
+        
+        writer = BulkRowWriter(self.session, max_in_flight=BULK_MAX_IN_FLIGHT)
+        report = IngestReport()
+        started = time.perf_counter()
+        
+        chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), max(1, chunk_size))]
+        next_embeddings = asyncio.ensure_future(self._embed_pages(chunks[0])) if chunks else None
+        for position, chunk in enumerate(chunks):
+            embeddings = next_embeddings
+            if position + 1 < len(chunks):
+                next_embeddings = asyncio.ensure_future(self._embed_pages(chunks[position + 1]))
+            
+            try:
+                embedding_results = await embeddings
+                rows = [
+                    row
+                    for page, embedding_result in zip(chunk, embedding_results)
+                    for row in self._page_rows(page, embedding_result)
+                ]
+                await writer.write(rows, report)
+            except Exception as e:
+                logger.error(f"Bulk ingest of {len(chunk)} pages failed: {e}")
+                report.failed.extend(page.id for page in chunk)
+                continue
+            
+            for embedding_result in embedding_results:
+                self._index_embedding(embedding_result)
+            await self.page_cache.invalidate(page.id for page in chunk)
+            report.pages += len(chunk)
+            report.elapsed_seconds = time.perf_counter() - started
+            logger.info(f"Bulk ingest: {report.pages}/{len(pages)} pages "
+                        f"({report.pages_per_second:.0f} pages/s, window {writer.window.limit:.0f})")
+        
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+    
     async def get_page(self, page_id: str) -> Optional[StoryPage]:
         """Get a story page by ID"""
         try:
-            response = await self._stargate_request('GET', f'story_pages/{page_id}')
-            if response:
-                return self._dict_to_story_page(response)
-            return None
+            pages = await self.get_pages_many([page_id])
+            return pages[0] if pages else None
             
         except Exception as e:
             logger.error(f"Failed to get page {page_id}: {e}")
             return None
     
-    async def get_pages(self, skip: int = 0, limit: int = 20) -> Tuple[List[StoryPage], int]:
-        """Get paginated list of story pages"""
+    async def get_pages_many(self, page_ids: List[str]) -> List[StoryPage]:
+        """Fetch many story pages with a few `$in` requests instead of one per page
+        
+        Pages are served from the page cache where possible; only the rest are
+        requested. Pages come back in the order of page_ids; missing pages are skipped.
+        """
+        unique_ids = list(dict.fromkeys(page_ids))
+        if not unique_ids:
+            return []
+        
+        pages = await self.page_cache.get_many(unique_ids)
+        uncached = [page_id for page_id in unique_ids if page_id not in pages]
+        if uncached:
+            pages.update(await self._fetch_pages(uncached))
+        
+        return [pages[page_id] for page_id in page_ids if pages.get(page_id) is not None]
+    
+    async def _fetch_pages(self, page_ids: List[str]) -> Dict[str, Optional[StoryPage]]:
+        """Read pages from story_pages and cache them; None for IDs that do not exist
+        
+        IDs of a batch whose request failed are left out (and not cached as missing).
+        """
+        token = self.page_cache.begin_read()
+        window = asyncio.Semaphore(MULTIGET_CONCURRENCY)
+        
+        async def fetch(batch: List[str]) -> Optional[List[Dict]]:
+            async with window:
+                response = await self._stargate_request('GET', 'story_pages', params={
+                    'where': json.dumps({'id': {'$in': batch}}),
+                    'page-size': len(batch)
+                })
+            # _stargate_request returns {} when the request failed
+            return response.get('data', []) if response else None
+        
+        batches = [page_ids[i:i + MULTIGET_BATCH_SIZE] for i in range(0, len(page_ids), MULTIGET_BATCH_SIZE)]
+        pages: Dict[str, Optional[StoryPage]] = {}
+        for batch, batch_rows in zip(batches, await asyncio.gather(*(fetch(batch) for batch in batches))):
+            if batch_rows is None:
+                continue
+            rows = {row['id']: row for row in batch_rows}
+            for page_id in batch:
+                pages[page_id] = self._dict_to_story_page(rows[page_id]) if page_id in rows else None
+        
+        await self.page_cache.put_many(pages, token=token)
+        return pages
+    
+    async def update_page(self, page_id: str, updates: Dict[str, Any]) -> Optional[StoryPage]:
+        """Update fields of a story page
+        
+        The page summaries in pages_by_symbol, pages_by_section and
+        recent_pages are rewritten when a summarized field changes. Fields that key the index
+        tables (symbol_id, page_type, section, parent_id, created_at) cannot be
+        changed here.
+        
+        Returns:
+            The updated page, or None if the page does not exist or the update failed
+        """
+        keyed = INDEX_KEY_COLUMNS.intersection(updates)
+        if keyed:
+            raise ValueError(f"Cannot update indexed page fields: {', '.join(sorted(keyed))}")
+        
+        # Stargate PATCH is an upsert - don't create a partial row for an unknown ID
+        if await self.get_page(page_id) is None:
+            return None
+        
+        data = {key: list(value) if isinstance(value, set) else value for key, value in updates.items()}
+        data['last_updated'] = int(datetime.now(timezone.utc).timestamp() * 1000)
+        response = await self._stargate_request('PATCH', f'story_pages/{page_id}', data=data)
+        await self.page_cache.invalidate([page_id])
+        if not response:
+            return None
+        
+        page = await self.get_page(page_id)
+        if page is not None and SUMMARY_COLUMNS.intersection(updates):
+            page_data = self._page_data(page)
+            await asyncio.gather(
+                self._insert_page_by_symbol(page_data),
+                self._insert_page_by_section(page_data),
+                self._insert_recent_page(page_data)
+            )
+        return page
+    
+    async def _list_pages(self, index_rows: List[Dict], summary: bool) -> List[StoryPage]:
+        """Pages for index-table rows: the denormalized summaries, or full pages via one multi-get"""
+        if summary:
+            return [self._dict_to_story_page(row) for row in index_rows]
+        return await self.get_pages_many([row['id'] for row in index_rows])
+    
+    async def get_pages(self, skip: int = 0, limit: int = 20, summary: bool = False) -> Tuple[List[StoryPage], int]:
+        """Get paginated list of story pages
+        
+        With summary=True the pages are built from the recent_pages rows alone
+        (text truncated), skipping the story_pages fetch.
+        """
         try:
             # Get recent pages for better performance
             bucket = datetime.now(timezone.utc).strftime('%Y-%m-%d-%H')
             
             params = {
-                'page-size': limit,
+                'page-size': skip + limit,
                 'where': json.dumps({
                     'bucket': {'$eq': bucket}
                 })
@@ -209,10 +414,7 @@ class ProductionCassandraDatabase:
             
             pages = []
             if response and 'data' in response:
-                # Get full page data for each ID
-                page_ids = [row['id'] for row in response['data']]
-                page_tasks = [self.get_page(page_id) for page_id in page_ids[skip:skip+limit]]
-                pages = [p for p in await asyncio.gather(*page_tasks) if p is not None]
+                pages = await self._list_pages(response['data'][skip:skip + limit], summary)
             
             total = len(pages)  # Simplified - in production, implement proper counting
             
@@ -222,7 +424,8 @@ class ProductionCassandraDatabase:
             logger.error(f"Failed to get pages: {e}")
             return [], 0
     
-    async def get_pages_by_symbol(self, symbol_id: str, page_type: str = None, limit: int = 20) -> List[StoryPage]:
+    async def get_pages_by_symbol(self, symbol_id: str, page_type: str = None, limit: int = 20,
+                                  summary: bool = False) -> List[StoryPage]:
         """Get pages by character symbol (optimized hot path)"""
         try:
             where_clause = {'symbol_id': {'$eq': symbol_id}}
@@ -238,10 +441,7 @@ class ProductionCassandraDatabase:
             
             pages = []
             if response and 'data' in response:
-                # Get full page data
-                page_ids = [row['id'] for row in response['data']]
-                page_tasks = [self.get_page(page_id) for page_id in page_ids]
-                pages = [p for p in await asyncio.gather(*page_tasks) if p is not None]
+                pages = await self._list_pages(response['data'], summary)
             
             return pages
             
@@ -249,7 +449,8 @@ class ProductionCassandraDatabase:
             logger.error(f"Failed to get pages by symbol {symbol_id}: {e}")
             return []
     
-    async def get_pages_by_section(self, section: int, symbol_id: str = None, limit: int = 20) -> List[StoryPage]:
+    async def get_pages_by_section(self, section: int, symbol_id: str = None, limit: int = 20,
+                                   summary: bool = False) -> List[StoryPage]:
         """Get pages by book section (optimized for navigation)"""
         try:
             where_clause = {'section': {'$eq': section}}
@@ -265,9 +466,7 @@ class ProductionCassandraDatabase:
             
             pages = []
             if response and 'data' in response:
-                page_ids = [row['id'] for row in response['data']]
-                page_tasks = [self.get_page(page_id) for page_id in page_ids]
-                pages = [p for p in await asyncio.gather(*page_tasks) if p is not None]
+                pages = await self._list_pages(response['data'], summary)
             
             return pages
             
@@ -293,44 +492,136 @@ class ProductionCassandraDatabase:
                 content_type='query'
             )
             
-            # Get all embeddings for comparison (in production, use vector index)
-            params = {
-                'where': json.dumps({
-                    'content_type': {'$eq': content_type}
-                })
-            }
-            
-            response = await self._stargate_request('GET', 'vector_embeddings', params=params)
-            
-            if not response or 'data' not in response:
-                return []
-            
-            # Calculate similarities
-            candidate_embeddings = [
-                (row['content_id'], row['embedding']) 
-                for row in response['data']
-                if row.get('embedding')
-            ]
-            
-            similar_items = self.vector_service.find_most_similar(
-                query_embedding_result.embedding,
-                candidate_embeddings,
-                top_k=limit
-            )
+            index = await self._get_vector_index(content_type)
+            similar_items = index.search(query_embedding_result.embedding, top_k=limit)
             
             # Get full page data for similar items
-            results = []
-            for content_id, similarity in similar_items:
-                page = await self.get_page(content_id)
-                if page:
-                    results.append((page, similarity))
+            return await self._with_pages(similar_items)
+            
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}")
+            return []
+    
+    async def search_similar_embeddings(self, query_embeddings: List[List[float]], limit: int = 10,
+                                        content_type: str = 'page',
+                                        exclude: Optional[List[str]] = None) -> List[Tuple[StoryPage, float]]:
+        """Pages closest to any of several query vectors, scored by their best match"""
+        try:
+            index = await self._get_vector_index(content_type)
+            best: Dict[str, float] = {}
+            for results in index.search_batch(query_embeddings, top_k=limit, exclude=exclude):
+                for content_id, similarity in results:
+                    if similarity > best.get(content_id, float('-inf')):
+                        best[content_id] = similarity
+            similar_items = sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
             
-            return results
+            return await self._with_pages(similar_items)
             
         except Exception as e:
             logger.error(f"Vector search failed: {e}")
             return []
     
+    async def _scan_embeddings(self, table: str, where: Dict[str, Any]) -> Optional[List[Tuple[str, List[float]]]]:
+        """All (content_id, embedding) rows of one partition, or None if a request failed"""
+        rows = []
+        page_state = None
+        while True:
+            params = {
+                'where': json.dumps({column: {'$eq': value} for column, value in where.items()}),
+                'fields': 'content_id,embedding',
+                'page-size': VECTOR_INDEX_PAGE_SIZE
+            }
+            if page_state:
+                params['page-state'] = page_state
+            
+            response = await self._stargate_request('GET', table, params=params)
+            if not response:
+                return None
+            
+            rows.extend(
+                (row['content_id'], row['embedding'])
+                for row in response.get('data', [])
+                if row.get('embedding')
+            )
+            page_state = response.get('pageState')
+            if not page_state:
+                return rows
+    
+    async def _with_pages(self, similar_items: List[Tuple[str, float]]) -> List[Tuple[StoryPage, float]]:
+        """Pair (content_id, similarity) results with their pages, fetched in one multi-get"""
+        pages = {page.id: page for page in await self.get_pages_many([content_id for content_id, _ in similar_items])}
+        return [
+            (pages[content_id], similarity)
+            for content_id, similarity in similar_items
+            if content_id in pages
+        ]
+    
+    async def load_vector_index(self, content_type: str = 'page') -> VectorIndex:
+        """Load every stored embedding of a content type into a resident index
+        
+        Reads all buckets of the content type concurrently. Until the bucket
+        migration has been recorded for the content type, the legacy partition
+        is read as well and merged underneath (a bucketed row wins).
+        """
+        index = VectorIndex(mode=self.vector_index_mode)
+        self._loading_indexes[content_type] = index
+        try:
+            buckets = await asyncio.gather(*(
+                self._scan_embeddings(BUCKETED_TABLE, {'content_type': content_type, 'bucket': bucket})
+                for bucket in range(self.embedding_buckets)
+            ))
+            if any(rows is None for rows in buckets):
+                # Leave the index unregistered so the next search retries the load
+                logger.warning(f"Could not load {content_type} embeddings - vector index not ready")
+                return index
+            
+            if not await self._buckets_migrated(content_type):
+                legacy = await self._scan_embeddings(LEGACY_TABLE, {'content_type': content_type})
+                if legacy is None:
+                    logger.warning(f"Could not load {content_type} embeddings - vector index not ready")
+                    return index
+                if legacy:
+                    bucketed = {content_id for rows in buckets for content_id, _ in rows}
+                    legacy = [(content_id, embedding) for content_id, embedding in legacy
+                              if content_id not in bucketed]
+                    logger.warning(f"Merged {len(legacy)} {content_type} embeddings from the legacy "
+                                   f"{LEGACY_TABLE} partition; run app.vector_buckets to migrate them")
+                buckets.append(legacy)
+            
+            for rows in buckets:
+                index.add_many(rows)
+            
+            self.vector_indexes[content_type] = index
+            logger.info(f"Loaded {len(index)} {content_type} embeddings into vector index")
+            return index
+        finally:
+            self._loading_indexes.pop(content_type, None)
+    
+    async def _buckets_migrated(self, content_type: str) -> bool:
+        """Whether the legacy embeddings of a content type were copied into the buckets"""
+        response = await self._stargate_request('GET', MIGRATIONS_TABLE, params={
+            'where': json.dumps({'content_type': {'$eq': content_type}})
+        })
+        return bool(response and response.get('data'))
+    
+    async def _get_vector_index(self, content_type: str) -> VectorIndex:
+        """Resident index for a content type, loading it on first use"""
+        index = self.vector_indexes.get(content_type)
+        if index is None:
+            lock = self._index_load_locks.setdefault(content_type, asyncio.Lock())
+            async with lock:
+                index = self.vector_indexes.get(content_type)
+                if index is None:
+                    index = await self.load_vector_index(content_type)
+        return index
+    
+    def _index_embedding(self, embedding_result):
+        """Add a freshly stored embedding to its resident index (and any load in flight)"""
+        for indexes in (self.vector_indexes, self._loading_indexes):
+            index = indexes.get(embedding_result.content_type)
+            if index is not None:
+                index.add(embedding_result.content_id, embedding_result.embedding)
+    
     async def get_related_pages(self, page_id: str, limit: int = 5) -> List[Tuple[StoryPage, float]]:
         """Get pages related to a specific page using vector similarity"""
         try:
@@ -345,6 +636,12 @@ class ProductionCassandraDatabase:
                 filtered_pages = [p for p in pages if p.id != page_id][:limit]
                 return [(p, 0.7) for p in filtered_pages]
             
+            # Reuse the page's indexed vector instead of re-embedding its text
+            index = await self._get_vector_index('page')
+            page_vector = index.get_vector(page_id)
+            if page_vector is not None:
+                return await self.search_similar_embeddings([page_vector], limit=limit, exclude=[page_id])
+            
             # Search for similar pages
             return await self.search_similar_pages(page.text, limit=limit + 1)  # +1 to exclude self
             
@@ -453,24 +750,18 @@ class ProductionCassandraDatabase:
         try:
             url = f"{self.stargate_url}/v2/keyspaces/{self.keyspace}/{endpoint}"
             
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            }
-            
-            if method == 'GET':
-                response = await self.http_client.get(url, headers=headers, params=params)
-            elif method == 'POST':
-                response = await self.http_client.post(url, headers=headers, json=data)
-            elif method == 'PUT':
-                response = await self.http_client.put(url, headers=headers, json=data)
-            elif method == 'DELETE':
-                response = await self.http_client.delete(url, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            # Cassandra writes are upserts, so every Stargate request is safe to retry
+            response = await self.transport.request(
+                method,
+                url,
+                json=data,
+                params=params,
+                endpoint=f"{method} {endpoint.split('/')[0]}",
+                idempotent=True
+            )
             
             if response.status_code in [200, 201]:
-                return response.json() if response.content else {}
+                return loads(response.content)
             else:
                 logger.error(f"Stargate request failed: {response.status_code} - {response.text}")
                 return {}
@@ -479,69 +770,102 @@ class ProductionCassandraDatabase:
             logger.error(f"Stargate request error: {e}")
             return {}
     
-    async def _insert_page_by_symbol(self, page_data: Dict):
-        """Insert into pages_by_symbol index"""
-        index_data = {
+    def _page_by_symbol_row(self, page_data: Dict) -> Dict:
+        """pages_by_symbol index row for a page"""
+        return {
             'symbol_id': page_data['symbol_id'],
             'page_type': page_data['page_type'],
             'created_at': page_data['created_at'],
             'id': page_data['id'],
             'text': page_data['text'][:500],  # Truncated for index
             'rotation': page_data['rotation'],
-            'section': page_data.get('section')
+            'section': page_data.get('section'),
+            'title': page_data.get('title'),
+            'author': page_data['author']
         }
-        await self._stargate_request('POST', 'pages_by_symbol', data=index_data)
     
-    async def _insert_page_by_section(self, page_data: Dict):
-        """Insert into pages_by_section index"""
-        if page_data.get('section'):
-            index_data = {
-                'section': page_data['section'],
-                'symbol_id': page_data['symbol_id'],
-                'created_at': page_data['created_at'],
-                'id': page_data['id'],
-                'text': page_data['text'][:500],
-                'title': page_data.get('title')
-            }
-            await self._stargate_request('POST', 'pages_by_section', data=index_data)
+    def _page_by_section_row(self, page_data: Dict) -> Optional[Dict]:
+        """pages_by_section index row for a page (None without a section)"""
+        if not page_data.get('section'):
+            return None
+        return {
+            'section': page_data['section'],
+            'symbol_id': page_data['symbol_id'],
+            'created_at': page_data['created_at'],
+            'id': page_data['id'],
+            'text': page_data['text'][:500],
+            'title': page_data.get('title'),
+            'page_type': page_data['page_type'],
+            'rotation': page_data['rotation'],
+            'author': page_data['author']
+        }
     
-    async def _insert_page_by_parent(self, page_data: Dict):
-        """Insert into pages_by_parent index"""
-        if page_data.get('parent_id'):
-            index_data = {
-                'parent_id': page_data['parent_id'],
-                'created_at': page_data['created_at'],
-                'id': page_data['id'],
-                'symbol_id': page_data['symbol_id'],
-                'page_type': page_data['page_type']
-            }
-            await self._stargate_request('POST', 'pages_by_parent', data=index_data)
+    def _page_by_parent_row(self, page_data: Dict) -> Optional[Dict]:
+        """pages_by_parent index row for a page (None without a parent)"""
+        if not page_data.get('parent_id'):
+            return None
+        return {
+            'parent_id': page_data['parent_id'],
+            'created_at': page_data['created_at'],
+            'id': page_data['id'],
+            'symbol_id': page_data['symbol_id'],
+            'page_type': page_data['page_type']
+        }
     
-    async def _insert_vector_embedding(self, embedding_result):
-        """Insert into vector_embeddings table"""
-        embedding_data = {
+    def _vector_embedding_row(self, embedding_result) -> Dict:
+        """Bucketed vector_embeddings row for an embedding"""
+        # metadata is a map<text, text>: store strings, and leave out unset values
+        metadata = getattr(embedding_result, 'metadata', None) or {}
+        return {
             'content_type': embedding_result.content_type,
+            'bucket': embedding_bucket(embedding_result.content_id, self.embedding_buckets),
             'content_id': embedding_result.content_id,
             'embedding': embedding_result.embedding,
             'embedding_model': embedding_result.model,
             'created_at': int(datetime.now(timezone.utc).timestamp() * 1000),
-            'metadata': getattr(embedding_result, 'metadata', {})
+            'metadata': {key: str(value) for key, value in metadata.items() if value is not None}
         }
-        await self._stargate_request('POST', 'vector_embeddings', data=embedding_data)
     
-    async def _insert_recent_page(self, page_data: Dict):
-        """Insert into recent_pages for global feed"""
-        bucket = datetime.now(timezone.utc).strftime('%Y-%m-%d-%H')
-        recent_data = {
+    def _recent_page_row(self, page_data: Dict) -> Dict:
+        """recent_pages feed row for a page"""
+        # Bucketed by creation hour, so a later rewrite of the row lands on the same key
+        bucket = datetime.fromtimestamp(page_data['created_at'] / 1000, tz=timezone.utc).strftime('%Y-%m-%d-%H')
+        return {
             'bucket': bucket,
             'created_at': page_data['created_at'],
             'id': page_data['id'],
             'symbol_id': page_data['symbol_id'],
             'page_type': page_data['page_type'],
             'author': page_data['author'],
-            'text': page_data['text'][:200]  # Truncated
+            'text': page_data['text'][:200],  # Truncated
+            'rotation': page_data['rotation'],
+            'title': page_data.get('title'),
+            'section': page_data.get('section')
         }
-        await self._stargate_request('POST', 'recent_pages', data=recent_data)
+    
+    async def _insert_page_by_symbol(self, page_data: Dict):
+        """Insert into pages_by_symbol index"""
+        await self._stargate_request('POST', 'pages_by_symbol', data=self._page_by_symbol_row(page_data))
+    
+    async def _insert_page_by_section(self, page_data: Dict):
+        """Insert into pages_by_section index"""
+        index_data = self._page_by_section_row(page_data)
+        if index_data:
+            await self._stargate_request('POST', 'pages_by_section', data=index_data)
+    
+    async def _insert_page_by_parent(self, page_data: Dict):
+        """Insert into pages_by_parent index"""
+        index_data = self._page_by_parent_row(page_data)
+        if index_data:
+            await self._stargate_request('POST', 'pages_by_parent', data=index_data)
+    
+    async def _insert_vector_embedding(self, embedding_result):
+        """Insert into the bucketed vector_embeddings table"""
+        await self._stargate_request('POST', BUCKETED_TABLE, data=self._vector_embedding_row(embedding_result))
+    
+    async def _insert_recent_page(self, page_data: Dict):
+        """Insert into recent_pages for global feed"""
+        await self._stargate_request('POST', 'recent_pages', data=self._recent_page_row(page_data))
     
     def _dict_to_story_page(self, data: Dict) -> StoryPage:
         """Convert dict to StoryPage model"""
@@ -592,6 +916,13 @@ class ProductionCassandraDatabase:
                 'embeddings': 0
             }
             
+            stats['vector_index'] = {
+                content_type: index.get_stats()
+                for content_type, index in self.vector_indexes.items()
+            }
+            stats['http_transport'] = self.transport.get_stats()
+            stats['page_cache'] = self.page_cache.get_stats()
+            
             # Get approximate counts (simplified)
             if self._connected:
                 # In production, use COUNT queries or maintain counters
@@ -10,6 +10,8 @@ import os
 import time
 import logging
 
+from .vector_buckets import BUCKETED_TABLE_SCHEMA, MIGRATIONS_TABLE_SCHEMA
+
 logger = logging.getLogger(__name__)
 
 class OptimizedCassandraSchema:
@@ -106,6 +108,8 @@ class OptimizedCassandraSchema:
             text text,
             rotation int,
             section int,
+            title text,
+            author text,
             PRIMARY KEY ((symbol_id, page_type), created_at, id)
         ) WITH CLUSTERING ORDER BY (created_at DESC, id ASC)
         """
@@ -119,6 +123,9 @@ class OptimizedCassandraSchema:
             id text,
             text text,
             title text,
+            page_type text,
+            rotation int,
+            author text,
             PRIMARY KEY (section, symbol_id, created_at, id)
         ) WITH CLUSTERING ORDER BY (symbol_id ASC, created_at DESC, id ASC)
         """
@@ -135,7 +142,11 @@ class OptimizedCassandraSchema:
         ) WITH CLUSTERING ORDER BY (created_at DESC, id ASC)
         """
         
-        # 5. Vector Search Index - Separate table for efficient vector operations
+        # 5. Vector Search Index - Separate table for efficient vector operations.
+        # Embeddings are spread over hash buckets per content type; the
+        # single-partition vector_embeddings table is kept as the migration source.
+        vector_embeddings_by_bucket_table = BUCKETED_TABLE_SCHEMA
+        
         vector_embeddings_table = """
         CREATE TABLE IF NOT EXISTS vector_embeddings (
             content_type text,
@@ -265,6 +276,9 @@ class OptimizedCassandraSchema:
             page_type text,
             author text,
             text text,
+            rotation int,
+            title text,
+            section int,
             PRIMARY KEY (bucket, created_at, id)
         ) WITH CLUSTERING ORDER BY (created_at DESC, id ASC)
         """
@@ -276,6 +290,8 @@ class OptimizedCassandraSchema:
             ("pages_by_section", pages_by_section_table),
             ("pages_by_parent", pages_by_parent_table),
             ("vector_embeddings", vector_embeddings_table),
+            ("vector_embeddings_by_bucket", vector_embeddings_by_bucket_table),
+            ("vector_bucket_migrations", MIGRATIONS_TABLE_SCHEMA),
             ("prompts", prompts_table),
             ("prompts_by_target", prompts_by_target_table),
             ("users", users_table),
@@ -296,6 +312,29 @@ class OptimizedCassandraSchema:
                 # Continue with other tables
                 pass
     
+    def add_summary_columns(self):
+        """Add the denormalized listing fields to index tables created before they existed"""
+        
+        # List views are served from these columns without touching story_pages
+        summary_columns = [
+            ("pages_by_symbol", "title", "text"),
+            ("pages_by_symbol", "author", "text"),
+            ("pages_by_section", "page_type", "text"),
+            ("pages_by_section", "rotation", "int"),
+            ("pages_by_section", "author", "text"),
+            ("recent_pages", "rotation", "int"),
+            ("recent_pages", "title", "text"),
+            ("recent_pages", "section", "int")
+        ]
+        
+        for table_name, column, column_type in summary_columns:
+            try:
+                self.session.execute(f"ALTER TABLE {table_name} ADD {column} {column_type}")
+                logger.info(f"Added summary column {table_name}.{column}")
+            except Exception as e:
+                # Already present (fresh schema or earlier run)
+                logger.debug(f"Summary column {table_name}.{column} not added: {e}")
+    
     def create_indexes(self):
         """Create secondary indexes for additional query patterns"""
         
@@ -338,7 +377,8 @@ class OptimizedCassandraSchema:
             
             expected_tables = [
                 'story_pages', 'pages_by_symbol', 'pages_by_section', 'pages_by_parent',
-                'vector_embeddings', 'prompts', 'prompts_by_target',
+                'vector_embeddings', 'vector_embeddings_by_bucket', 'vector_bucket_migrations',
+                'prompts', 'prompts_by_target',
                 'users', 'users_by_username', 'sessions', 'sessions_by_user',
                 'branches', 'branches_by_user', 'recent_pages'
             ]
@@ -373,6 +413,7 @@ class OptimizedCassandraSchema:
             
             # Create all tables
             self.create_tables()
+            self.add_summary_columns()
             
             # Create indexes
             self.create_indexes()
@@ -4,8 +4,10 @@ Context retrieval service for providing <X_READ> context to prompts.
 Connects to the retrieval API to fetch relevant corpus snippets for a given query.
 """
 
+import asyncio
 import logging
 import os
+import time
 from typing import List, Optional, Dict
 import httpx
 from dataclasses import dataclass
@@ -14,12 +16,17 @@ from dataclasses import dataclass
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
 import openai
-from sentence_transformers import SentenceTransformer
 
+from .corpus_snapshot import CorpusSnapshot
+from .cql_statements import StatementRegistry
+from .embedding_cache import get_embedding_cache
+from .model_registry import get_model_registry
 from .tokenizer_service import get_tokenizer_service
 
 logger = logging.getLogger(__name__)
 
+LOCAL_EMBED_MODEL = 'all-MiniLM-L6-v2'
+
 
 @dataclass
 class RetrievedContext:
@@ -43,14 +50,21 @@ class ContextRetrievalService:
         self.max_context_tokens = max_context_tokens
         self.tokenizer = get_tokenizer_service()
         self.cassandra_session = None
+        self.statements: Optional[StatementRegistry] = None
         self.embedding_model = None
         
+        # Resident copy of the pages table, refreshed in the background
+        self.snapshot = CorpusSnapshot()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._initial_load_lock = asyncio.Lock()
+        
         # Load environment configuration
         self.cassandra_host = os.getenv("CASSANDRA_HOST", "localhost")
         self.cassandra_port = int(os.getenv("CASSANDRA_PORT", "9042"))
         self.cassandra_keyspace = os.getenv("CASSANDRA_KEYSPACE", "gibsey_network")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.embed_model = os.getenv("EMBED_MODEL", "text-embedding-3-small")
+        self.snapshot_refresh_seconds = float(os.getenv("CONTEXT_SNAPSHOT_REFRESH_SECONDS", "60"))
         
     def _ensure_connections(self):
         """Ensure Cassandra and embedding model connections are ready."""
@@ -59,6 +73,8 @@ class ContextRetrievalService:
                 logger.info(f"Connecting to Cassandra at {self.cassandra_host}:{self.cassandra_port}")
                 cluster = Cluster([self.cassandra_host], port=self.cassandra_port)
                 self.cassandra_session = cluster.connect(self.cassandra_keyspace)
+                self.statements = StatementRegistry(self.cassandra_session).listen(cluster)
+                self.statements.prepare_all()
                 logger.info("✓ Cassandra connection established for context retrieval")
             except Exception as e:
                 logger.error(f"Failed to connect to Cassandra: {e}")
@@ -72,7 +88,7 @@ class ContextRetrievalService:
                     logger.info("✓ OpenAI embedding model configured for context retrieval")
                 else:
                     logger.info("Loading local sentence transformer for context retrieval...")
-                    self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+                    self.embedding_model = get_model_registry().get(LOCAL_EMBED_MODEL)
                     logger.info("✓ Local sentence transformer loaded for context retrieval")
             except Exception as e:
                 logger.error(f"Failed to initialize embedding model: {e}")
@@ -81,21 +97,26 @@ class ContextRetrievalService:
         return True
     
     def _get_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text."""
+        """Generate embedding for text (cached across call sites)."""
+        cache = get_embedding_cache()
         if self.embedding_model == "openai":
-            try:
-                response = openai.embeddings.create(
-                    model=self.embed_model,
-                    input=text[:8000]  # OpenAI has input limits
-                )
-                return response.data[0].embedding
-            except Exception as e:
-                logger.error(f"OpenAI embedding failed: {e}")
-                raise
+            def _compute(text: str) -> List[float]:
+                try:
+                    response = openai.embeddings.create(
+                        model=self.embed_model,
+                        input=text
+                    )
+                    return response.data[0].embedding
+                except Exception as e:
+                    logger.error(f"OpenAI embedding failed: {e}")
+                    raise
+            # The cache caps the input at the same length for every call site
+            return cache.get_or_compute(self.embed_model, text, _compute)
         else:
             # Use local sentence transformer
-            embedding = self.embedding_model.encode(text[:512])  # Local model limits
-            return embedding.tolist()
+            return cache.get_or_compute(
+                LOCAL_EMBED_MODEL, text, lambda text: self.embedding_model.encode(text).tolist()
+            )
     
     async def retrieve_context(
         self, 
@@ -123,70 +144,10 @@ class ContextRetrievalService:
             # Generate embedding for the query
             query_embedding = self._get_embedding(query)
             
-            # Use keyword-based search since vector search extensions aren't available
-            query_terms = query.lower().split()
-            
-            if character_id:
-                # Search pages by character with keyword matching
-                cql_query = """
-                SELECT page_id, title, content, symbol_id, page_index, embedding
-                FROM pages 
-                WHERE symbol_id = %s ALLOW FILTERING
-                """
-                params = (character_id,)
-            else:
-                # Get all pages for manual filtering
-                cql_query = """
-                SELECT page_id, title, content, symbol_id, page_index, embedding
-                FROM pages
-                """
-                params = ()
-            
-            # Execute search
-            result = self.cassandra_session.execute(cql_query, params)
-            
-            # Collect all pages and calculate similarity manually
-            page_scores = []
-            for row in result:
-                # Calculate text-based relevance score
-                content_lower = row.content.lower()
-                title_lower = row.title.lower()
-                
-                # Simple keyword matching score
-                content_score = sum(1 for term in query_terms if term in content_lower)
-                title_score = sum(2 for term in query_terms if term in title_lower)  # Title matches worth more
-                text_score = content_score + title_score
-                
-                # Add semantic similarity if embeddings available
-                if row.embedding and query_embedding:
-                    try:
-                        # Calculate cosine similarity
-                        import numpy as np
-                        row_embedding = np.array(row.embedding)
-                        query_embedding_np = np.array(query_embedding)
-                        
-                        dot_product = np.dot(row_embedding, query_embedding_np)
-                        norm_row = np.linalg.norm(row_embedding)
-                        norm_query = np.linalg.norm(query_embedding_np)
-                        
-                        if norm_row > 0 and norm_query > 0:
-                            semantic_score = dot_product / (norm_row * norm_query)
-                        else:
-                            semantic_score = 0.0
-                    except:
-                        semantic_score = 0.0
-                else:
-                    semantic_score = 0.0
-                
-                # Combined score (text + semantic)
-                total_score = text_score + (semantic_score * 5)  # Weight semantic similarity
-                
-                if total_score > 0:  # Only include relevant pages
-                    page_scores.append((row, total_score))
-            
-            # Sort by score and take top results
-            page_scores.sort(key=lambda x: x[1], reverse=True)
-            result = [row for row, score in page_scores[:top_k]]
+            # Hybrid keyword + semantic ranking over the resident snapshot
+            await self._ensure_snapshot()
+            ranked = self.snapshot.search(query, query_embedding, symbol_id=character_id, top_k=top_k)
+            result = [page for page, score in ranked]
             
             # Process results and collect snippets
             snippets = []
@@ -231,6 +192,35 @@ class ContextRetrievalService:
             logger.error(f"Error retrieving context: {e}")
             return RetrievedContext(snippets=[], page_ids=[], total_tokens=0, character_symbols=[])
     
+    async def _ensure_snapshot(self):
+        """
+        Make sure the corpus snapshot is loaded and reasonably fresh.
+        
+        The first call waits for the full load; afterwards stale snapshots are
+        refreshed in the background while requests keep using the current one.
+        """
+        loop = asyncio.get_event_loop()
+        
+        if self.snapshot.loaded_at is None:
+            async with self._initial_load_lock:
+                if self.snapshot.loaded_at is None:
+                    await loop.run_in_executor(None, self.snapshot.refresh, self.statements)
+                    logger.info(f"✓ Corpus snapshot loaded: {len(self.snapshot)} pages")
+            return
+        
+        age = time.time() - self.snapshot.loaded_at
+        refreshing = self._refresh_task is not None and not self._refresh_task.done()
+        if age >= self.snapshot_refresh_seconds and not refreshing:
+            self._refresh_task = asyncio.ensure_future(self._refresh_snapshot())
+    
+    async def _refresh_snapshot(self):
+        """Apply new, changed and deleted pages to the snapshot."""
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self.snapshot.refresh, self.statements)
+        except Exception as e:
+            logger.warning(f"Corpus snapshot refresh failed: {e}")
+    
     def _extract_relevant_snippet(self, content: str, query: str, context_window: int = 300) -> str:
         """
         Extract the most relevant snippet from content based on query.
@@ -0,0 +1,272 @@
+"""
+Resident corpus snapshot for context retrieval.
+
+Holds every row of the `pages` table in memory as a normalized embedding
+matrix, a per-symbol row index and BM25 inverted indexes over content and
+titles, so hybrid scoring is a handful of vectorized operations instead of a
+table scan per request. The
+snapshot is refreshed incrementally: a key-only scan with write times finds
+new, changed and deleted pages, and only those rows are fetched.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .bm25_index import BM25Index
+from .cql_statements import StatementRegistry
+from .vector_index import normalize_rows, top_k_from_scores
+
+logger = logging.getLogger(__name__)
+
+CorpusPage = namedtuple('CorpusPage', ['page_id', 'title', 'content', 'symbol_id', 'page_index'])
+
+# Rows fetched per `IN` query when refreshing changed pages
+FETCH_BATCH_SIZE = 100
+
+# Hybrid score weights: BM25 over content, BM25 over titles, cosine similarity
+CONTENT_WEIGHT = 1.0
+TITLE_WEIGHT = 2.0
+SEMANTIC_WEIGHT = 5.0
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for both indexing and queries."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class CorpusSnapshot:
+    """In-memory, incrementally refreshed view of the pages table."""
+
+    def __init__(self, initial_capacity: int = 1024):
+        """
+        Initialize an empty snapshot.
+
+        Args:
+            initial_capacity: Rows preallocated before the first resize
+        """
+        self._lock = threading.RLock()
+        self._capacity = max(1, initial_capacity)
+        self._pages: List[Optional[CorpusPage]] = []
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._versions: Dict[str, Any] = {}
+
+        self._matrix: Optional[np.ndarray] = None
+        self._has_embedding = np.zeros(self._capacity, dtype=bool)
+        self._active = np.zeros(self._capacity, dtype=bool)
+
+        self._symbol_rows: Dict[str, Set[int]] = {}
+        self._content_index = BM25Index()
+        self._title_index = BM25Index()
+
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ------------------------------------------------------------------ updates
+
+    def _grow(self, needed: int):
+        """Double capacity until `needed` rows fit."""
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        size = len(self._pages)
+        if self._matrix is not None:
+            matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+            matrix[:size] = self._matrix[:size]
+            self._matrix = matrix
+        for name in ('_has_embedding', '_active'):
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:size] = getattr(self, name)[:size]
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def _unindex(self, row: int):
+        """Remove a row from every secondary index."""
+        page = self._pages[row]
+        self._content_index.remove(row)
+        self._title_index.remove(row)
+        symbol_rows = self._symbol_rows.get(page.symbol_id)
+        if symbol_rows is not None:
+            symbol_rows.discard(row)
+            if not symbol_rows:
+                del self._symbol_rows[page.symbol_id]
+
+    def upsert(self, row_data: Any, version: Any = None):
+        """Insert or replace one page from a Cassandra row (attribute access)."""
+        page = CorpusPage(
+            page_id=row_data.page_id,
+            title=row_data.title or '',
+            content=row_data.content or '',
+            symbol_id=row_data.symbol_id,
+            page_index=row_data.page_index
+        )
+        embedding = getattr(row_data, 'embedding', None)
+
+        with self._lock:
+            row = self._rows.get(page.page_id)
+            if row is not None:
+                self._unindex(row)
+            elif self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = len(self._pages)
+                self._grow(row + 1)
+                self._pages.append(None)
+
+            self._pages[row] = page
+            self._rows[page.page_id] = row
+            self._versions[page.page_id] = version
+            self._active[row] = True
+
+            if embedding is not None and len(embedding):
+                vector = normalize_rows(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+                if self._matrix is None:
+                    self._matrix = np.zeros((self._capacity, len(vector)), dtype=np.float32)
+                if len(vector) == self._matrix.shape[1]:
+                    self._matrix[row] = vector
+                    self._has_embedding[row] = True
+                else:
+                    logger.warning(f"Skipping {len(vector)}-dim embedding for {page.page_id}; "
+                                   f"snapshot holds {self._matrix.shape[1]}-dim vectors")
+                    self._matrix[row] = 0.0
+                    self._has_embedding[row] = False
+            else:
+                if self._matrix is not None:
+                    self._matrix[row] = 0.0
+                self._has_embedding[row] = False
+
+            self._content_index.add(row, tokenize(page.content))
+            self._title_index.add(row, tokenize(page.title))
+            self._symbol_rows.setdefault(page.symbol_id, set()).add(row)
+
+    def remove(self, page_id: str) -> bool:
+        """Drop a page; its row is reused by the next insert."""
+        with self._lock:
+            row = self._rows.pop(page_id, None)
+            if row is None:
+                return False
+            self._unindex(row)
+            self._versions.pop(page_id, None)
+            self._pages[row] = None
+            self._active[row] = False
+            self._has_embedding[row] = False
+            if self._matrix is not None:
+                self._matrix[row] = 0.0
+            self._free_rows.append(row)
+            return True
+
+    def refresh(self, statements: StatementRegistry) -> Dict[str, int]:
+        """
+        Bring the snapshot in line with the pages table.
+
+        A key-only scan with write times finds what changed; only new or
+        rewritten rows are fetched in full.
+
+        Args:
+            statements: Prepared statements for the Cassandra session
+
+        Returns:
+            Counts of added, updated and removed pages
+        """
+        current: Dict[str, Any] = {}
+        session = statements.session
+        for row in session.execute(statements.bind('pages.versions')):
+            current[row.page_id] = (row.content_written, row.embedding_written)
+
+        with self._lock:
+            known = dict(self._versions)
+        changed = [page_id for page_id, version in current.items() if known.get(page_id, ()) != version]
+        removed = [page_id for page_id in known if page_id not in current]
+
+        added = 0
+        for start in range(0, len(changed), FETCH_BATCH_SIZE):
+            batch = changed[start:start + FETCH_BATCH_SIZE]
+            for row in session.execute(statements.bind('pages.fetch_many', [batch])):
+                added += row.page_id not in known
+                self.upsert(row, current[row.page_id])
+
+        for page_id in removed:
+            self.remove(page_id)
+
+        self.loaded_at = time.time()
+        stats = {'added': added, 'updated': len(changed) - added, 'removed': len(removed)}
+        if changed or removed:
+            logger.info(f"Corpus snapshot refreshed: {stats}, {len(self)} pages resident")
+        return stats
+
+    # ------------------------------------------------------------------ queries
+
+    def _candidate_rows(self, symbol_id: Optional[str]) -> np.ndarray:
+        if symbol_id is None:
+            return np.flatnonzero(self._active[:len(self._pages)])
+        return np.fromiter(sorted(self._symbol_rows.get(symbol_id, ())), dtype=np.int64)
+
+    @staticmethod
+    def _add_keyword_scores(scores: np.ndarray, index: BM25Index, terms: List[str],
+                            restrict: Optional[Set[int]], candidates: np.ndarray, weight: float):
+        """Scatter sparse BM25 scores into the dense per-candidate score vector (candidates sorted)."""
+        rows, keyword_scores = index.search(terms, restrict=restrict)
+        if len(rows):
+            scores[np.searchsorted(candidates, rows)] += weight * keyword_scores
+
+    def search(self, query: str, query_embedding: Optional[List[float]] = None,
+               symbol_id: Optional[str] = None, top_k: int = 5) -> List[Tuple[CorpusPage, float]]:
+        """
+        Hybrid BM25 + semantic ranking over the resident corpus.
+
+        Args:
+            query: Raw query text
+            query_embedding: Query vector (semantic half skipped if missing)
+            symbol_id: Restrict to one character's pages
+            top_k: Number of pages to return
+
+        Returns:
+            (page, score) pairs, best first; only pages with a positive score
+        """
+        terms = tokenize(query)
+        with self._lock:
+            candidates = self._candidate_rows(symbol_id)
+            if len(candidates) == 0 or top_k <= 0:
+                return []
+
+            restrict = self._symbol_rows.get(symbol_id) if symbol_id is not None else None
+
+            scores = np.zeros(len(candidates), dtype=np.float32)
+            self._add_keyword_scores(scores, self._content_index, terms, restrict, candidates, CONTENT_WEIGHT)
+            self._add_keyword_scores(scores, self._title_index, terms, restrict, candidates, TITLE_WEIGHT)
+
+            if query_embedding is not None and self._matrix is not None:
+                query_vector = normalize_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+                if len(query_vector) == self._matrix.shape[1]:
+                    semantic = self._matrix[candidates] @ query_vector
+                    scores += SEMANTIC_WEIGHT * np.where(self._has_embedding[candidates], semantic, 0.0)
+
+            slots, top_scores = top_k_from_scores(scores, top_k)
+            return [
+                (self._pages[candidates[slot]], float(score))
+                for slot, score in zip(slots[0].tolist(), top_scores[0].tolist())
+                if score > 0
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot size and freshness."""
+        with self._lock:
+            return {
+                'pages': len(self._rows),
+                'with_embeddings': int(self._has_embedding.sum()),
+                'symbols': len(self._symbol_rows),
+                'terms': self._content_index.get_stats()['terms'],
+                'loaded_at': self.loaded_at
+            }
@@ -0,0 +1,209 @@
+"""
+Incrementally maintained corpus statistics.
+
+Page counts per symbol, token totals and embedding coverage live in the
+`corpus_stats` counter table, bumped by whoever ingests a page. Services keep
+an in-process rollup of that single partition and serve /stats from memory,
+reloading it in the background; nothing on the request path scans `pages`.
+
+A corpus ingested before the table existed is counted once by running this
+module (`python -m backend.app.corpus_stats`). It reconciles the counters with
+a scan of `pages`, adding only the difference, under a lease taken with a
+lightweight transaction so two runs never add the same difference twice.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .cql_statements import DEFAULT_STATEMENTS, RECONCILE_STATEMENTS, StatementRegistry
+
+logger = logging.getLogger(__name__)
+
+# Partition holding the rollup of the pages table
+STATS_SCOPE = 'pages'
+
+# Clustering key used for pages without a symbol (keys cannot be null)
+NO_SYMBOL = ''
+
+# Seconds a reconcile lease lives if its holder dies without releasing it
+RECONCILE_LEASE_SECONDS = 3600
+
+CORPUS_STATS_TABLE = """
+    CREATE TABLE IF NOT EXISTS corpus_stats (
+        scope text,
+        symbol_id text,
+        pages counter,
+        tokens counter,
+        embedded counter,
+        PRIMARY KEY (scope, symbol_id)
+    )
+"""
+
+CORPUS_STATS_LEASE_TABLE = """
+    CREATE TABLE IF NOT EXISTS corpus_stats_lease (
+        scope text PRIMARY KEY,
+        owner text
+    )
+"""
+
+
+@dataclass
+class SymbolTotals:
+    """Rolled-up counters for one symbol."""
+    pages: int = 0
+    tokens: int = 0
+    embedded: int = 0
+
+
+class CorpusStats:
+    """In-memory rollup of the corpus_stats table."""
+
+    def __init__(self):
+        """Initialize an empty rollup (loaded_at stays None until the first load)."""
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, SymbolTotals] = {}
+        self._totals = SymbolTotals()
+        self.loaded_at: Optional[float] = None
+
+    def record_page(self, symbol_id: Optional[str], tokens: int, has_embedding: bool, sign: int = 1):
+        """Apply one ingested (sign=1) or deleted (sign=-1) page to the rollup."""
+        key = symbol_id or NO_SYMBOL
+        with self._lock:
+            for totals in (self._symbols.setdefault(key, SymbolTotals()), self._totals):
+                totals.pages += sign
+                totals.tokens += sign * (tokens or 0)
+                totals.embedded += sign * int(has_embedding)
+
+    def replace(self, symbols: Dict[str, SymbolTotals]):
+        """Swap in freshly loaded per-symbol totals."""
+        totals = SymbolTotals(
+            pages=sum(t.pages for t in symbols.values()),
+            tokens=sum(t.tokens for t in symbols.values()),
+            embedded=sum(t.embedded for t in symbols.values())
+        )
+        with self._lock:
+            self._symbols = symbols
+            self._totals = totals
+            self.loaded_at = time.time()
+
+    def load(self, statements: StatementRegistry):
+        """Reload the rollup from the corpus_stats partition."""
+        session = statements.session
+        rows = session.execute(statements.bind('corpus_stats.read', [STATS_SCOPE]))
+        symbols = {
+            row.symbol_id: SymbolTotals(pages=row.pages or 0, tokens=row.tokens or 0, embedded=row.embedded or 0)
+            for row in rows
+        }
+        if not symbols and self.loaded_at is None:
+            logger.info("corpus_stats is empty; run `python -m backend.app.corpus_stats` "
+                        "to count a corpus ingested before it existed")
+        self.replace(symbols)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current totals; reads only the in-memory rollup."""
+        with self._lock:
+            totals = self._totals
+            return {
+                'total_pages': totals.pages,
+                'total_tokens': totals.tokens,
+                'embedded_pages': totals.embedded,
+                'embedding_coverage': totals.embedded / totals.pages if totals.pages else 0.0,
+                'pages_by_character': {
+                    symbol_id: symbol.pages
+                    for symbol_id, symbol in self._symbols.items()
+                    if symbol_id != NO_SYMBOL and symbol.pages
+                },
+                'loaded_at': self.loaded_at
+            }
+
+
+def ensure_schema(session: Any):
+    """Create the corpus_stats tables if they do not exist yet."""
+    session.execute(CORPUS_STATS_TABLE)
+    session.execute(CORPUS_STATS_LEASE_TABLE)
+
+
+def record_ingest(statements: StatementRegistry, symbol_id: Optional[str], tokens: int,
+                  has_embedding: bool, sign: int = 1):
+    """Bump the corpus_stats counters for a page written to (or deleted from) `pages`."""
+    statements.session.execute(statements.bind(
+        'corpus_stats.increment',
+        [sign, sign * (tokens or 0), sign * int(has_embedding), STATS_SCOPE, symbol_id or NO_SYMBOL]
+    ))
+
+
+def reconcile(statements: StatementRegistry) -> Dict[str, SymbolTotals]:
+    """
+    Bring the corpus_stats counters in line with one scan of `pages`.
+
+    `statements` must include RECONCILE_STATEMENTS.
+
+    Counters can only be incremented, so each symbol gets the difference
+    between its scanned totals and its current counters; running this again
+    changes nothing. Pages ingested while the scan runs may be missed or
+    counted twice, so run it while no ingest is in progress.
+
+    Returns:
+        Scanned per-symbol totals
+
+    Raises:
+        RuntimeError: Another reconcile holds the lease
+    """
+    session = statements.session
+    owner = str(uuid.uuid4())
+    claimed = session.execute(statements.bind('corpus_stats.claim', [STATS_SCOPE, owner, RECONCILE_LEASE_SECONDS]))
+    if not claimed.was_applied:
+        raise RuntimeError("Another corpus_stats reconcile is running")
+    try:
+        scanned: Dict[str, SymbolTotals] = {}
+        for row in session.execute(statements.bind('corpus_stats.scan_pages')):
+            totals = scanned.setdefault(row.symbol_id or NO_SYMBOL, SymbolTotals())
+            totals.pages += 1
+            totals.tokens += row.tokens or 0
+            totals.embedded += int(row.embedding_written is not None)
+
+        current = {
+            row.symbol_id: SymbolTotals(pages=row.pages or 0, tokens=row.tokens or 0, embedded=row.embedded or 0)
+            for row in session.execute(statements.bind('corpus_stats.read', [STATS_SCOPE]))
+        }
+        for symbol_id in set(scanned) | set(current):
+            want, have = scanned.get(symbol_id, SymbolTotals()), current.get(symbol_id, SymbolTotals())
+            delta = (want.pages - have.pages, want.tokens - have.tokens, want.embedded - have.embedded)
+            if any(delta):
+                session.execute(statements.bind('corpus_stats.increment', [*delta, STATS_SCOPE, symbol_id]))
+        logger.info(f"✓ corpus_stats reconciled: {sum(t.pages for t in scanned.values())} pages")
+        return scanned
+    finally:
+        session.execute(statements.bind('corpus_stats.release', [STATS_SCOPE, owner]))
+
+
+def run_reconcile() -> bool:
+    """Connect using the usual environment variables and reconcile the counters"""
+    from cassandra.cluster import Cluster
+
+    cluster = Cluster([os.getenv('CASSANDRA_HOST', 'localhost')], port=int(os.getenv('CASSANDRA_PORT', '9042')))
+    try:
+        session = cluster.connect(os.getenv('CASSANDRA_KEYSPACE', 'gibsey_network'))
+        ensure_schema(session)
+        reconcile(StatementRegistry(session, {**DEFAULT_STATEMENTS, **RECONCILE_STATEMENTS}))
+        return True
+    except Exception as e:
+        logger.error(f"corpus_stats reconcile failed: {e}")
+        return False
+    finally:
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    if run_reconcile():
+        print("✅ corpus_stats reconciled with the pages table")
+    else:
+        print("❌ corpus_stats reconcile failed")
+        exit(1)
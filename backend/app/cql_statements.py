@@ -0,0 +1,175 @@
+"""
+Prepared-statement registry for the CQL the backend runs.
+
+Raw query strings are parsed by the coordinator on every execute and carry no
+routing information. Here every statement is prepared once per session (at
+connect time, or on first use) and handed out as a bound statement. Bound
+statements of queries that fix the partition key carry a routing key, so a
+token-aware load balancing policy sends them straight to a replica.
+
+The driver re-prepares on its own when a node answers UNPREPARED; the
+registry also listens for nodes coming back up and re-prepares everything
+eagerly so the first query after a restart does not pay the round trip.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Every query the backend runs against the pages table, by name
+PAGE_STATEMENTS: Dict[str, str] = {
+    'pages.read': """
+        SELECT page_id, title, content, symbol_id, tokens, page_index
+        FROM pages
+        WHERE page_id = ?
+    """,
+    'pages.exists': "SELECT page_id FROM pages WHERE page_id = ?",
+    'pages.fetch_many': """
+        SELECT page_id, title, content, symbol_id, page_index, embedding
+        FROM pages
+        WHERE page_id IN ?
+    """,
+    'pages.versions': """
+        SELECT page_id, writetime(content) AS content_written, writetime(embedding) AS embedding_written
+        FROM pages
+    """,
+    'pages.search': """
+        SELECT page_id, title, content, symbol_id, page_index,
+               similarity_cosine(embedding, ?) as score
+        FROM pages
+        WHERE embedding ANN OF ? LIMIT ?
+    """,
+    'pages.search_by_symbol': """
+        SELECT page_id, title, content, symbol_id, page_index,
+               similarity_cosine(embedding, ?) as score
+        FROM pages
+        WHERE symbol_id = ? AND embedding ANN OF ? LIMIT ?
+    """,
+    'pages.insert': """
+        INSERT INTO pages (page_id, symbol_id, title, page_index, tokens, content, embedding)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+
+# Counter rollup of the pages table (see corpus_stats.py)
+STATS_STATEMENTS: Dict[str, str] = {
+    'corpus_stats.read': """
+        SELECT symbol_id, pages, tokens, embedded
+        FROM corpus_stats
+        WHERE scope = ?
+    """,
+    'corpus_stats.increment': """
+        UPDATE corpus_stats
+        SET pages = pages + ?, tokens = tokens + ?, embedded = embedded + ?
+        WHERE scope = ? AND symbol_id = ?
+    """,
+}
+
+# Used only by the one-off corpus_stats reconcile command, never on a request path
+RECONCILE_STATEMENTS: Dict[str, str] = {
+    'corpus_stats.scan_pages': """
+        SELECT symbol_id, tokens, writetime(embedding) AS embedding_written
+        FROM pages
+    """,
+    'corpus_stats.claim': """
+        INSERT INTO corpus_stats_lease (scope, owner) VALUES (?, ?)
+        IF NOT EXISTS USING TTL ?
+    """,
+    'corpus_stats.release': """
+        DELETE FROM corpus_stats_lease WHERE scope = ? IF owner = ?
+    """,
+}
+
+DEFAULT_STATEMENTS: Dict[str, str] = {**PAGE_STATEMENTS, **STATS_STATEMENTS}
+
+
+class StatementRegistry:
+    """Prepares named CQL statements once per session and binds them."""
+
+    def __init__(self, session: Any, statements: Optional[Dict[str, str]] = None):
+        """
+        Initialize the registry (nothing is prepared until prepare_all or first bind).
+
+        Args:
+            session: Cassandra session
+            statements: Name -> CQL mapping (defaults to DEFAULT_STATEMENTS)
+        """
+        self.session = session
+        self.statements = dict(statements if statements is not None else DEFAULT_STATEMENTS)
+        self._prepared: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.prepare_count = 0
+
+    def register(self, name: str, cql: str):
+        """Add (or replace) a statement; it is prepared on first use."""
+        with self._lock:
+            self.statements[name] = cql
+            self._prepared.pop(name, None)
+
+    def _prepare(self, name: str) -> Any:
+        prepared = self.session.prepare(self.statements[name])
+        self.prepare_count += 1
+        self._prepared[name] = prepared
+        return prepared
+
+    def prepare_all(self, strict: bool = False) -> Dict[str, str]:
+        """
+        Prepare every registered statement.
+
+        Args:
+            strict: Raise on the first failure instead of logging it
+
+        Returns:
+            Name -> error message for statements that failed to prepare
+        """
+        failures = {}
+        with self._lock:
+            for name in self.statements:
+                try:
+                    self._prepare(name)
+                except Exception as e:
+                    if strict:
+                        raise
+                    # e.g. ANN queries on a cluster without vector search
+                    failures[name] = str(e)
+                    logger.warning(f"Could not prepare {name}: {e}")
+        return failures
+
+    def get(self, name: str) -> Any:
+        """Prepared statement for a name, preparing it if needed."""
+        prepared = self._prepared.get(name)
+        if prepared is None:
+            with self._lock:
+                prepared = self._prepared.get(name) or self._prepare(name)
+        return prepared
+
+    def bind(self, name: str, parameters: Sequence[Any] = ()) -> Any:
+        """Bound statement ready for session.execute / execute_async."""
+        return self.get(name).bind(list(parameters))
+
+    def invalidate(self):
+        """Forget prepared handles (the next bind prepares again)."""
+        with self._lock:
+            self._prepared.clear()
+
+    # Host state listener interface (cluster.register_listener)
+
+    def on_up(self, host: Any):
+        logger.info(f"Cassandra host {host} is up; re-preparing {len(self.statements)} statements")
+        self.prepare_all()
+
+    def on_add(self, host: Any):
+        self.on_up(host)
+
+    def on_down(self, host: Any):
+        pass
+
+    def on_remove(self, host: Any):
+        pass
+
+    def listen(self, cluster: Any) -> 'StatementRegistry':
+        """Re-prepare whenever the cluster reports a node coming (back) up."""
+        cluster.register_listener(self)
+        return self
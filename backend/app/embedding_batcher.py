@@ -0,0 +1,181 @@
+"""
+Request-coalescing micro-batcher for local embedding inference.
+
+Concurrent embed calls are queued and picked up by one dedicated inference
+thread, which waits a few milliseconds (or until the batch is full) and runs
+a single batched `encode`. Each caller awaits its own future, so batch-size-1
+forward passes under load become a few large ones.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_QUEUE = 1024
+
+# Pending request: text, the caller's future and the loop that owns it
+_Request = Tuple[str, asyncio.Future, asyncio.AbstractEventLoop]
+
+
+class EmbeddingQueueFull(RuntimeError):
+    """Raised when the batcher's queue is at capacity."""
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text embeds into batched encode calls."""
+
+    def __init__(self,
+                 encode_batch: Callable[[List[str]], Sequence[Sequence[float]]],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 max_queue: int = DEFAULT_MAX_QUEUE,
+                 name: str = "embedding-batcher"):
+        """
+        Initialize the batcher (the inference thread starts on first use).
+
+        Args:
+            encode_batch: Maps a list of texts to one embedding per text
+            max_batch_size: Largest batch handed to encode_batch
+            max_wait_ms: How long the first request of a batch waits for company
+            max_queue: Pending requests allowed before callers are rejected
+            name: Inference thread name
+        """
+        self.encode_batch = encode_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_queue = max_queue
+        self.name = name
+
+        self._queue: 'queue.Queue[Optional[_Request]]' = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # Batcher statistics
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.largest_batch = 0
+        self.batch_sizes: Dict[int, int] = {}
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text as part of whatever batch is forming."""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            self._queue.put_nowait((text, future, loop))
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            raise EmbeddingQueueFull(f"Embedding queue full ({self.max_queue} pending)")
+        with self._stats_lock:
+            self.requests += 1
+        return await future
+
+    async def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed several texts; they may share batches with other callers."""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        """Gather requests until the batch is full or the wait window closes."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown requested; finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+        if future.done():
+            return  # caller gave up (cancelled)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _run(self):
+        """Inference thread: one encode per collected batch."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            texts = [text for text, _, _ in batch]
+            try:
+                embeddings = self.encode_batch(texts)
+                results = [list(map(float, embedding)) for embedding in embeddings]
+                if len(results) != len(batch):
+                    raise ValueError(f"encode_batch returned {len(results)} embeddings for {len(batch)} texts")
+                error = None
+            except Exception as e:
+                logger.error(f"Batched embedding of {len(batch)} texts failed: {e}")
+                results, error = [None] * len(batch), e
+
+            with self._stats_lock:
+                self.batches += 1
+                self.failed_batches += int(error is not None)
+                self.largest_batch = max(self.largest_batch, len(batch))
+                self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+
+            for (_, future, loop), result in zip(batch, results):
+                try:
+                    loop.call_soon_threadsafe(self._resolve, future, result, error)
+                except RuntimeError:
+                    pass  # caller's loop already closed
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and batch-size metrics."""
+        with self._stats_lock:
+            embedded = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                'queue_depth': self.queue_depth,
+                'max_queue': self.max_queue,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'requests': self.requests,
+                'rejected': self.rejected,
+                'batches': self.batches,
+                'failed_batches': self.failed_batches,
+                'mean_batch_size': embedded / self.batches if self.batches else 0.0,
+                'largest_batch': self.largest_batch,
+                'batch_size_histogram': dict(sorted(self.batch_sizes.items()))
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the inference thread after the queued requests are served."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+        self._thread = None
@@ -0,0 +1,371 @@
+"""
+Shared cache for text embeddings.
+
+Every embedding call site (retrieval API, context retrieval, the vector
+service, RAG and symbol text search) looks up (model name, normalized text
+hash) here before running a forward pass. Entries live in a bounded LRU and,
+when a cache directory is configured, in a memory-mapped on-disk tier that
+survives restarts.
+
+Keys use the canonical model name and the text actually embedded (normalized
+and capped at MAX_EMBED_CHARS), so every call site embedding the same input
+with the same model shares one entry. Callers that compute embeddings
+themselves must embed `embedding_input(text)`.
+
+Disk layout, per embedding size: `vectors-<dims>.f32` is a ring of
+fixed-size rows, `keys-<dims>.u64` holds a digest of the key stored in each
+row and `writes-<dims>.u64` counts the rows written so far (the next row is
+that count modulo the capacity). A row is only returned when its digest
+matches the key, so the directory can be shared by several processes (the
+app, the retrieval API, the seeder): writers take an fcntl lock and bump the
+shared counter, and each process keeps an in-memory digest index that it
+catches up by reading just the rows written since its last look.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .model_registry import canonical_model_name
+
+logger = logging.getLogger(__name__)
+
+# Cross-process locking of the disk tier (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_DISK_ENTRIES = 100000
+LOCK_FILE = '.lock'
+DIRECTORY_SETTLE_NS = 1_000_000_000
+
+# Longest input embedded: well inside the OpenAI embedding input limit, and
+# local sentence-transformers stop reading long before it
+MAX_EMBED_CHARS = 8000
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC, whitespace collapsed."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def embedding_input(text: str) -> str:
+    """The text every call site hands the model for `text`."""
+    return normalize_text(text)[:MAX_EMBED_CHARS]
+
+
+def cache_key(model: str, text: str) -> str:
+    """Cache key for an embedding of `text` produced by `model`."""
+    digest = hashlib.blake2b(embedding_input(text).encode('utf-8'), digest_size=16).hexdigest()
+    return f"{canonical_model_name(model)}:{digest}"
+
+
+def _key_digest(key: str) -> Tuple[int, int]:
+    """Non-zero 128-bit digest of a cache key, as stored in the disk tier's key column."""
+    high, low = np.frombuffer(hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest(), dtype=np.uint64)
+    # An all-zero digest marks an empty row
+    return int(high) or 1, int(low)
+
+
+class _DiskTier:
+    """Memory-mapped vector rings with a key digest per row, shareable between processes."""
+
+    def __init__(self, directory: Path, capacity: int):
+        self.directory = directory
+        self.capacity = capacity
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.directory / LOCK_FILE, 'a+b')
+        self._lock_depth = 0
+        # dims -> (vectors, digests, writes)
+        self._tables: Dict[int, Tuple[np.memmap, np.memmap, np.memmap]] = {}
+        # In-memory copy of the digest columns, caught up from the shared
+        # write counters rather than rescanned on every miss
+        self._slots: Dict[Tuple[int, int], Tuple[int, int]] = {}  # digest -> (dims, row)
+        self._known: Dict[int, np.ndarray] = {}                    # dims -> digests as last seen
+        self._seen: Dict[int, int] = {}                            # dims -> writes applied to _known
+        self._listed_mtime: Optional[int] = None
+        self._refresh()
+        logger.info(f"Embedding cache disk tier: {len(self)} entries in {self.directory}")
+
+    def _discover(self):
+        """Open tables for embedding sizes first written by another process."""
+        mtime = self.directory.stat().st_mtime_ns
+        if mtime == self._listed_mtime:
+            return
+        for path in self.directory.glob('keys-*.u64'):
+            try:
+                dims = int(path.stem.split('-', 1)[1])
+            except ValueError:
+                continue
+            if dims not in self._tables:
+                self._table(dims)
+        # A file created within the filesystem's timestamp granularity may not
+        # move the mtime, so only trust listings of a directory that has settled
+        if time.time_ns() - mtime > DIRECTORY_SETTLE_NS:
+            self._listed_mtime = mtime
+
+    @contextmanager
+    def _exclusive(self):
+        """Serialize writers across processes sharing the directory (reentrant)."""
+        if fcntl is None or self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        self._lock_depth = 1
+        try:
+            yield
+        finally:
+            self._lock_depth = 0
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _open(self, path: Path, dtype, shape: Tuple[int, ...]) -> np.memmap:
+        expected = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        mode = 'r+' if path.exists() and path.stat().st_size == expected else 'w+'
+        return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+    def _table(self, dims: int) -> Tuple[np.memmap, np.memmap, np.memmap]:
+        table = self._tables.get(dims)
+        if table is None:
+            # Created under the lock so two processes never both truncate a new file
+            with self._exclusive():
+                table = (
+                    self._open(self.directory / f"vectors-{dims}.f32", np.float32, (self.capacity, dims)),
+                    self._open(self.directory / f"keys-{dims}.u64", np.uint64, (self.capacity, 2)),
+                    self._open(self.directory / f"writes-{dims}.u64", np.uint64, (1,))
+                )
+            self._tables[dims] = table
+            self._known[dims] = np.zeros((self.capacity, 2), dtype=np.uint64)
+        return table
+
+    def _refresh(self):
+        """Catch the in-memory index up with writes from every process."""
+        self._discover()
+        for dims in self._tables:
+            self._refresh_table(dims)
+
+    def _refresh_table(self, dims: int):
+        """Re-read only the rows written since the last refresh of this table."""
+        writes = int(self._tables[dims][2][0])
+        seen = self._seen.get(dims)
+        if writes == seen:
+            return
+        if seen is None or not 0 < writes - seen < self.capacity:
+            rows = np.arange(self.capacity)
+        else:
+            rows = np.arange(seen, writes) % self.capacity
+        known = self._known[dims]
+        current = np.array(self._tables[dims][1][rows])
+        changed = np.flatnonzero((known[rows] != current).any(axis=1))
+        for row, old, new in zip(rows[changed].tolist(), known[rows[changed]].tolist(),
+                                 current[changed].tolist()):
+            old, new = tuple(old), tuple(new)
+            if self._slots.get(old) == (dims, row):
+                del self._slots[old]
+            if any(new):
+                self._slots[new] = (dims, row)
+        known[rows] = current
+        self._seen[dims] = writes
+
+    def _holds(self, slot: Tuple[int, int], digest: Tuple[int, int]) -> bool:
+        dims, row = slot
+        return tuple(self._tables[dims][1][row].tolist()) == digest
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._slots)
+
+    def _find(self, digest: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Slot currently holding the digest, refreshing the index if it is out of date."""
+        slot = self._slots.get(digest)
+        if slot is None or not self._holds(slot, digest):
+            self._refresh()
+            slot = self._slots.get(digest)
+        return slot
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        digest = _key_digest(key)
+        slot = self._find(digest)
+        if slot is None:
+            return None
+        dims, row = slot
+        vectors, digests, _ = self._tables[dims]
+        vector = np.array(vectors[row])
+        # Another process may have reused the row while it was copied
+        if tuple(digests[row].tolist()) != digest:
+            return None
+        return vector
+
+    def put(self, key: str, vector: np.ndarray):
+        dims = len(vector)
+        digest = _key_digest(key)
+        vectors, digests, writes = self._table(dims)
+        with self._exclusive():
+            self._refresh()
+            slot = self._slots.get(digest)
+            if slot is not None and slot[0] == dims:
+                row, total = slot[1], None
+            else:
+                total = int(writes[0])
+                row = total % self.capacity
+            # Readers accept a row only if its digest matches before and after copying it
+            digests[row] = 0
+            vectors[row] = vector
+            digests[row] = digest
+            # Counted only once the row is complete, so a refresh never reads it half-written
+            if total is not None:
+                writes[0] = total + 1
+            self._refresh_table(dims)
+
+    def close(self):
+        for table in self._tables.values():
+            for matrix in table:
+                matrix.flush()
+        self._tables.clear()
+        self._known.clear()
+        self._seen.clear()
+        self._slots.clear()
+        self._lock_file.close()
+
+
+class EmbeddingCache:
+    """Bounded LRU of embeddings with an optional persistent tier."""
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 disk_path: Optional[str] = None,
+                 disk_entries: int = DEFAULT_DISK_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: In-memory LRU capacity
+            disk_path: Directory for the memory-mapped tier (disabled if None)
+            disk_entries: Rows per embedding size in the disk tier
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._disk: Optional[_DiskTier] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            try:
+                self._disk = _DiskTier(Path(disk_path), disk_entries)
+            except OSError as e:
+                logger.warning(f"Embedding cache disk tier disabled: {e}")
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Cached embedding, or None."""
+        key = cache_key(model, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector.tolist()
+            if self._disk is not None:
+                vector = self._disk.get(key)
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                    return vector.tolist()
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, embedding: Sequence[float]):
+        """Store an embedding in every tier."""
+        key = cache_key(model, text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._remember(key, vector)
+            if self._disk is not None:
+                try:
+                    self._disk.put(key, vector)
+                except OSError as e:
+                    logger.warning(f"Embedding cache disk write failed: {e}")
+
+    def get_or_compute(self, model: str, text: str,
+                       compute: Callable[[str], Sequence[float]]) -> List[float]:
+        """Cached embedding, computing and storing it on a miss."""
+        embedding = self.get(model, text)
+        if embedding is None:
+            embedding = list(compute(embedding_input(text)))
+            self.put(model, text, embedding)
+        return embedding
+
+    async def aget_or_compute(self, model: str, text: str,
+                              compute: Callable[[str], Awaitable[Sequence[float]]]) -> List[float]:
+        """Async variant of get_or_compute."""
+        embedding = self.get(model, text)
+        if embedding is None:
+            embedding = list(await compute(embedding_input(text)))
+            self.put(model, text, embedding)
+        return embedding
+
+    def clear(self):
+        """Drop the in-memory tier (the disk tier is kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    def close(self):
+        """Flush and close the disk tier."""
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'disk_entries': len(self._disk) if self._disk is not None else 0,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+
+# Global cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the process-wide embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES))),
+            disk_path=os.getenv("EMBEDDING_CACHE_DIR") or None,
+            disk_entries=int(os.getenv("EMBEDDING_CACHE_DISK_ENTRIES", str(DEFAULT_DISK_ENTRIES)))
+        )
+    return _embedding_cache
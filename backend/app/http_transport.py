@@ -0,0 +1,347 @@
+"""
+Shared HTTP transport for REST calls to the data layer (Stargate).
+
+Both StargateClient and ProductionCassandraDatabase send their requests
+through one pooled `httpx.AsyncClient`, so connections are reused across
+callers instead of each building its own client with default limits. On top
+of the pool the transport adds:
+
+- explicit pool sizing and keep-alive, with HTTP/2 when `h2` is installed
+- retries with jittered exponential backoff, only for idempotent requests
+  (or, for any request, when the connection was never established)
+- a per-host circuit breaker that fails fast while the backend is down
+- orjson for request and response bodies when it is installed
+- per-endpoint request, error and latency metrics
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Faster JSON is optional - the stdlib covers everything it does
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+
+# Latency samples kept per endpoint for percentiles
+LATENCY_WINDOW = 1024
+
+
+def dumps(data: Any) -> bytes:
+    """Encode a JSON body."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str).encode('utf-8')
+
+
+def loads(content: bytes) -> Any:
+    """Decode a JSON body (empty bodies decode to an empty dict)."""
+    if not content:
+        return {}
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without sending when a host's circuit breaker is open."""
+
+
+@dataclass
+class TransportConfig:
+    """Pool, retry and breaker settings (see from_env for the variables)."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    http2: bool = False
+    retries: int = 2
+    backoff: float = 0.05
+    max_backoff: float = 2.0
+    breaker_failures: int = 5
+    breaker_reset_seconds: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> 'TransportConfig':
+        return cls(
+            max_connections=int(os.getenv('HTTP_MAX_CONNECTIONS', '100')),
+            max_keepalive_connections=int(os.getenv('HTTP_MAX_KEEPALIVE', '20')),
+            keepalive_expiry=float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30')),
+            connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', '5')),
+            read_timeout=float(os.getenv('HTTP_READ_TIMEOUT', '30')),
+            http2=os.getenv('HTTP_ENABLE_HTTP2', 'false').lower() in ('1', 'true', 'yes'),
+            retries=int(os.getenv('HTTP_RETRIES', '2')),
+            breaker_failures=int(os.getenv('HTTP_BREAKER_FAILURES', '5')),
+            breaker_reset_seconds=float(os.getenv('HTTP_BREAKER_RESET_SECONDS', '10'))
+        )
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; lets one probe through after a cool-down."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half-open' and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def abandon(self):
+        """A request ended without an outcome (e.g. cancelled); let another probe through."""
+        self._probing = False
+
+
+class EndpointMetrics:
+    """Request count, errors and recent latencies for one endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.status: Dict[int, int] = {}
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds: float, status: Optional[int], error: bool):
+        self.requests += 1
+        self.errors += int(error)
+        self.latencies.append(seconds)
+        if status is not None:
+            self.status[status] = self.status.get(status, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000.0
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'status': dict(sorted(self.status.items())),
+            'p50_ms': round(percentile(0.50), 2),
+            'p99_ms': round(percentile(0.99), 2)
+        }
+
+
+class HTTPTransport:
+    """Pooled async HTTP client with retries, circuit breaking and metrics."""
+
+    def __init__(self, config: Optional[TransportConfig] = None, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the transport (the pooled client is created on first request).
+
+        Args:
+            config: Pool, retry and breaker settings (defaults from the environment)
+            client: Prebuilt client to use instead of the pooled one
+        """
+        self.config = config or TransportConfig.from_env()
+        self._client = client
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._metrics: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            http2 = self.config.http2 and HTTP2_AVAILABLE
+            if self.config.http2 and not HTTP2_AVAILABLE:
+                logger.warning("HTTP/2 requested but h2 is not installed - using HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry
+                ),
+                timeout=httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout)
+            )
+        return self._client
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.config.breaker_failures, self.config.breaker_reset_seconds)
+                self._breakers[host] = breaker
+            return breaker
+
+    def _endpoint_metrics(self, endpoint: str) -> EndpointMetrics:
+        with self._lock:
+            return self._metrics.setdefault(endpoint, EndpointMetrics())
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retrying clients from stampeding in step
+        ceiling = min(self.config.max_backoff, self.config.backoff * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      json: Any = None,
+                      params: Optional[Dict[str, Any]] = None,
+                      headers: Optional[Dict[str, str]] = None,
+                      endpoint: Optional[str] = None,
+                      idempotent: Optional[bool] = None) -> httpx.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            json: Body, encoded with the fast JSON encoder
+            params: Query parameters
+            headers: Extra headers
+            endpoint: Metrics label (defaults to method and path; pass a
+                template for paths that embed IDs)
+            idempotent: Whether a retry after the request may have reached the
+                server is safe (defaults by method)
+
+        Returns:
+            The final response (including 4xx/5xx ones that were not retried)
+
+        Raises:
+            CircuitOpenError: The host's breaker is open
+            httpx.HTTPError: Transport failure after the last retry
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        metrics = self._endpoint_metrics(endpoint or f"{method} {urlsplit(url).path}")
+        breaker = self._breaker(url)
+
+        request_headers = {'Accept': 'application/json'}
+        content = None
+        if json is not None:
+            content = dumps(json)
+            request_headers['Content-Type'] = 'application/json'
+        if headers:
+            request_headers.update(headers)
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                metrics.record(0.0, None, error=True)
+                raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(
+                    method, url, content=content, params=params, headers=request_headers
+                )
+            except httpx.TransportError as e:
+                metrics.record(time.perf_counter() - started, None, error=True)
+                breaker.record_failure()
+                # A failed connect never reached the server, so any request may retry
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= self.config.retries:
+                    raise
+            except BaseException:
+                # Cancelled, or failed after the server answered: no verdict on the host,
+                # but a half-open probe must not stay claimed or the breaker never closes
+                metrics.record(time.perf_counter() - started, None, error=True)
+                breaker.abandon()
+                raise
+            else:
+                failed = response.status_code >= 500 or response.status_code == 429
+                metrics.record(time.perf_counter() - started, response.status_code, error=failed)
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if not (idempotent and response.status_code in RETRYABLE_STATUS) or attempt >= self.config.retries:
+                    return response
+
+            metrics.retries += 1
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint metrics and breaker states."""
+        with self._lock:
+            return {
+                'http2': self.config.http2 and HTTP2_AVAILABLE,
+                'fast_json': ORJSON_AVAILABLE,
+                'max_connections': self.config.max_connections,
+                'endpoints': {endpoint: metrics.get_stats() for endpoint, metrics in self._metrics.items()},
+                'breakers': {host: breaker.state for host, breaker in self._breakers.items()}
+            }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global transport instance
+_http_transport: Optional[HTTPTransport] = None
+
+
+def get_http_transport() -> HTTPTransport:
+    """Get or create the process-wide HTTP transport."""
+    global _http_transport
+    if _http_transport is None:
+        _http_transport = HTTPTransport()
+    return _http_transport
+
+
+async def close_http_transport():
+    """Close the shared connection pool (on application shutdown)."""
+    if _http_transport is not None:
+        await _http_transport.aclose()
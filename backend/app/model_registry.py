@@ -0,0 +1,170 @@
+"""
+Process-wide registry of embedding models.
+
+Every SentenceTransformer in the process (MiniLM for text retrieval, CLIP for
+symbol search and the SREC compiler) is loaded through here, once, no matter
+how many services ask for it. Models can be preloaded at startup; readiness
+and per-model memory are reported for health checks.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRELOAD = "sentence-transformers/all-MiniLM-L6-v2"
+# Model names served by the OpenAI embeddings API
+OPENAI_EMBED_PREFIX = 'text-embedding-'
+
+
+def canonical_model_name(name: str) -> str:
+    """Hub shorthand ('all-MiniLM-L6-v2') and full name resolve to one entry.
+
+    OpenAI embedding model names are not hub models and are left as they are.
+    """
+    if '/' in name or name.startswith(OPENAI_EMBED_PREFIX) or os.path.exists(name):
+        return name
+    return f"sentence-transformers/{name}"
+
+
+def _load_sentence_transformer(name: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+def _model_bytes(model: Any) -> int:
+    """Resident size of a torch module's parameters and buffers."""
+    total = 0
+    for getter in ('parameters', 'buffers'):
+        tensors = getattr(model, getter, None)
+        if tensors is None:
+            continue
+        for tensor in tensors():
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+@dataclass
+class LoadedModel:
+    """A resident model and what it cost to load."""
+    name: str
+    model: Any
+    load_seconds: float
+    memory_bytes: int
+
+
+class ModelRegistry:
+    """Loads each named model once per process and shares it."""
+
+    def __init__(self, loader: Callable[[str], Any] = _load_sentence_transformer):
+        """
+        Initialize an empty registry.
+
+        Args:
+            loader: Builds a model from its canonical name
+        """
+        self.loader = loader
+        self._models: Dict[str, LoadedModel] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._failures: Dict[str, str] = {}
+        self._preload: List[str] = []
+        self._ready = threading.Event()
+
+    def get(self, name: str) -> Any:
+        """Shared instance of a model, loading it on first use."""
+        name = canonical_model_name(name)
+        loaded = self._models.get(name)
+        if loaded is not None:
+            return loaded.model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            loaded = self._models.get(name)
+            if loaded is None:
+                logger.info(f"Loading model {name}")
+                started = time.perf_counter()
+                try:
+                    model = self.loader(name)
+                except Exception as e:
+                    self._failures[name] = str(e)
+                    logger.error(f"Failed to load model {name}: {e}")
+                    raise
+                loaded = LoadedModel(
+                    name=name,
+                    model=model,
+                    load_seconds=time.perf_counter() - started,
+                    memory_bytes=_model_bytes(model)
+                )
+                self._models[name] = loaded
+                self._failures.pop(name, None)
+                logger.info(f"✓ Model {name} loaded in {loaded.load_seconds:.1f}s "
+                            f"({loaded.memory_bytes / 2**20:.0f} MiB)")
+        return loaded.model
+
+    def is_loaded(self, name: str) -> bool:
+        return canonical_model_name(name) in self._models
+
+    def preload_sync(self, names: Iterable[str]):
+        """Load models on the calling thread, then signal readiness."""
+        self._preload = [canonical_model_name(name) for name in names]
+        for name in self._preload:
+            try:
+                self.get(name)
+            except Exception:
+                pass  # recorded in _failures; callers retry lazily
+        self._ready.set()
+
+    async def preload(self, names: Iterable[str]):
+        """Load models on a worker thread so the event loop keeps serving."""
+        await asyncio.get_running_loop().run_in_executor(None, self.preload_sync, list(names))
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until preloading finished (True) or the timeout expired."""
+        return self._ready.wait(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Readiness plus load time and memory per resident model."""
+        return {
+            'ready': self.ready,
+            'preload': list(self._preload),
+            'models': {
+                name: {
+                    'load_seconds': round(loaded.load_seconds, 3),
+                    'memory_bytes': loaded.memory_bytes
+                }
+                for name, loaded in self._models.items()
+            },
+            'failed': dict(self._failures),
+            'total_memory_bytes': sum(loaded.memory_bytes for loaded in self._models.values())
+        }
+
+
+# Global registry instance
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create the process-wide model registry."""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
+
+
+def get_preload_models() -> List[str]:
+    """Models named by PRELOAD_MODELS (comma separated, 'none' to disable)."""
+    value = os.getenv("PRELOAD_MODELS", DEFAULT_PRELOAD).strip()
+    if value.lower() in ('', 'none'):
+        return []
+    return [name.strip() for name in value.split(',') if name.strip()]
@@ -0,0 +1,438 @@
+"""
+Read-through cache for story pages.
+
+ProductionCassandraDatabase looks pages up here before going to Stargate. The
+first tier is a bounded in-process LRU holding StoryPage objects, so a hot
+page is a dict lookup. The optional second tier (Redis, or an in-memory
+stand-in for development) is shared between processes and holds pages as
+JSON. Missing page IDs are cached too, for a shorter time, so repeated
+lookups of unknown IDs stay off the database.
+
+Writes through the database invalidate the pages they touch: the local entry
+is dropped and the shared entry is replaced by a short-lived tombstone that is
+unique to that write. Reads fill the shared tier where a key is absent
+(SET NX), or replace a tombstone with a compare-and-set when the read is known
+to have started after it: after this process wrote it (by invalidation
+generation, see `begin_read`) or after this process saw it in the shared tier.
+A read that started before a write - in this process or any other - therefore
+cannot put the old page back while the tombstone lives, a later write's new
+tombstone makes an in-flight replacement fail, and reads older than the
+tombstone's lifetime never write to the shared tier at all. Other processes'
+in-process tiers are not reached by invalidation; they can serve a page read
+before the write until the entry expires, so PAGE_CACHE_TTL_SECONDS bounds how
+stale a page can be.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import StoryPage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_NEGATIVE_TTL_SECONDS = 10.0
+DEFAULT_SHARED_TTL_SECONDS = 300.0
+# Must outlast the slowest page read (HTTP timeout and retries included)
+DEFAULT_TOMBSTONE_SECONDS = 120.0
+
+# Shared-tier value of a page ID known not to exist
+_MISSING = b'null'
+# Prefix of the shared-tier value of a page just written; only reads known to
+# have started after that write may replace it
+_TOMBSTONE = b'tombstone:'
+
+# (invalidation generation, monotonic start time) of a database read
+ReadToken = Tuple[int, float]
+
+
+class LocalSharedTier:
+    """In-memory stand-in for the shared tier (development and tests)."""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[bytes, float]] = {}
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        now = time.monotonic()
+        found = {}
+        for key in keys:
+            entry = self._values.get(key)
+            if entry is not None and entry[1] > now:
+                found[key] = entry[0]
+        return found
+
+    async def set_many(self, values: Dict[str, bytes], ttl_seconds: float,
+                       only_if_absent: bool = False) -> Set[str]:
+        now = time.monotonic()
+        written = set()
+        for key, value in values.items():
+            entry = self._values.get(key)
+            if only_if_absent and entry is not None and entry[1] > now:
+                continue
+            self._values[key] = (value, now + ttl_seconds)
+            written.add(key)
+        return written
+
+    async def replace_many(self, values: Dict[str, Tuple[bytes, bytes]], ttl_seconds: float) -> Set[str]:
+        """Set key -> (expected, value) pairs whose current value is `expected`."""
+        now = time.monotonic()
+        written = set()
+        for key, (expected, value) in values.items():
+            entry = self._values.get(key)
+            if entry is not None and entry[1] > now and entry[0] == expected:
+                self._values[key] = (value, now + ttl_seconds)
+                written.add(key)
+        return written
+
+
+# Sets each key to its new value if it still holds the expected one; returns
+# the 1-based positions of the keys written
+_REPLACE_SCRIPT = """
+local written = {}
+for i, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[2 * i] then
+        redis.call('SET', key, ARGV[2 * i + 1], 'PX', ARGV[1])
+        table.insert(written, i)
+    end
+end
+return written
+"""
+
+
+class RedisSharedTier:
+    """Shared tier backed by Redis (requires the redis package)."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis_asyncio
+        self.client = redis_asyncio.from_url(url)
+        self._replace = self.client.register_script(_REPLACE_SCRIPT)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        values = await self.client.mget(keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, values: Dict[str, bytes], ttl_seconds: float,
+                       only_if_absent: bool = False) -> Set[str]:
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.set(key, value, px=int(ttl_seconds * 1000), nx=only_if_absent)
+        results = await pipeline.execute()
+        return {key for key, result in zip(values, results) if result}
+
+    async def replace_many(self, values: Dict[str, Tuple[bytes, bytes]], ttl_seconds: float) -> Set[str]:
+        """Set key -> (expected, value) pairs whose current value is `expected`, atomically."""
+        keys = list(values)
+        args: List[Any] = [int(ttl_seconds * 1000)]
+        for expected, value in values.values():
+            args += [expected, value]
+        positions = await self._replace(keys=keys, args=args)
+        return {keys[position - 1] for position in positions}
+
+
+class PageCache:
+    """Two-tier read-through cache of StoryPages, with negative entries."""
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+                 shared: Optional[Any] = None,
+                 shared_ttl_seconds: float = DEFAULT_SHARED_TTL_SECONDS,
+                 tombstone_seconds: float = DEFAULT_TOMBSTONE_SECONDS,
+                 namespace: str = 'gibsey:page'):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Pages (and negative entries) kept in process
+            ttl_seconds: Lifetime of an in-process entry
+            negative_ttl_seconds: Lifetime of a "page does not exist" entry
+            shared: Optional shared tier (LocalSharedTier / RedisSharedTier)
+            shared_ttl_seconds: Lifetime of a page in the shared tier
+            tombstone_seconds: Lifetime of a shared-tier tombstone; reads that
+                took longer are not written to the shared tier
+            namespace: Prefix of shared-tier keys
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.shared = shared
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.tombstone_seconds = tombstone_seconds
+        self.namespace = namespace
+
+        # page_id -> (page or None for missing, expiry)
+        self._entries: 'OrderedDict[str, Tuple[Optional[StoryPage], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Invalidation counter, and the counter value of each recent invalidation
+        self.generation = 0
+        self._invalidated: 'OrderedDict[str, int]' = OrderedDict()
+        self._forgotten_generation = 0
+
+        # page_id -> (shared-tier tombstone, monotonic time it was seen, or None
+        # if this cache wrote it and invalidation generations order reads after it)
+        self._tombstones: 'OrderedDict[str, Tuple[bytes, Optional[float]]]' = OrderedDict()
+        self._tombstone_prefix = _TOMBSTONE + uuid.uuid4().hex.encode('ascii')
+
+        # Cache statistics
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.shared_errors = 0
+
+    @classmethod
+    def from_env(cls) -> 'PageCache':
+        """
+        Cache configured by PAGE_CACHE_SIZE, PAGE_CACHE_TTL_SECONDS,
+        PAGE_CACHE_NEGATIVE_TTL_SECONDS, PAGE_CACHE_SHARED ('none', 'local'
+        or a redis:// URL), PAGE_CACHE_SHARED_TTL_SECONDS and
+        PAGE_CACHE_TOMBSTONE_SECONDS.
+        """
+        shared_setting = os.getenv('PAGE_CACHE_SHARED', 'none').strip()
+        shared = None
+        if shared_setting == 'local':
+            shared = LocalSharedTier()
+        elif shared_setting.startswith(('redis://', 'rediss://')):
+            try:
+                shared = RedisSharedTier(shared_setting)
+            except ImportError:
+                logger.warning("PAGE_CACHE_SHARED points at Redis but redis is not installed - "
+                               "using the in-process tier only")
+        return cls(
+            max_entries=int(os.getenv('PAGE_CACHE_SIZE', str(DEFAULT_MAX_ENTRIES))),
+            ttl_seconds=float(os.getenv('PAGE_CACHE_TTL_SECONDS', str(DEFAULT_TTL_SECONDS))),
+            negative_ttl_seconds=float(os.getenv('PAGE_CACHE_NEGATIVE_TTL_SECONDS',
+                                                 str(DEFAULT_NEGATIVE_TTL_SECONDS))),
+            shared=shared,
+            shared_ttl_seconds=float(os.getenv('PAGE_CACHE_SHARED_TTL_SECONDS', str(DEFAULT_SHARED_TTL_SECONDS))),
+            tombstone_seconds=float(os.getenv('PAGE_CACHE_TOMBSTONE_SECONDS', str(DEFAULT_TOMBSTONE_SECONDS)))
+        )
+
+    def _shared_key(self, page_id: str) -> str:
+        return f"{self.namespace}:{page_id}"
+
+    def _store_local(self, page_id: str, page: Optional[StoryPage]):
+        ttl = self.ttl_seconds if page is not None else min(self.ttl_seconds, self.negative_ttl_seconds)
+        with self._lock:
+            self._entries[page_id] = (page, time.monotonic() + ttl)
+            self._entries.move_to_end(page_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _note_tombstone(self, page_id: str, value: bytes, seen_at: Optional[float]):
+        with self._lock:
+            known = self._tombstones.get(page_id)
+            if known is not None and known[0] == value:
+                return
+            self._tombstones[page_id] = (value, seen_at)
+            self._tombstones.move_to_end(page_id)
+            while len(self._tombstones) > self.max_entries:
+                self._tombstones.popitem(last=False)
+
+    def _replaceable_tombstone(self, page_id: str, token: ReadToken) -> Optional[bytes]:
+        """Tombstone of page_id that a read started at `token` may replace, if any."""
+        with self._lock:
+            known = self._tombstones.get(page_id)
+        if known is None:
+            return None
+        value, seen_at = known
+        # Our own tombstones were already checked against the token's generation
+        return value if seen_at is None or token[1] > seen_at else None
+
+    def _get_local(self, page_id: str) -> Tuple[bool, Optional[StoryPage]]:
+        with self._lock:
+            entry = self._entries.get(page_id)
+            if entry is None:
+                return False, None
+            if entry[1] <= time.monotonic():
+                del self._entries[page_id]
+                return False, None
+            self._entries.move_to_end(page_id)
+            return True, entry[0]
+
+    async def get_many(self, page_ids: Iterable[str]) -> Dict[str, Optional[StoryPage]]:
+        """
+        Cached entries for the given IDs.
+
+        Returns:
+            page_id -> page for hits; page_id -> None for IDs known to be
+            missing. IDs absent from the result must be read from the database.
+        """
+        found: Dict[str, Optional[StoryPage]] = {}
+        remaining = []
+        for page_id in dict.fromkeys(page_ids):
+            hit, page = self._get_local(page_id)
+            if hit:
+                found[page_id] = page
+                self.local_hits += page is not None
+                self.negative_hits += page is None
+            else:
+                remaining.append(page_id)
+
+        if remaining and self.shared is not None:
+            try:
+                values = await self.shared.get_many([self._shared_key(page_id) for page_id in remaining])
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared page cache read failed: {e}")
+                values = {}
+            still_missing = []
+            for page_id in remaining:
+                value = values.get(self._shared_key(page_id))
+                if value is None or value.startswith(_TOMBSTONE):
+                    if value is not None:
+                        # Reads that start from here on are newer than this write
+                        self._note_tombstone(page_id, value, time.monotonic())
+                    still_missing.append(page_id)
+                    continue
+                page = None if value == _MISSING else StoryPage.model_validate_json(value)
+                found[page_id] = page
+                self._store_local(page_id, page)
+                self.shared_hits += page is not None
+                self.negative_hits += page is None
+            remaining = still_missing
+
+        self.misses += len(remaining)
+        # Hand out copies so callers reassigning fields don't change the cached page
+        return {page_id: page.model_copy() if page is not None else None for page_id, page in found.items()}
+
+    def _invalidated_since(self, page_id: str, generation: int) -> bool:
+        with self._lock:
+            if generation < self._forgotten_generation:
+                # Too old to tell - assume the page was written meanwhile
+                return True
+            return self._invalidated.get(page_id, -1) > generation
+
+    def begin_read(self) -> ReadToken:
+        """Token to pass to put_many for pages about to be read from the database."""
+        return self.generation, time.monotonic()
+
+    async def put_many(self, pages: Dict[str, Optional[StoryPage]], token: Optional[ReadToken] = None):
+        """
+        Cache pages read from the database (None marks an ID as missing).
+
+        Args:
+            pages: page_id -> page or None
+            token: begin_read() result from before the database read started;
+                pages invalidated since then are not stored, and shared-tier
+                tombstones older than it are replaced. Without a token, pages
+                are only written where the shared tier has no entry.
+        """
+        if token is not None:
+            pages = {page_id: page for page_id, page in pages.items()
+                     if not self._invalidated_since(page_id, token[0])}
+        if not pages:
+            return
+
+        if self.shared is not None:
+            if token is not None and time.monotonic() - token[1] > self.tombstone_seconds:
+                # A tombstone from a write during this read may already have expired
+                return
+            present = {self._shared_key(page_id): page.model_dump_json().encode('utf-8')
+                       for page_id, page in pages.items() if page is not None}
+            missing = {self._shared_key(page_id): _MISSING for page_id, page in pages.items() if page is None}
+            try:
+                written = set()
+                if present:
+                    written |= await self.shared.set_many(present, self.shared_ttl_seconds, only_if_absent=True)
+                if missing:
+                    written |= await self.shared.set_many(missing, self.negative_ttl_seconds, only_if_absent=True)
+                if token is not None:
+                    written |= await self._replace_tombstones(
+                        {page_id: page for page_id, page in pages.items() if self._shared_key(page_id) not in written},
+                        token
+                    )
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared page cache write failed: {e}")
+            else:
+                # Keys still present hold a tombstone or another reader's copy; don't trust ours
+                pages = {page_id: page for page_id, page in pages.items() if self._shared_key(page_id) in written}
+
+        for page_id, page in pages.items():
+            self._store_local(page_id, page)
+
+    async def _replace_tombstones(self, pages: Dict[str, Optional[StoryPage]], token: ReadToken) -> Set[str]:
+        """Overwrite the tombstones of pages read after they were written; returns the keys written."""
+        present, missing = {}, {}
+        for page_id, page in pages.items():
+            tombstone = self._replaceable_tombstone(page_id, token)
+            if tombstone is None:
+                continue
+            if page is not None:
+                present[self._shared_key(page_id)] = (tombstone, page.model_dump_json().encode('utf-8'))
+            else:
+                missing[self._shared_key(page_id)] = (tombstone, _MISSING)
+
+        written = set()
+        if present:
+            written |= await self.shared.replace_many(present, self.shared_ttl_seconds)
+        if missing:
+            written |= await self.shared.replace_many(missing, self.negative_ttl_seconds)
+        with self._lock:
+            for page_id in pages:
+                if self._shared_key(page_id) in written:
+                    self._tombstones.pop(page_id, None)
+        return written
+
+    async def invalidate(self, page_ids: Iterable[str]):
+        """Drop pages after they were written, leaving tombstones in the shared tier."""
+        page_ids = list(dict.fromkeys(page_ids))
+        if not page_ids:
+            return
+        with self._lock:
+            self.generation += 1
+            tombstone = self._tombstone_prefix + b':' + str(self.generation).encode('ascii')
+            for page_id in page_ids:
+                self._entries.pop(page_id, None)
+                self._invalidated[page_id] = self.generation
+                self._invalidated.move_to_end(page_id)
+            while len(self._invalidated) > self.max_entries:
+                _, forgotten = self._invalidated.popitem(last=False)
+                self._forgotten_generation = max(self._forgotten_generation, forgotten)
+        self.invalidations += len(page_ids)
+
+        if self.shared is not None:
+            for page_id in page_ids:
+                self._note_tombstone(page_id, tombstone, None)
+            try:
+                await self.shared.set_many(
+                    {self._shared_key(page_id): tombstone for page_id in page_ids}, self.tombstone_seconds
+                )
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared page cache invalidation failed: {e}")
+
+    def clear(self):
+        """Drop every in-process entry (the shared tier expires on its own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates per tier and entry counts."""
+        hits = self.local_hits + self.shared_hits + self.negative_hits
+        lookups = hits + self.misses
+        return {
+            'entries': len(self),
+            'max_entries': self.max_entries,
+            'shared_tier': type(self.shared).__name__ if self.shared is not None else None,
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'shared_errors': self.shared_errors
+        }
@@ -14,9 +14,16 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
-import chromadb
 import numpy as np
 
+# Only semantic symbol search needs ChromaDB; ECC worker processes never do
+try:
+    import chromadb
+except ImportError:
+    chromadb = None
+
+from .qdpi_canon import CANON, SYMBOL_DATA, QDPINarrative
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
@@ -105,6 +112,38 @@ class QDPIState:
             timestamp=self.timestamp
         )
 
+class QDPIGlyphSequence:
+    """Compact glyph-id view of an encoded message.
+
+    The message is held as a uint8 array of glyph IDs; QDPISymbol objects are
+    only looked up when a caller indexes or iterates the sequence.
+    """
+
+    __slots__ = ('glyph_ids', '_symbol_table')
+
+    def __init__(self, glyph_ids: np.ndarray, symbol_table: List[QDPISymbol]):
+        self.glyph_ids = glyph_ids
+        self._symbol_table = symbol_table
+
+    def __len__(self) -> int:
+        return len(self.glyph_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return QDPIGlyphSequence(self.glyph_ids[index], self._symbol_table)
+        return self._symbol_table[int(self.glyph_ids[index])]
+
+    def __iter__(self):
+        return map(self._symbol_table.__getitem__, self.glyph_ids.tolist())
+
+    def to_bytes(self) -> bytes:
+        """Raw glyph-id bytes (one byte per glyph)"""
+        return self.glyph_ids.tobytes()
+
+    def to_symbols(self) -> List[QDPISymbol]:
+        """Materialise the full QDPISymbol list"""
+        return list(self)
+
 class QDPICodex:
     """Complete QDPI symbol codex with encoding/decoding capabilities"""
     
@@ -113,80 +152,14 @@ class QDPICodex:
         self.name_to_symbol: Dict[str, QDPISymbol] = {}
         self.glyph_to_symbol: Dict[int, QDPISymbol] = {}
         self._load_codex()
+        self._build_lookup_tables()
     
     def _load_codex(self):
         """Load the complete 64-symbol QDPI codex"""
-        # Complete symbol codex data from generate_symbols.py
-        symbol_data = [
-            ("an_author", 1, "n", "o/o", "o/o", "o/o", "x/x"),
-            ("london_fox", 2, "n", "o/o", "o/o", "x/x", "x/x"),
-            ("glyph_marrow", 3, "n", "o/o", "x/x", "o/o", "x/x"),
-            ("phillip_bafflemint", 4, "n", "x/x", "o/o", "o/o", "x/x"),
-            ("jacklyn_variance", 5, "n", "o/o", "x/x", "x/x", "x/x"),
-            ("oren_progresso", 6, "n", "x/x", "o/o", "x/x", "x/x"),
-            ("old_natalie_weissman", 7, "n", "x/x", "x/x", "o/o", "x/x"),
-            ("princhetta", 8, "n", "x/x", "x/x", "x/x", "x/x"),
-            ("cop-e-right", 9, "u", "x/x", "x/x", "x/x", "x/x"),
-            ("new_natalie_weissman", 10, "u", "x/x", "o/o", "x/x", "x/x"),
-            ("arieol_owlist", 11, "u", "x/x", "x/x", "o/o", "x/x"),
-            ("jack_parlance", 12, "u", "x/x", "x/x", "x/x", "o/o"),
-            ("manny_valentinas", 13, "u", "x/x", "o/o", "o/o", "x/x"),
-            ("shamrock_stillman", 14, "u", "x/x", "o/o", "x/x", "o/o"),
-            ("todd_fishbone", 15, "u", "x/x", "x/x", "o/o", "o/o"),
-            ("The_Author", 16, "u", "x/x", "o/o", "o/o", "o/o"),
-            # Hidden symbols 17-64 (generated symbols)
-            ("hidden_symbol_01", 17, "n", "o/o", "o/o", "x/o", "x/x"),
-            ("hidden_symbol_02", 18, "n", "o/o", "o/o", "o/x", "x/x"),
-            ("hidden_symbol_03", 19, "n", "o/o", "x/o", "o/o", "x/x"),
-            ("hidden_symbol_04", 20, "n", "o/o", "o/x", "o/o", "x/x"),
-            ("hidden_symbol_05", 21, "n", "x/o", "o/o", "o/o", "x/x"),
-            ("hidden_symbol_06", 22, "n", "o/x", "o/o", "o/o", "x/x"),
-            ("hidden_symbol_07", 23, "n", "o/o", "x/o", "x/x", "x/x"),
-            ("hidden_symbol_08", 24, "n", "o/o", "o/x", "x/x", "x/x"),
-            ("hidden_symbol_09", 25, "n", "x/o", "o/o", "x/x", "x/x"),
-            ("hidden_symbol_10", 26, "n", "o/x", "o/o", "x/x", "x/x"),
-            ("hidden_symbol_11", 27, "n", "o/o", "x/x", "x/o", "x/x"),
-            ("hidden_symbol_12", 28, "n", "o/o", "x/x", "o/x", "x/x"),
-            ("hidden_symbol_13", 29, "n", "x/o", "x/x", "o/x", "x/x"),
-            ("hidden_symbol_14", 30, "n", "o/x", "x/x", "o/x", "x/x"),
-            ("hidden_symbol_15", 31, "n", "x/x", "x/x", "x/o", "x/x"),
-            ("hidden_symbol_16", 32, "n", "x/x", "x/x", "o/x", "x/x"),
-            ("hidden_symbol_17", 33, "n", "x/x", "o/x", "x/x", "x/x"),
-            ("hidden_symbol_18", 34, "n", "x/x", "x/o", "x/x", "x/x"),
-            ("hidden_symbol_19", 35, "n", "o/x", "x/x", "x/x", "x/x"),
-            ("hidden_symbol_20", 36, "n", "x/o", "x/x", "x/x", "x/x"),
-            ("hidden_symbol_21", 37, "n", "o/x", "x/x", "x/o", "x/x"),
-            ("hidden_symbol_22", 38, "n", "x/o", "x/x", "x/o", "x/x"),
-            ("hidden_symbol_23", 39, "n", "o/x", "x/o", "o/o", "x/x"),
-            ("hidden_symbol_24", 40, "n", "x/o", "o/x", "o/o", "x/x"),
-            ("hidden_symbol_25", 41, "u", "x/x", "x/o", "o/o", "o/o"),
-            ("hidden_symbol_26", 42, "u", "x/x", "o/x", "o/o", "o/o"),
-            ("hidden_symbol_27", 43, "u", "x/x", "o/o", "x/o", "o/o"),
-            ("hidden_symbol_28", 44, "u", "x/x", "o/o", "o/x", "o/o"),
-            ("hidden_symbol_29", 45, "u", "x/x", "o/o", "o/o", "x/o"),
-            ("hidden_symbol_30", 46, "u", "x/x", "o/o", "o/o", "o/x"),
-            ("hidden_symbol_31", 47, "u", "x/x", "x/x", "x/o", "o/o"),
-            ("hidden_symbol_32", 48, "u", "x/x", "x/x", "o/x", "o/o"),
-            ("hidden_symbol_33", 49, "u", "x/x", "x/x", "o/o", "x/o"),
-            ("hidden_symbol_34", 50, "u", "x/x", "x/x", "o/o", "o/x"),
-            ("hidden_symbol_35", 51, "u", "x/x", "x/o", "x/x", "o/o"),
-            ("hidden_symbol_36", 52, "u", "x/x", "o/x", "x/x", "o/o"),
-            ("hidden_symbol_37", 53, "u", "x/x", "o/x", "x/x", "x/o"),
-            ("hidden_symbol_38", 54, "u", "x/x", "o/x", "x/x", "o/x"),
-            ("hidden_symbol_39", 55, "u", "x/x", "x/o", "x/x", "x/x"),
-            ("hidden_symbol_40", 56, "u", "x/x", "o/x", "x/x", "x/x"),
-            ("hidden_symbol_41", 57, "u", "x/x", "x/x", "o/x", "x/x"),
-            ("hidden_symbol_42", 58, "u", "x/x", "x/x", "x/o", "x/x"),
-            ("hidden_symbol_43", 59, "u", "x/x", "x/x", "x/x", "x/o"),
-            ("hidden_symbol_44", 60, "u", "x/x", "x/x", "x/x", "o/x"),
-            ("hidden_symbol_45", 61, "u", "x/x", "x/o", "x/x", "o/x"),
-            ("hidden_symbol_46", 62, "u", "x/x", "x/o", "x/x", "x/o"),
-            ("hidden_symbol_47", 63, "u", "x/x", "o/o", "x/o", "o/x"),
-            ("hidden_symbol_48", 64, "u", "x/x", "o/o", "o/x", "o/x"),
-        ]
+        # Symbol data lives in the shared canon tables
         
         # Create all symbol variants with rotations
-        for name, symbol_id, orientation, row1, row2, row3, row4 in symbol_data:
+        for name, symbol_id, orientation, row1, row2, row3, row4 in SYMBOL_DATA:
             base_symbol = QDPISymbol(
                 name=name,
                 id=symbol_id,
@@ -213,45 +186,80 @@ class QDPICodex:
                     self.name_to_symbol[name] = symbol
                 self.glyph_to_symbol[symbol.glyph_id] = symbol
     
+    def _build_lookup_tables(self):
+        """Build the whole-buffer translation tables used by the bulk codec"""
+        # byte value -> glyph ID, with the same modulo fallback as per-symbol lookup
+        glyph_count = len(self.glyph_to_symbol)
+        self._encode_table = bytes(
+            byte_val if byte_val in self.glyph_to_symbol else byte_val % glyph_count
+            for byte_val in range(256)
+        )
+        # glyph ID -> QDPISymbol, indexable by the uint8 glyph array
+        self._symbol_table: List[QDPISymbol] = [
+            self.glyph_to_symbol.get(glyph_id) for glyph_id in range(256)
+        ]
+
+    @staticmethod
+    def _to_bytes(data: Any) -> bytes:
+        """Convert arbitrary data to the byte form that gets encoded"""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data)
+        if isinstance(data, str):
+            return data.encode('utf-8')
+        if isinstance(data, dict):
+            return json.dumps(data, sort_keys=True).encode('utf-8')
+        if isinstance(data, (list, tuple)):
+            return json.dumps(list(data), sort_keys=True).encode('utf-8')
+        return str(data).encode('utf-8')
+
+    def encode_glyphs(self, data: Any) -> np.ndarray:
+        """Encode data into a uint8 glyph-ID array with a single table translation"""
+        data_bytes = self._to_bytes(data)
+        return np.frombuffer(data_bytes.translate(self._encode_table), dtype=np.uint8)
+
+    def decode_glyphs(self, glyph_ids: Union[bytes, bytearray, np.ndarray, List[int]]) -> bytes:
+        """Decode a glyph-ID array (or raw glyph bytes) back to data bytes"""
+        if isinstance(glyph_ids, (bytes, bytearray, memoryview)):
+            return bytes(glyph_ids)
+        if isinstance(glyph_ids, np.ndarray):
+            if glyph_ids.dtype != np.uint8:
+                if glyph_ids.size and (glyph_ids.min() < 0 or glyph_ids.max() > 255):
+                    raise ValueError("Glyph IDs must be in range 0-255")
+                glyph_ids = glyph_ids.astype(np.uint8)
+            return glyph_ids.tobytes()
+        return bytes(glyph_ids)
+
+    def encode_bulk(self, data: Any) -> QDPIGlyphSequence:
+        """Encode data into a lazy glyph sequence without building symbol objects"""
+        return QDPIGlyphSequence(self.encode_glyphs(data), self._symbol_table)
+
+    def decode_narrative(self, glyph_ids: Union[bytes, bytearray, np.ndarray, List[int], QDPIGlyphSequence]) -> QDPINarrative:
+        """Columnar canon view (names, rotations, meanings, modes) of a glyph sequence"""
+        if isinstance(glyph_ids, QDPIGlyphSequence):
+            glyph_ids = glyph_ids.glyph_ids
+        return CANON.narrative(glyph_ids)
+
     def encode_data(self, data: Any, mode: QDPIMode = QDPIMode.INDEX) -> List[QDPISymbol]:
         """Encode arbitrary data into QDPI symbol sequence"""
-        # Convert data to bytes
-        if isinstance(data, str):
-            data_bytes = data.encode('utf-8')
-        elif isinstance(data, dict):
-            data_bytes = json.dumps(data, sort_keys=True).encode('utf-8')
-        elif isinstance(data, (list, tuple)):
-            data_bytes = json.dumps(list(data), sort_keys=True).encode('utf-8')
-        else:
-            data_bytes = str(data).encode('utf-8')
-        
-        # Convert bytes to symbol sequence
-        symbols = []
-        for i, byte_val in enumerate(data_bytes):
-            # Map byte (0-255) to glyph ID (0-255)
-            glyph_id = byte_val
-            if glyph_id in self.glyph_to_symbol:
-                symbol = self.glyph_to_symbol[glyph_id]
-                symbols.append(symbol)
-            else:
-                # Fallback to modulo mapping
-                fallback_id = glyph_id % len(self.glyph_to_symbol)
-                symbols.append(self.glyph_to_symbol[fallback_id])
-        
-        log.info(f"✅ Encoded {len(data_bytes)} bytes into {len(symbols)} QDPI symbols")
+        symbols = self.encode_bulk(data).to_symbols()
+        log.debug(f"Encoded {len(symbols)} bytes into QDPI symbols")
         return symbols
     
-    def decode_symbols(self, symbols: List[QDPISymbol]) -> bytes:
+    def decode_symbols(self, symbols: Union[List[QDPISymbol], QDPIGlyphSequence]) -> bytes:
         """Decode QDPI symbol sequence back to data"""
-        data_bytes = bytearray()
-        for symbol in symbols:
-            data_bytes.append(symbol.glyph_id)
+        if isinstance(symbols, QDPIGlyphSequence):
+            data_bytes = self.decode_glyphs(symbols.glyph_ids)
+        else:
+            data_bytes = bytes([symbol.glyph_id for symbol in symbols])
         
-        log.info(f"✅ Decoded {len(symbols)} QDPI symbols into {len(data_bytes)} bytes")
-        return bytes(data_bytes)
+        log.debug(f"Decoded {len(symbols)} QDPI symbols into {len(data_bytes)} bytes")
+        return data_bytes
     
     def find_semantic_symbols(self, query: str, limit: int = 10) -> List[Tuple[QDPISymbol, float]]:
         """Find symbols semantically similar to query using SREC embeddings"""
+        if chromadb is None:
+            log.warning("⚠️ Semantic search unavailable: chromadb not installed")
+            return []
         try:
             # Connect to ChromaDB
             client = chromadb.HttpClient(host='localhost', port=8001)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+QDPI Canon Tables
+Precompiled, immutable lookup tables for the 256-glyph QDPI alphabet
+
+Every per-glyph property (symbol, rotation, name, meaning, mode) is computed
+once at import into read-only arrays indexed by glyph ID (0-255) and extended
+glyph ID (0-1023). The codec and the ECC integration both read from the same
+CANON instance, so decoding a narrative is a handful of array lookups.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Complete 64-symbol codex data from generate_symbols.py:
+# (name, symbol id 1-64, orientation, row1, row2, row3, row4)
+SYMBOL_DATA = (
+    ("an_author", 1, "n", "o/o", "o/o", "o/o", "x/x"),
+    ("london_fox", 2, "n", "o/o", "o/o", "x/x", "x/x"),
+    ("glyph_marrow", 3, "n", "o/o", "x/x", "o/o", "x/x"),
+    ("phillip_bafflemint", 4, "n", "x/x", "o/o", "o/o", "x/x"),
+    ("jacklyn_variance", 5, "n", "o/o", "x/x", "x/x", "x/x"),
+    ("oren_progresso", 6, "n", "x/x", "o/o", "x/x", "x/x"),
+    ("old_natalie_weissman", 7, "n", "x/x", "x/x", "o/o", "x/x"),
+    ("princhetta", 8, "n", "x/x", "x/x", "x/x", "x/x"),
+    ("cop-e-right", 9, "u", "x/x", "x/x", "x/x", "x/x"),
+    ("new_natalie_weissman", 10, "u", "x/x", "o/o", "x/x", "x/x"),
+    ("arieol_owlist", 11, "u", "x/x", "x/x", "o/o", "x/x"),
+    ("jack_parlance", 12, "u", "x/x", "x/x", "x/x", "o/o"),
+    ("manny_valentinas", 13, "u", "x/x", "o/o", "o/o", "x/x"),
+    ("shamrock_stillman", 14, "u", "x/x", "o/o", "x/x", "o/o"),
+    ("todd_fishbone", 15, "u", "x/x", "x/x", "o/o", "o/o"),
+    ("The_Author", 16, "u", "x/x", "o/o", "o/o", "o/o"),
+    # Hidden symbols 17-64 (generated symbols)
+    ("hidden_symbol_01", 17, "n", "o/o", "o/o", "x/o", "x/x"),
+    ("hidden_symbol_02", 18, "n", "o/o", "o/o", "o/x", "x/x"),
+    ("hidden_symbol_03", 19, "n", "o/o", "x/o", "o/o", "x/x"),
+    ("hidden_symbol_04", 20, "n", "o/o", "o/x", "o/o", "x/x"),
+    ("hidden_symbol_05", 21, "n", "x/o", "o/o", "o/o", "x/x"),
+    ("hidden_symbol_06", 22, "n", "o/x", "o/o", "o/o", "x/x"),
+    ("hidden_symbol_07", 23, "n", "o/o", "x/o", "x/x", "x/x"),
+    ("hidden_symbol_08", 24, "n", "o/o", "o/x", "x/x", "x/x"),
+    ("hidden_symbol_09", 25, "n", "x/o", "o/o", "x/x", "x/x"),
+    ("hidden_symbol_10", 26, "n", "o/x", "o/o", "x/x", "x/x"),
+    ("hidden_symbol_11", 27, "n", "o/o", "x/x", "x/o", "x/x"),
+    ("hidden_symbol_12", 28, "n", "o/o", "x/x", "o/x", "x/x"),
+    ("hidden_symbol_13", 29, "n", "x/o", "x/x", "o/x", "x/x"),
+    ("hidden_symbol_14", 30, "n", "o/x", "x/x", "o/x", "x/x"),
+    ("hidden_symbol_15", 31, "n", "x/x", "x/x", "x/o", "x/x"),
+    ("hidden_symbol_16", 32, "n", "x/x", "x/x", "o/x", "x/x"),
+    ("hidden_symbol_17", 33, "n", "x/x", "o/x", "x/x", "x/x"),
+    ("hidden_symbol_18", 34, "n", "x/x", "x/o", "x/x", "x/x"),
+    ("hidden_symbol_19", 35, "n", "o/x", "x/x", "x/x", "x/x"),
+    ("hidden_symbol_20", 36, "n", "x/o", "x/x", "x/x", "x/x"),
+    ("hidden_symbol_21", 37, "n", "o/x", "x/x", "x/o", "x/x"),
+    ("hidden_symbol_22", 38, "n", "x/o", "x/x", "x/o", "x/x"),
+    ("hidden_symbol_23", 39, "n", "o/x", "x/o", "o/o", "x/x"),
+    ("hidden_symbol_24", 40, "n", "x/o", "o/x", "o/o", "x/x"),
+    ("hidden_symbol_25", 41, "u", "x/x", "x/o", "o/o", "o/o"),
+    ("hidden_symbol_26", 42, "u", "x/x", "o/x", "o/o", "o/o"),
+    ("hidden_symbol_27", 43, "u", "x/x", "o/o", "x/o", "o/o"),
+    ("hidden_symbol_28", 44, "u", "x/x", "o/o", "o/x", "o/o"),
+    ("hidden_symbol_29", 45, "u", "x/x", "o/o", "o/o", "x/o"),
+    ("hidden_symbol_30", 46, "u", "x/x", "o/o", "o/o", "o/x"),
+    ("hidden_symbol_31", 47, "u", "x/x", "x/x", "x/o", "o/o"),
+    ("hidden_symbol_32", 48, "u", "x/x", "x/x", "o/x", "o/o"),
+    ("hidden_symbol_33", 49, "u", "x/x", "x/x", "o/o", "x/o"),
+    ("hidden_symbol_34", 50, "u", "x/x", "x/x", "o/o", "o/x"),
+    ("hidden_symbol_35", 51, "u", "x/x", "x/o", "x/x", "o/o"),
+    ("hidden_symbol_36", 52, "u", "x/x", "o/x", "x/x", "o/o"),
+    ("hidden_symbol_37", 53, "u", "x/x", "o/x", "x/x", "x/o"),
+    ("hidden_symbol_38", 54, "u", "x/x", "o/x", "x/x", "o/x"),
+    ("hidden_symbol_39", 55, "u", "x/x", "x/o", "x/x", "x/x"),
+    ("hidden_symbol_40", 56, "u", "x/x", "o/x", "x/x", "x/x"),
+    ("hidden_symbol_41", 57, "u", "x/x", "x/x", "o/x", "x/x"),
+    ("hidden_symbol_42", 58, "u", "x/x", "x/x", "x/o", "x/x"),
+    ("hidden_symbol_43", 59, "u", "x/x", "x/x", "x/x", "x/o"),
+    ("hidden_symbol_44", 60, "u", "x/x", "x/x", "x/x", "o/x"),
+    ("hidden_symbol_45", 61, "u", "x/x", "x/o", "x/x", "o/x"),
+    ("hidden_symbol_46", 62, "u", "x/x", "x/o", "x/x", "x/o"),
+    ("hidden_symbol_47", 63, "u", "x/x", "o/o", "x/o", "o/x"),
+    ("hidden_symbol_48", 64, "u", "x/x", "o/o", "o/x", "o/x"),
+)
+
+# System component each character symbol stands for
+CHARACTER_SYSTEMS = MappingProxyType({
+    'an_author': 'Content Management', 'london_fox': 'Graph Engine',
+    'glyph_marrow': 'QDPI Protocol', 'phillip_bafflemint': 'Interface Management',
+    'jacklyn_variance': 'Core Database', 'oren_progresso': 'Orchestration Engine',
+    'old_natalie_weissman': 'Memory Management', 'princhetta': 'AI Coordination',
+    'cop-e-right': 'Security & Permissions', 'new_natalie_weissman': 'Research & Development',
+    'arieol_owlist': 'Event Streaming', 'jack_parlance': 'Network Communications',
+    'manny_valentinas': 'Resource Allocation', 'shamrock_stillman': 'Testing & Validation',
+    'todd_fishbone': 'Deployment Pipeline', 'The_Author': 'System Bootstrap'
+})
+
+# Meta-verbs ride on the last 16 symbols (0-based symbol ids 48-63)
+META_VERB_OFFSET = 48
+META_VERBS = (
+    'LINK', 'MERGE', 'SPLIT', 'FORGET', 'REMEMBER', 'GIFT', 'COST', 'VALIDATE',
+    'TRANSFORM', 'REPLICATE', 'OBSERVE', 'INTERRUPT', 'RESUME', 'BRANCH', 'SYNCHRONIZE', 'TERMINATE'
+)
+
+# Rotation index -> canonical verb (and QDPIMode value)
+ROTATION_VERBS = ('READ', 'ASK', 'INDEX', 'RECEIVE')
+
+def _frozen(values: List[Any], dtype: Any) -> np.ndarray:
+    array = np.array(values, dtype=dtype)
+    array.setflags(write=False)
+    return array
+
+class QDPICanonTable:
+    """Immutable per-glyph canon tables shared across the QDPI stack"""
+
+    def __init__(self, symbol_data=SYMBOL_DATA):
+        # Per-symbol (0-based symbol id = codex id - 1)
+        self.codex_names = tuple(name for name, *_ in symbol_data)
+        self.symbol_names = tuple(
+            META_VERBS[symbol_id - META_VERB_OFFSET] if symbol_id >= META_VERB_OFFSET else name
+            for symbol_id, name in enumerate(self.codex_names)
+        )
+        self.symbol_types = tuple(
+            'character' if symbol_id < 16 else 'hidden_symbol' if symbol_id < META_VERB_OFFSET else 'meta_verb'
+            for symbol_id in range(len(symbol_data))
+        )
+
+        # Name -> 0-based symbol id, accepting codex and narrative names
+        name_to_id: Dict[str, int] = {}
+        for symbol_id, (codex_name, name) in enumerate(zip(self.codex_names, self.symbol_names)):
+            name_to_id[codex_name] = symbol_id
+            name_to_id[name] = symbol_id
+        self.name_to_symbol_id = MappingProxyType(name_to_id)
+
+        # Per-glyph (glyph id = symbol id * 4 + rotation index)
+        glyphs = range(len(symbol_data) * 4)
+        self.symbol_ids = _frozen([g // 4 for g in glyphs], np.uint8)
+        self.rotations = _frozen([(g % 4) * 90 for g in glyphs], np.uint16)
+        self.orientations = _frozen([symbol_data[g // 4][2] for g in glyphs], object)
+        self.names = _frozen([self.symbol_names[g // 4] for g in glyphs], object)
+        self.modes = _frozen([ROTATION_VERBS[g % 4].lower() for g in glyphs], object)
+        self.meanings = _frozen([self.meaning(self.symbol_names[g // 4], (g % 4) * 90) for g in glyphs], object)
+
+        # Per extended glyph (extended id = glyph id * 4 + parity mark)
+        extended = range(len(symbol_data) * 16)
+        self.extended_glyph_ids = _frozen([e // 4 for e in extended], np.uint8)
+        self.parities = _frozen([e % 4 for e in extended], np.uint8)
+
+    def symbol_id(self, name: str) -> Optional[int]:
+        """0-based symbol id for a codex or narrative name, None if unknown"""
+        symbol_id = self.name_to_symbol_id.get(name)
+        if symbol_id is None and name.startswith('hidden_symbol_'):
+            # Accept unpadded numbering such as hidden_symbol_7
+            try:
+                symbol_id = self.name_to_symbol_id.get(f"hidden_symbol_{int(name.split('_')[2]):02d}")
+            except ValueError:
+                return None
+        return symbol_id
+
+    def glyph_id(self, name: str, rotation: int) -> Optional[int]:
+        """Glyph id for a symbol name at a rotation, None if the name is unknown"""
+        symbol_id = self.symbol_id(name)
+        return None if symbol_id is None else symbol_id * 4 + rotation // 90
+
+    def symbol_name(self, symbol_id: int) -> str:
+        """Narrative name for a 0-based symbol id"""
+        if 0 <= symbol_id < len(self.symbol_names):
+            return self.symbol_names[symbol_id]
+        return f"unknown_symbol_{symbol_id}"
+
+    @staticmethod
+    def meaning(name: str, rotation: int) -> str:
+        """Canonical meaning of any symbol name at a rotation"""
+        rotation_verb = ROTATION_VERBS[rotation // 90] if rotation in (0, 90, 180, 270) else "UNKNOWN"
+        if name in CHARACTER_SYSTEMS:
+            return f"{rotation_verb} {CHARACTER_SYSTEMS[name]}"
+        if name.startswith('hidden_symbol_'):
+            return f"{rotation_verb} {name.replace('_', ' ').title()}"
+        return f"{rotation_verb} {name} operation"
+
+    def narrative(self, glyph_ids: Any) -> 'QDPINarrative':
+        """Columnar view of a glyph sequence"""
+        return QDPINarrative(glyph_ids, self)
+
+class QDPINarrative:
+    """Columnar decode result: glyph ids plus per-glyph columns from the canon
+
+    Columns are produced by fancy-indexing the canon tables, so no per-glyph
+    Python objects exist until a caller asks for records.
+    """
+
+    __slots__ = ('glyph_ids', 'canon')
+
+    def __init__(self, glyph_ids: Any, canon: Optional[QDPICanonTable] = None):
+        if isinstance(glyph_ids, (bytes, bytearray, memoryview)):
+            glyph_ids = np.frombuffer(glyph_ids, dtype=np.uint8)
+        self.glyph_ids = np.asarray(glyph_ids, dtype=np.uint8)
+        self.canon = canon or CANON
+
+    def __reduce__(self):
+        # Ship only the glyph ids between processes; the canon is rebuilt at import
+        return (QDPINarrative, (self.glyph_ids,))
+
+    def __len__(self) -> int:
+        return len(self.glyph_ids)
+
+    @property
+    def symbol_ids(self) -> np.ndarray:
+        return self.canon.symbol_ids[self.glyph_ids]
+
+    @property
+    def rotations(self) -> np.ndarray:
+        return self.canon.rotations[self.glyph_ids]
+
+    @property
+    def names(self) -> np.ndarray:
+        return self.canon.names[self.glyph_ids]
+
+    @property
+    def meanings(self) -> np.ndarray:
+        return self.canon.meanings[self.glyph_ids]
+
+    @property
+    def modes(self) -> np.ndarray:
+        return self.canon.modes[self.glyph_ids]
+
+    def narrative_meaning(self, separator: str = " → ") -> str:
+        """Meanings joined into a readable narrative"""
+        return separator.join(self.meanings.tolist())
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Per-symbol dicts (position, symbol_name, rotation, glyph_id, canon_meaning)"""
+        return [
+            {
+                'position': position,
+                'symbol_name': name,
+                'rotation': rotation,
+                'glyph_id': glyph_id,
+                'canon_meaning': meaning
+            }
+            for position, (glyph_id, name, rotation, meaning) in enumerate(zip(
+                self.glyph_ids.tolist(), self.names.tolist(),
+                self.rotations.tolist(), self.meanings.tolist()
+            ))
+        ]
+
+# Shared canon instance
+CANON = QDPICanonTable()
@@ -14,11 +14,24 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from qdpi_complete_ecc import QDPICompleteECC
+from qdpi_latency import LatencyHistogram
 from backend.app.qdpi import QDPICodex, QDPISymbol
+from backend.app.qdpi_canon import CANON, QDPINarrative
+from backend.app.qdpi_segment_store import QDPISegmentStore
 from typing import List, Dict, Any, Tuple, Optional
 import json
 import time
 from dataclasses import dataclass, asdict
+from pathlib import Path
+
+# Relative store paths resolve against the project root, not the working directory
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_STORE_DIR = PROJECT_ROOT / "data" / "qdpi_ecc_store"
+
+def _optional_limit(name: str, default: str) -> Optional[int]:
+    """Positive integer from the environment; 0 disables the limit"""
+    value = int(os.getenv(name, default))
+    return value if value > 0 else None
 
 @dataclass
 class ProtectedQDPIMessage:
@@ -29,121 +42,196 @@ class ProtectedQDPIMessage:
     encoding_timestamp: float             # When protection was applied
     protection_metadata: Dict[str, Any]    # ECC statistics and info
     
+    def to_record(self) -> Tuple[Dict[str, Any], bytes]:
+        """Split into JSON metadata and raw protected bytes for the segment store"""
+        meta = {
+            'original_symbols': self.original_symbols,
+            'encoding_timestamp': self.encoding_timestamp,
+            'protection_metadata': self.protection_metadata
+        }
+        return meta, self.protected_data
+    
+    @classmethod
+    def from_record(cls, block_id: int, meta: Dict[str, Any], data: bytes) -> 'ProtectedQDPIMessage':
+        """Rebuild a message read back from the segment store"""
+        return cls(
+            original_symbols=meta['original_symbols'],
+            protected_data=data,
+            block_id=block_id,
+            encoding_timestamp=meta['encoding_timestamp'],
+            protection_metadata=meta['protection_metadata']
+        )
+    
 class QDPIECCBackend:
     """Production QDPI backend with integrated error correction"""
     
-    def __init__(self):
+    def __init__(self, store_dir: Optional[str] = None):
         self.qdpi_codex = QDPICodex()
         self.ecc_system = QDPICompleteECC()
-        self.protected_messages = {}  # In production, this would be persistent storage
+        
+        # Append-only segment store on disk with an LRU of hot messages;
+        # files are only opened on first use, and the oldest messages are
+        # dropped once the retention limits are reached
+        self.protected_messages = QDPISegmentStore(
+            PROJECT_ROOT / (store_dir or os.getenv("QDPI_ECC_STORE_DIR") or DEFAULT_STORE_DIR),
+            record_type=ProtectedQDPIMessage,
+            cache_size=int(os.getenv("QDPI_ECC_CACHE_SIZE", "1024")),
+            max_blocks=_optional_limit("QDPI_ECC_MAX_BLOCKS", "100000"),
+            max_live_bytes=_optional_limit("QDPI_ECC_MAX_BYTES", "0")
+        )
         self.message_counter = 0
+        self._counter_recovered = False
+        
+        # End-to-end narrative latency (bounded memory)
+        self.encode_latency = LatencyHistogram()
+        self.decode_latency = LatencyHistogram()
         
     def encode_narrative_with_protection(self, narrative_description: str, 
                                        symbol_sequence: List[Tuple[str, int]]) -> ProtectedQDPIMessage:
         """Encode a narrative sequence with complete error protection"""
         
-        start_time = time.time()
+        protected_message = self.build_protected_message(
+            narrative_description, symbol_sequence, self.reserve_block_id()
+        )
+        self.store_protected_message(protected_message)
+        return protected_message
+    
+    def reserve_block_id(self) -> int:
+        """Allocate the next block identifier"""
+        if not self._counter_recovered:
+            # Continue after blocks stored by earlier runs
+            self.message_counter = max(self.message_counter, self.protected_messages.max_block_id() + 1)
+            self._counter_recovered = True
+        block_id = self.message_counter
+        self.message_counter += 1
+        return block_id
+    
+    def store_protected_message(self, protected_message: ProtectedQDPIMessage):
+        """Keep a protected message for later retrieval by block id"""
+        self.protected_messages[protected_message.block_id] = protected_message
+    
+    def build_protected_message(self, narrative_description: str,
+                                symbol_sequence: List[Tuple[str, int]],
+                                block_id: int) -> ProtectedQDPIMessage:
+        """Encode a narrative under a given block id without storing it
         
-        # Step 1: Convert symbol sequence to QDPI symbols with metadata
-        qdpi_symbols = []
-        glyph_ids = []
+        Pure CPU work with no shared state, so it can run in a worker process.
+        """
         
-        for symbol_name, rotation in symbol_sequence:
-            # Get symbol ID and create simplified symbol representation
-            symbol_id = self._get_symbol_id_from_canon(symbol_name)
-            
-            # Create simplified symbol dict (we don't need full QDPISymbol for ECC testing)
-            qdpi_symbol = {
-                'name': symbol_name,
-                'id': symbol_id,
-                'orientation': 'u' if any(symbol_name == char for char in 
-                    ['cop-e-right', 'new_natalie_weissman', 'arieol_owlist', 'jack_parlance',
-                     'manny_valentinas', 'shamrock_stillman', 'todd_fishbone', 'The_Author']) else 'n',
-                'rotation': rotation
-            }
-            
-            # Calculate glyph ID using our Canon mapping
-            symbol_id = self._get_symbol_id_from_canon(symbol_name)
-            rotation_index = rotation // 90
-            glyph_id = symbol_id * 4 + rotation_index
-            
-            qdpi_symbols.append({
-                'symbol': qdpi_symbol,
+        start_time = time.time()
+        
+        # Step 1: Resolve glyph IDs against the canon; unknown names fall back to symbol 0
+        glyph_ids = [
+            (CANON.symbol_id(symbol_name) or 0) * 4 + (rotation // 90) % 4
+            for symbol_name, rotation in symbol_sequence
+        ]
+        narrative = CANON.narrative(glyph_ids)
+        qdpi_symbols = [
+            {
+                # Simplified symbol dict (we don't need full QDPISymbol for ECC testing)
+                'symbol': {
+                    'name': symbol_name,
+                    'id': symbol_id,
+                    'orientation': orientation,
+                    'rotation': rotation
+                },
                 'glyph_id': glyph_id,
-                'canon_meaning': self._get_canon_meaning(symbol_name, rotation),
+                'canon_meaning': meaning,
                 'narrative_description': narrative_description
-            })
-            glyph_ids.append(glyph_id)
+            }
+            for (symbol_name, rotation), glyph_id, symbol_id, orientation, meaning in zip(
+                symbol_sequence, glyph_ids, narrative.symbol_ids.tolist(),
+                CANON.orientations[narrative.glyph_ids].tolist(), narrative.meanings.tolist()
+            )
+        ]
         
         # Step 2: Apply error correction protection
         byte_sequence = bytes(glyph_ids)
-        protected_sequence = self.ecc_system.encode_with_protection(byte_sequence, self.message_counter)
+        protected_sequence = self.ecc_system.encode_with_protection(byte_sequence, block_id)
         
         # Step 3: Create protected message
+        encode_time = time.time() - start_time
+        self.encode_latency.record(encode_time)
         protection_metadata = {
             'original_length': len(glyph_ids),
             'protected_length': len(protected_sequence.reed_solomon_block.encoded),
             'overhead_bytes': protected_sequence.total_overhead_bytes,
             'overhead_percent': (protected_sequence.total_overhead_bytes / len(glyph_ids)) * 100,
-            'encoding_time_ms': (time.time() - start_time) * 1000,
+            'encoding_time_ms': encode_time * 1000,
             'protection_level': protected_sequence.protection_level,
             'narrative_description': narrative_description
         }
         
-        protected_message = ProtectedQDPIMessage(
+        return ProtectedQDPIMessage(
             original_symbols=qdpi_symbols,
             protected_data=protected_sequence.reed_solomon_block.encoded,
-            block_id=self.message_counter,
+            block_id=block_id,
             encoding_timestamp=time.time(),
             protection_metadata=protection_metadata
         )
-        
-        # Store for later retrieval
-        self.protected_messages[self.message_counter] = protected_message
-        self.message_counter += 1
-        
-        return protected_message
     
     def decode_protected_narrative(self, protected_data: bytes, 
                                  original_length: int, 
                                  block_id: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Decode and error-correct a protected QDPI narrative"""
         
+        narrative, decode_stats = self.decode_protected_narrative_columns(protected_data, original_length, block_id)
+        return narrative.to_records(), decode_stats
+    
+    def decode_protected_narrative_columns(self, protected_data: bytes,
+                                           original_length: int,
+                                           block_id: Optional[int] = None) -> Tuple[QDPINarrative, Dict[str, Any]]:
+        """Decode and error-correct a protected narrative into a columnar result"""
+        
         start_time = time.time()
         
         # Step 1: Apply error correction
         recovered_bytes, ecc_stats = self.ecc_system.decode_with_correction(protected_data, original_length)
         
-        # Step 2: Convert back to QDPI symbols
-        recovered_symbols = []
-        
-        for i, glyph_id in enumerate(recovered_bytes):
-            symbol_id = glyph_id // 4
-            rotation = (glyph_id % 4) * 90
-            
-            # Look up symbol name from Canon
-            symbol_name = self._get_symbol_name_from_id(symbol_id)
-            canon_meaning = self._get_canon_meaning(symbol_name, rotation)
-            
-            recovered_symbols.append({
-                'position': i,
-                'symbol_name': symbol_name,
-                'rotation': rotation,
-                'glyph_id': glyph_id,
-                'canon_meaning': canon_meaning
-            })
+        # Step 2: Look the recovered glyphs up in the canon tables
+        narrative = CANON.narrative(recovered_bytes)
         
         # Step 3: Compile decoding statistics
+        decode_time = time.time() - start_time
+        self.decode_latency.record(decode_time)
         decode_stats = {
-            'decode_time_ms': (time.time() - start_time) * 1000,
+            'decode_time_ms': decode_time * 1000,
             'recovery_successful': ecc_stats['protection_successful'],
             'meets_performance_target': ecc_stats['meets_4ms_target'],
             'error_correction': ecc_stats,
-            'recovered_symbols_count': len(recovered_symbols),
+            'recovered_symbols_count': len(narrative),
             'block_id': block_id
         }
         
-        return recovered_symbols, decode_stats
+        return narrative, decode_stats
+    
+    def latency_histograms(self) -> Dict[str, LatencyHistogram]:
+        """Latency histograms for every ECC stage plus end-to-end narrative work"""
+        return {
+            **self.ecc_system.latency_histograms(),
+            'narrative_encode': self.encode_latency,
+            'narrative_decode': self.decode_latency
+        }
+    
+    def collect_latency(self, reset: bool = False) -> Dict[str, LatencyHistogram]:
+        """Copy the stage histograms, optionally clearing them (worker hand-off)"""
+        collected = {}
+        for stage, histogram in self.latency_histograms().items():
+            collected[stage] = histogram.copy()
+            if reset:
+                histogram.reset()
+        return collected
+    
+    def merge_latency(self, histograms: Dict[str, LatencyHistogram]):
+        """Fold histograms collected elsewhere (e.g. worker processes) into ours"""
+        own = self.latency_histograms()
+        for stage, histogram in histograms.items():
+            if stage in own:
+                own[stage].merge(histogram)
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """p50/p95/p99/max and share under target for every stage"""
+        return {stage: histogram.snapshot() for stage, histogram in self.latency_histograms().items()}
     
     def simulate_transmission_and_recovery(self, protected_message: ProtectedQDPIMessage, 
                                          error_rate: float = 0.01) -> Dict[str, Any]:
@@ -164,7 +252,7 @@ class QDPIECCBackend:
         )
         
         # Attempt recovery
-        recovered_symbols, decode_stats = self.decode_protected_narrative(
+        recovered, decode_stats = self.decode_protected_narrative_columns(
             corrupted_data, 
             protected_message.protection_metadata['original_length'],
             protected_message.block_id
@@ -172,13 +260,13 @@ class QDPIECCBackend:
         
         # Compare original vs recovered
         original_glyph_ids = [sym['glyph_id'] for sym in protected_message.original_symbols]
-        recovered_glyph_ids = [sym['glyph_id'] for sym in recovered_symbols]
+        recovered_glyph_ids = recovered.glyph_ids.tolist()
         
         narrative_preserved = original_glyph_ids == recovered_glyph_ids
         
         # Reconstruct narrative meaning
         original_narrative = " → ".join([sym['canon_meaning'] for sym in protected_message.original_symbols])
-        recovered_narrative = " → ".join([sym['canon_meaning'] for sym in recovered_symbols])
+        recovered_narrative = recovered.narrative_meaning()
         
         return {
             'transmission_simulation': {
@@ -195,83 +283,16 @@ class QDPIECCBackend:
     
     def _get_symbol_id_from_canon(self, symbol_name: str) -> int:
         """Get symbol ID from QDPI Canon mapping"""
-        # This maps to our canonical symbol ordering
-        symbol_map = {
-            'an_author': 0, 'london_fox': 1, 'glyph_marrow': 2, 'phillip_bafflemint': 3,
-            'jacklyn_variance': 4, 'oren_progresso': 5, 'old_natalie_weissman': 6, 'princhetta': 7,
-            'cop-e-right': 8, 'new_natalie_weissman': 9, 'arieol_owlist': 10, 'jack_parlance': 11,
-            'manny_valentinas': 12, 'shamrock_stillman': 13, 'todd_fishbone': 14, 'The_Author': 15
-        }
-        
-        # Character symbols (0-15)
-        if symbol_name in symbol_map:
-            return symbol_map[symbol_name]
-        
-        # Hidden symbols (16-63) 
-        if symbol_name.startswith('hidden_symbol_'):
-            symbol_num = int(symbol_name.split('_')[2])
-            return 15 + symbol_num
-            
-        # Meta-verbs (mapped to hidden symbols 33-48)
-        meta_verb_map = {
-            'LINK': 48, 'MERGE': 49, 'SPLIT': 50, 'FORGET': 51, 'REMEMBER': 52,
-            'GIFT': 53, 'COST': 54, 'VALIDATE': 55, 'TRANSFORM': 56, 'REPLICATE': 57,
-            'OBSERVE': 58, 'INTERRUPT': 59, 'RESUME': 60, 'BRANCH': 61, 'SYNCHRONIZE': 62, 'TERMINATE': 63
-        }
-        
-        if symbol_name in meta_verb_map:
-            return meta_verb_map[symbol_name]
-            
-        return 0  # Default fallback
+        symbol_id = CANON.symbol_id(symbol_name)
+        return 0 if symbol_id is None else symbol_id  # Default fallback
     
     def _get_symbol_name_from_id(self, symbol_id: int) -> str:
         """Get symbol name from ID using Canon mapping"""
-        if symbol_id <= 15:
-            symbol_names = [
-                'an_author', 'london_fox', 'glyph_marrow', 'phillip_bafflemint',
-                'jacklyn_variance', 'oren_progresso', 'old_natalie_weissman', 'princhetta',
-                'cop-e-right', 'new_natalie_weissman', 'arieol_owlist', 'jack_parlance',
-                'manny_valentinas', 'shamrock_stillman', 'todd_fishbone', 'The_Author'
-            ]
-            return symbol_names[symbol_id]
-        elif 16 <= symbol_id <= 47:
-            return f"hidden_symbol_{symbol_id - 15:02d}"
-        else:
-            # Meta-verbs
-            meta_verbs = [
-                'LINK', 'MERGE', 'SPLIT', 'FORGET', 'REMEMBER', 'GIFT', 'COST', 'VALIDATE',
-                'TRANSFORM', 'REPLICATE', 'OBSERVE', 'INTERRUPT', 'RESUME', 'BRANCH', 'SYNCHRONIZE', 'TERMINATE'
-            ]
-            verb_index = symbol_id - 48
-            if 0 <= verb_index < len(meta_verbs):
-                return meta_verbs[verb_index]
-        
-        return f"unknown_symbol_{symbol_id}"
+        return CANON.symbol_name(symbol_id)
     
     def _get_canon_meaning(self, symbol_name: str, rotation: int) -> str:
         """Get canonical meaning for symbol at rotation"""
-        rotation_verbs = {0: "READ", 90: "ASK", 180: "INDEX", 270: "RECEIVE"}
-        rotation_verb = rotation_verbs.get(rotation, "UNKNOWN")
-        
-        # Character symbols - use system component
-        character_systems = {
-            'an_author': 'Content Management', 'london_fox': 'Graph Engine', 
-            'glyph_marrow': 'QDPI Protocol', 'phillip_bafflemint': 'Interface Management',
-            'jacklyn_variance': 'Core Database', 'oren_progresso': 'Orchestration Engine',
-            'old_natalie_weissman': 'Memory Management', 'princhetta': 'AI Coordination',
-            'cop-e-right': 'Security & Permissions', 'new_natalie_weissman': 'Research & Development',
-            'arieol_owlist': 'Event Streaming', 'jack_parlance': 'Network Communications',
-            'manny_valentinas': 'Resource Allocation', 'shamrock_stillman': 'Testing & Validation',
-            'todd_fishbone': 'Deployment Pipeline', 'The_Author': 'System Bootstrap'
-        }
-        
-        if symbol_name in character_systems:
-            return f"{rotation_verb} {character_systems[symbol_name]}"
-        elif symbol_name.startswith('hidden_symbol_'):
-            return f"{rotation_verb} {symbol_name.replace('_', ' ').title()}"
-        else:
-            # Meta-verbs
-            return f"{rotation_verb} {symbol_name} operation"
+        return CANON.meaning(symbol_name, rotation)
 
 def test_production_integration():
     """Test the complete production integration"""
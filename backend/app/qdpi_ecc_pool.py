@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+QDPI Error Correction Worker Pool
+Runs CPU-bound Reed-Solomon and mini-syndrome work in worker processes
+
+The event loop only hands jobs to the pool and awaits the results, so a large
+decode no longer stalls other requests and websockets on the same worker.
+Block ids and message storage stay in the main process; workers are stateless.
+Each job hands back the worker's latency histograms, which are merged into the
+main-process backend so stats reflect all workers.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Tuple, Optional, Callable
+
+from .qdpi_ecc_integration import QDPIECCBackend, ProtectedQDPIMessage
+from .qdpi_canon import QDPINarrative
+from qdpi_latency import LatencyHistogram
+
+log = logging.getLogger(__name__)
+
+# Workers are spawned fresh rather than forked: the parent runs an event loop,
+# threads (segment store compactor, HTTP clients) and open sockets, none of
+# which survive a fork safely
+WORKER_START_METHOD = "spawn"
+
+# Per-process backend used by worker jobs (built once per worker)
+_worker_backend: Optional[QDPIECCBackend] = None
+
+def _init_worker():
+    """Build the worker's ECC backend up front so the first job is not slowed down"""
+    global _worker_backend
+    _worker_backend = QDPIECCBackend()
+
+def _get_worker_backend() -> QDPIECCBackend:
+    global _worker_backend
+    if _worker_backend is None:
+        _worker_backend = QDPIECCBackend()
+    return _worker_backend
+
+# Worker results travel with the latency recorded while producing them
+LatencyHandoff = Dict[str, LatencyHistogram]
+
+def _encode_jobs(jobs: List[Tuple[str, List[Tuple[str, int]], int]]) -> Tuple[List[ProtectedQDPIMessage], LatencyHandoff]:
+    """Worker job: encode (description, symbol_sequence, block_id) tuples"""
+    backend = _get_worker_backend()
+    messages = [
+        backend.build_protected_message(description, symbol_sequence, block_id)
+        for description, symbol_sequence, block_id in jobs
+    ]
+    return messages, backend.collect_latency(reset=True)
+
+def _decode_jobs(jobs: List[Tuple[bytes, int, Optional[int]]]) -> Tuple[List[Tuple[QDPINarrative, Dict[str, Any]]], LatencyHandoff]:
+    """Worker job: decode (protected_data, original_length, block_id) tuples into columnar results"""
+    backend = _get_worker_backend()
+    results = [
+        backend.decode_protected_narrative_columns(protected_data, original_length, block_id)
+        for protected_data, original_length, block_id in jobs
+    ]
+    return results, backend.collect_latency(reset=True)
+
+def _transmission_job(protected_message: ProtectedQDPIMessage, error_rate: float) -> Tuple[Dict[str, Any], LatencyHandoff]:
+    """Worker job: simulate transmission errors and recovery for one message"""
+    backend = _get_worker_backend()
+    result = backend.simulate_transmission_and_recovery(protected_message, error_rate)
+    return result, backend.collect_latency(reset=True)
+
+class QDPIECCWorkerPool:
+    """Managed process pool for QDPI error correction work"""
+
+    def __init__(self, backend: QDPIECCBackend, max_workers: Optional[int] = None):
+        # Main-process backend: owns block ids and the protected message store
+        self.backend = backend
+        self.max_workers = max_workers or int(os.getenv("QDPI_ECC_WORKERS", "0")) or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Pool statistics
+        self.jobs_submitted = 0
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.in_flight = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the pool lazily on first use"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+                initializer=_init_worker
+            )
+            log.info(f"Started QDPI ECC worker pool with {self.max_workers} processes")
+        return self._executor
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        """Run one job in the pool without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        self.jobs_submitted += 1
+        self.in_flight += 1
+        try:
+            result, latency = await loop.run_in_executor(self._get_executor(), fn, *args)
+            self.backend.merge_latency(latency)
+            self.jobs_completed += 1
+            return result
+        except BrokenProcessPool:
+            # A crashed worker poisons the executor; replace it on the next job
+            self.jobs_failed += 1
+            self._executor = None
+            log.error("QDPI ECC worker pool broke, restarting on next job")
+            raise
+        except Exception:
+            self.jobs_failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def _split(self, items: List[Any]) -> List[List[Any]]:
+        """Split a batch into one chunk per worker to keep IPC overhead low"""
+        size = max(1, -(-len(items) // self.max_workers))
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    async def encode(self, description: str,
+                     symbol_sequence: List[Tuple[str, int]]) -> ProtectedQDPIMessage:
+        """Encode one narrative in the pool"""
+        return (await self.encode_batch([(description, symbol_sequence)]))[0]
+
+    async def encode_batch(self, narratives: List[Tuple[str, List[Tuple[str, int]]]]) -> List[ProtectedQDPIMessage]:
+        """Encode many narratives across all workers, preserving order"""
+        jobs = [
+            (description, symbol_sequence, self.backend.reserve_block_id())
+            for description, symbol_sequence in narratives
+        ]
+        chunks = await asyncio.gather(*(self._run(_encode_jobs, chunk) for chunk in self._split(jobs)))
+
+        messages = [message for chunk in chunks for message in chunk]
+        # Storing appends to the segment store on disk; keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self._store_messages, messages)
+        return messages
+
+    def _store_messages(self, messages: List[ProtectedQDPIMessage]):
+        """Write encoded messages to the main-process store (runs in a thread)"""
+        for message in messages:
+            self.backend.store_protected_message(message)
+
+    async def decode(self, protected_data: bytes, original_length: int,
+                     block_id: Optional[int] = None) -> Tuple[QDPINarrative, Dict[str, Any]]:
+        """Decode one protected narrative in the pool"""
+        return (await self.decode_batch([(protected_data, original_length, block_id)]))[0]
+
+    async def decode_batch(self, messages: List[Tuple[bytes, int, Optional[int]]]) -> List[Tuple[QDPINarrative, Dict[str, Any]]]:
+        """Decode many protected narratives across all workers, preserving order"""
+        chunks = await asyncio.gather(*(self._run(_decode_jobs, chunk) for chunk in self._split(messages)))
+        return [result for chunk in chunks for result in chunk]
+
+    async def simulate_transmission(self, protected_message: ProtectedQDPIMessage,
+                                    error_rate: float) -> Dict[str, Any]:
+        """Run a transmission simulation in the pool"""
+        return await self._run(_transmission_job, protected_message, error_rate)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and job counters"""
+        return {
+            'max_workers': self.max_workers,
+            'running': self._executor is not None,
+            'jobs_submitted': self.jobs_submitted,
+            'jobs_completed': self.jobs_completed,
+            'jobs_failed': self.jobs_failed,
+            'in_flight': self.in_flight
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            log.info("QDPI ECC worker pool shut down")
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+QDPI Segment Store
+Append-only, memory-mapped storage for protected QDPI blocks
+
+Records are appended to fixed-size segment files and read back through mmap,
+indexed in memory by block id. A bounded LRU keeps hot entries decoded, so
+resident memory stays flat under sustained traffic, and a background thread
+compacts sealed segments once most of their records are dead. Optional
+retention limits tombstone the oldest blocks so compaction can reclaim them
+and disk usage stays bounded too. Stored values
+only need `to_record() -> (meta, data)` and a `from_record(block_id, meta,
+data)` classmethod on their type.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+# Record header: sequence, block id, flags, meta length, data length, crc32
+_HEADER = struct.Struct('<QqBIII')
+_FLAG_TOMBSTONE = 1
+
+_SEGMENT_SUFFIX = ".qseg"
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_SIZE = 1024
+
+class QDPISegmentStore:
+    """Disk-backed block store with an LRU of hot entries"""
+
+    def __init__(self, directory: Union[str, Path], record_type: Any,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 cache_size: int = DEFAULT_CACHE_SIZE,
+                 compaction_threshold: float = 0.5,
+                 compaction_interval: float = 30.0,
+                 max_blocks: Optional[int] = None,
+                 max_live_bytes: Optional[int] = None):
+        self.directory = Path(directory)
+        self.record_type = record_type
+        self.segment_bytes = segment_bytes
+        self.cache_size = cache_size
+        self.compaction_threshold = compaction_threshold
+        self.compaction_interval = compaction_interval
+        # Retention: the least recently written blocks are deleted past either limit
+        self.max_blocks = max_blocks
+        self.max_live_bytes = max_live_bytes
+
+        # Opened lazily so processes that never store (e.g. ECC workers) touch no files
+        self._opened = False
+        self._lock = threading.RLock()
+        self._index: Dict[int, Tuple[int, int, int]] = {}      # block id -> (segment, offset, length), oldest write first
+        self._tombstones: Dict[int, Tuple[int, int, int, int]] = {}  # block id -> (seq, segment, offset, length)
+        self._segments: Dict[int, List[int]] = {}              # segment -> [total bytes, live bytes, min seq]
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._cache: "OrderedDict[int, Any]" = OrderedDict()
+        self._active_id = -1
+        self._active_file = None
+        self._next_segment_id = 0
+        self._next_seq = 0
+
+        self._compactor: Optional[threading.Thread] = None
+        self._compact_wakeup = threading.Event()
+        self._closing = threading.Event()
+
+        # Statistics
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.compactions = 0
+        self.evictions = 0
+
+    # ---- Lifecycle ----
+
+    def open(self):
+        """Recover the index from disk and start appending (idempotent)"""
+        with self._lock:
+            if self._opened:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for tmp in self.directory.glob("*.tmp"):
+                tmp.unlink()
+
+            latest: Dict[int, Tuple[int, int, int, int, bool]] = {}
+            for segment_id in self._segment_ids():
+                self._recover_segment(segment_id, latest)
+
+            for block_id, (seq, segment_id, offset, length, tombstone) in sorted(
+                    latest.items(), key=lambda item: item[1][0]):
+                if tombstone:
+                    self._tombstones[block_id] = (seq, segment_id, offset, length)
+                else:
+                    self._index[block_id] = (segment_id, offset, length)
+                    self._segments[segment_id][1] += length
+
+            self._next_segment_id = max(self._segments, default=-1) + 1
+            self._roll_segment()
+            self._opened = True
+            self._enforce_retention()
+            log.info(f"Opened QDPI segment store at {self.directory} with {len(self._index)} blocks")
+
+    def close(self):
+        """Stop compaction and release files"""
+        self._closing.set()
+        self._compact_wakeup.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        with self._lock:
+            if not self._opened:
+                return
+            self._active_file.close()
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            self._opened = False
+        self._closing.clear()
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.directory / f"segment-{segment_id:08d}{_SEGMENT_SUFFIX}"
+
+    def _segment_ids(self) -> List[int]:
+        return sorted(int(p.stem.split('-')[1]) for p in self.directory.glob(f"segment-*{_SEGMENT_SUFFIX}"))
+
+    def _recover_segment(self, segment_id: int,
+                         latest: Dict[int, Tuple[int, int, int, int, bool]]):
+        """Scan one segment, keeping the highest-sequence record per block id"""
+        path = self._segment_path(segment_id)
+        with open(path, 'rb') as f:
+            contents = f.read()
+
+        offset = 0
+        min_seq = None
+        while offset + _HEADER.size <= len(contents):
+            seq, block_id, flags, meta_len, data_len, crc = _HEADER.unpack_from(contents, offset)
+            length = _HEADER.size + meta_len + data_len
+            body = contents[offset + _HEADER.size:offset + length]
+            if len(body) != meta_len + data_len or zlib.crc32(body) != crc:
+                break
+            if block_id not in latest or seq > latest[block_id][0]:
+                latest[block_id] = (seq, segment_id, offset, length, bool(flags & _FLAG_TOMBSTONE))
+            self._next_seq = max(self._next_seq, seq + 1)
+            min_seq = seq if min_seq is None else min(min_seq, seq)
+            offset += length
+
+        if offset < len(contents):
+            # Torn write from a crash: drop the partial tail
+            log.warning(f"Truncating {len(contents) - offset} corrupt bytes from {path.name}")
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+        self._segments[segment_id] = [offset, 0, self._next_seq if min_seq is None else min_seq]
+
+    def _allocate_segment_id(self) -> int:
+        segment_id = self._next_segment_id
+        self._next_segment_id += 1
+        return segment_id
+
+    def _roll_segment(self):
+        """Seal the active segment and start a new one"""
+        if self._active_file is not None:
+            self._active_file.close()
+            self._compact_wakeup.set()
+        self._active_id = self._allocate_segment_id()
+        self._active_file = open(self._segment_path(self._active_id), 'ab')
+        self._segments[self._active_id] = [0, 0, self._next_seq]
+
+    def _ensure_open(self):
+        if not self._opened:
+            self.open()
+        if self._compactor is None and self.compaction_interval > 0:
+            self._compactor = threading.Thread(target=self._compaction_loop,
+                                               name="qdpi-segment-compactor", daemon=True)
+            self._compactor.start()
+
+    # ---- Record encoding ----
+
+    @staticmethod
+    def _pack(seq: int, block_id: int, flags: int, meta: Dict[str, Any], data: bytes) -> bytes:
+        meta_bytes = json.dumps(meta, separators=(',', ':')).encode('utf-8') if meta else b''
+        body = meta_bytes + data
+        return _HEADER.pack(seq, block_id, flags, len(meta_bytes), len(data), zlib.crc32(body)) + body
+
+    def _read_record(self, segment_id: int, offset: int, length: int) -> Tuple[int, Dict[str, Any], bytes]:
+        """Read a record through the segment's mmap, remapping if it has grown"""
+        mapped = self._maps.get(segment_id)
+        if mapped is None or offset + length > len(mapped):
+            if mapped is not None:
+                mapped.close()
+            with open(self._segment_path(segment_id), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment_id] = mapped
+
+        _, block_id, _, meta_len, data_len, _ = _HEADER.unpack_from(mapped, offset)
+        start = offset + _HEADER.size
+        meta = json.loads(mapped[start:start + meta_len]) if meta_len else {}
+        data = mapped[start + meta_len:start + meta_len + data_len]
+        return block_id, meta, data
+
+    # ---- Mapping interface ----
+
+    def put(self, block_id: int, value: Any):
+        """Append a block, replacing any earlier version"""
+        meta, data = value.to_record()
+        with self._lock:
+            self._ensure_open()
+            if self._segments[self._active_id][0] >= self.segment_bytes:
+                self._active_file.flush()
+                self._roll_segment()
+
+            record = self._pack(self._next_seq, block_id, 0, meta, data)
+            self._next_seq += 1
+            offset = self._segments[self._active_id][0]
+            self._active_file.write(record)
+            self._active_file.flush()
+
+            self._forget(block_id)
+            self._tombstones.pop(block_id, None)
+            self._index[block_id] = (self._active_id, offset, len(record))
+            self._segments[self._active_id][0] += len(record)
+            self._segments[self._active_id][1] += len(record)
+            self._cache_put(block_id, value)
+            self._enforce_retention()
+
+    def get(self, block_id: int, default: Any = None) -> Any:
+        """Look up a block, serving hot entries from the LRU"""
+        with self._lock:
+            cached = self._cache.get(block_id)
+            if cached is not None:
+                self._cache.move_to_end(block_id)
+                self.cache_hits += 1
+                return cached
+
+            self._ensure_open()
+            location = self._index.get(block_id)
+            if location is None:
+                return default
+            self.cache_misses += 1
+            _, meta, data = self._read_record(*location)
+            value = self.record_type.from_record(block_id, meta, data)
+            self._cache_put(block_id, value)
+            return value
+
+    def delete(self, block_id: int):
+        """Remove a block by appending a tombstone"""
+        with self._lock:
+            self._ensure_open()
+            if block_id not in self._index:
+                raise KeyError(block_id)
+            self._append_tombstone(block_id)
+
+    def _append_tombstone(self, block_id: int):
+        """Write a tombstone for a live block (lock held)"""
+        seq = self._next_seq
+        record = self._pack(seq, block_id, _FLAG_TOMBSTONE, {}, b'')
+        self._next_seq += 1
+        offset = self._segments[self._active_id][0]
+        self._active_file.write(record)
+        self._active_file.flush()
+        self._segments[self._active_id][0] += len(record)
+        self._forget(block_id)
+        self._tombstones[block_id] = (seq, self._active_id, offset, len(record))
+
+    def _live_bytes(self) -> int:
+        return sum(live for _, live, _ in self._segments.values())
+
+    def _enforce_retention(self):
+        """Tombstone the oldest blocks until the store is within its limits (lock held)
+
+        The newest block is always kept, even if it alone exceeds max_live_bytes.
+        """
+        if self.max_blocks is None and self.max_live_bytes is None:
+            return
+        live_bytes = self._live_bytes() if self.max_live_bytes is not None else 0
+        evicted = 0
+        while len(self._index) > 1 and (
+                (self.max_blocks is not None and len(self._index) > self.max_blocks)
+                or (self.max_live_bytes is not None and live_bytes > self.max_live_bytes)):
+            oldest = next(iter(self._index))
+            live_bytes -= self._index[oldest][2]
+            self._append_tombstone(oldest)
+            evicted += 1
+        if evicted:
+            self.evictions += evicted
+            self._compact_wakeup.set()
+
+    def _forget(self, block_id: int):
+        """Mark a block's current record dead"""
+        previous = self._index.pop(block_id, None)
+        if previous is not None:
+            self._segments[previous[0]][1] -= previous[2]
+        self._cache.pop(block_id, None)
+
+    def _cache_put(self, block_id: int, value: Any):
+        self._cache[block_id] = value
+        self._cache.move_to_end(block_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def __getitem__(self, block_id: int) -> Any:
+        value = self.get(block_id)
+        if value is None:
+            raise KeyError(block_id)
+        return value
+
+    def __setitem__(self, block_id: int, value: Any):
+        self.put(block_id, value)
+
+    def __delitem__(self, block_id: int):
+        self.delete(block_id)
+
+    def __contains__(self, block_id: object) -> bool:
+        with self._lock:
+            if block_id in self._cache:
+                return True
+            self._ensure_open()
+            return block_id in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_open()
+            return len(self._index)
+
+    def __iter__(self) -> Iterator[int]:
+        with self._lock:
+            self._ensure_open()
+            return iter(list(self._index))
+
+    def max_block_id(self) -> int:
+        """Highest stored block id, or -1 when empty"""
+        with self._lock:
+            self._ensure_open()
+            return max(self._index, default=-1)
+
+    # ---- Compaction ----
+
+    def _compaction_loop(self):
+        while not self._closing.is_set():
+            self._compact_wakeup.wait(self.compaction_interval)
+            self._compact_wakeup.clear()
+            if self._closing.is_set():
+                break
+            try:
+                self.compact()
+            except Exception as e:
+                log.error(f"QDPI segment compaction failed: {e}")
+
+    def compact(self) -> int:
+        """Rewrite sealed segments that are mostly dead; returns segments reclaimed"""
+        with self._lock:
+            if not self._opened:
+                return 0
+            victims = {
+                segment_id for segment_id, (total, live, _) in self._segments.items()
+                if segment_id != self._active_id
+                and (total == 0 or (total - live) / total >= self.compaction_threshold)
+            }
+            if not victims:
+                return 0
+            survivors_min_seq = min(
+                (min_seq for segment_id, (_, _, min_seq) in self._segments.items() if segment_id not in victims),
+                default=self._next_seq
+            )
+            copies = [
+                (block_id, location) for block_id, location in self._index.items()
+                if location[0] in victims
+            ]
+            # A tombstone must outlive every surviving segment that could hold an older copy
+            copies += [
+                (block_id, (segment_id, offset, length))
+                for block_id, (seq, segment_id, offset, length) in self._tombstones.items()
+                if segment_id in victims and seq > survivors_min_seq
+            ]
+            if not copies:
+                self._drop_segments(victims)
+                return len(victims)
+            output_id = self._allocate_segment_id()
+
+        # Copy records outside the lock; sealed segments never change
+        moved: Dict[int, Tuple[Tuple[int, int, int], Tuple[int, int, int]]] = {}
+        tmp_path = self._segment_path(output_id).with_suffix(".tmp")
+        offset = 0
+        min_seq = None
+        with open(tmp_path, 'wb') as out:
+            for block_id, (segment_id, record_offset, length) in sorted(copies, key=lambda item: item[1]):
+                with open(self._segment_path(segment_id), 'rb') as f:
+                    f.seek(record_offset)
+                    record = f.read(length)
+                out.write(record)
+                seq = _HEADER.unpack_from(record)[0]
+                min_seq = seq if min_seq is None else min(min_seq, seq)
+                moved[block_id] = ((segment_id, record_offset, length), (output_id, offset, length))
+                offset += length
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, self._segment_path(output_id))
+
+        with self._lock:
+            self._segments[output_id] = [offset, 0, self._next_seq if min_seq is None else min_seq]
+            for block_id, (old, new) in moved.items():
+                # Blocks rewritten or deleted during the copy keep their newer state
+                if self._index.get(block_id) == old:
+                    self._index[block_id] = new
+                    self._segments[output_id][1] += new[2]
+                elif block_id in self._tombstones and self._tombstones[block_id][1:] == old:
+                    self._tombstones[block_id] = (self._tombstones[block_id][0],) + new
+            self._drop_segments(victims)
+
+        log.info(f"Compacted {len(victims)} QDPI segments into segment {output_id} ({offset} bytes kept)")
+        return len(victims)
+
+    def _drop_segments(self, segment_ids):
+        """Delete segments whose records are all dead or moved (lock held)"""
+        for block_id in [b for b, (_, segment_id, _, _) in self._tombstones.items() if segment_id in segment_ids]:
+            del self._tombstones[block_id]
+        for segment_id in segment_ids:
+            mapped = self._maps.pop(segment_id, None)
+            if mapped is not None:
+                mapped.close()
+            self._segments.pop(segment_id, None)
+            self._segment_path(segment_id).unlink()
+        self.compactions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store size, cache effectiveness and compaction counters"""
+        with self._lock:
+            total = sum(size for size, _, _ in self._segments.values())
+            live = self._live_bytes()
+            return {
+                'directory': str(self.directory),
+                'blocks': len(self._index),
+                'segments': len(self._segments),
+                'disk_bytes': total,
+                'live_bytes': live,
+                'cached_blocks': len(self._cache),
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'compactions': self.compactions,
+                'evictions': self.evictions
+            }
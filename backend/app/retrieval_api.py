@@ -8,7 +8,10 @@ FastAPI endpoints for semantic search and page retrieval using Cassandra vector
 import os
 import sys
 import json
+import time
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from contextlib import asynccontextmanager
@@ -19,13 +22,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
-from cassandra.policies import DCAwareRoundRobinPolicy
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
 import openai
-from sentence_transformers import SentenceTransformer
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from backend.app.cassandra_async import execute_async, execute_one
+from backend.app.corpus_stats import CorpusStats, ensure_schema
+from backend.app.cql_statements import StatementRegistry
+from backend.app.embedding_cache import embedding_input, get_embedding_cache
+from backend.app.model_registry import get_model_registry
+
 try:
     from backend.app.tokenizer_service import get_tokenizer_service
     TOKENIZER_AVAILABLE = True
@@ -41,6 +49,10 @@ logger = logging.getLogger(__name__)
 cassandra_session = None
 embedding_model = None
 tokenizer_service = None
+statements: Optional[StatementRegistry] = None
+corpus_stats = CorpusStats()
+inference_executor: Optional[ThreadPoolExecutor] = None
+inference_slots: Optional[asyncio.Semaphore] = None
 
 # Configuration from environment
 CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "localhost")
@@ -48,6 +60,12 @@ CASSANDRA_PORT = int(os.getenv("CASSANDRA_PORT", "9042"))
 CASSANDRA_KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "gibsey_network")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "text-embedding-3-small")
+LOCAL_EMBED_MODEL = 'all-MiniLM-L6-v2'
+# Model inference runs on its own small pool so it never competes with the event loop
+INFERENCE_WORKERS = int(os.getenv("RETRIEVAL_INFERENCE_WORKERS", "2"))
+INFERENCE_QUEUE = int(os.getenv("RETRIEVAL_INFERENCE_QUEUE", "64"))
+# How often the in-memory corpus statistics are reloaded from corpus_stats
+STATS_REFRESH_SECONDS = float(os.getenv("CORPUS_STATS_REFRESH_SECONDS", "30"))
 
 # API Models
 class SearchQuery(BaseModel):
@@ -80,18 +98,34 @@ class SearchResponse(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize services on startup and cleanup on shutdown."""
-    global cassandra_session, embedding_model, tokenizer_service
+    global cassandra_session, embedding_model, tokenizer_service, inference_executor, inference_slots, statements
     
+    stats_task = None
     try:
+        inference_executor = ThreadPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            thread_name_prefix="retrieval-inference"
+        )
+        inference_slots = asyncio.Semaphore(INFERENCE_QUEUE)
+        
         # Initialize Cassandra connection
         logger.info(f"Connecting to Cassandra at {CASSANDRA_HOST}:{CASSANDRA_PORT}")
         cluster = Cluster(
             [CASSANDRA_HOST],
             port=CASSANDRA_PORT,
-            load_balancing_policy=DCAwareRoundRobinPolicy()
+            load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy())
         )
         cassandra_session = cluster.connect(CASSANDRA_KEYSPACE)
         logger.info("✓ Cassandra connection established")
+        ensure_schema(cassandra_session)
+        
+        # Prepare every query once; re-prepared when a node comes back up
+        statements = StatementRegistry(cassandra_session).listen(cluster)
+        statements.prepare_all()
+        logger.info(f"✓ Prepared {statements.prepare_count} CQL statements")
+        
+        # Corpus statistics are served from memory and reloaded in the background
+        stats_task = asyncio.ensure_future(refresh_corpus_stats())
         
         # Initialize embedding model
         if OPENAI_API_KEY:
@@ -101,7 +135,9 @@ async def lifespan(app: FastAPI):
         else:
             # Fallback to local model
             logger.info("Loading local sentence transformer model...")
-            embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            registry = get_model_registry()
+            registry.preload_sync([LOCAL_EMBED_MODEL])
+            embedding_model = registry.get(LOCAL_EMBED_MODEL)
             logger.info("✓ Local sentence transformer loaded")
         
         # Initialize tokenizer service
@@ -116,8 +152,12 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         # Cleanup
+        if stats_task:
+            stats_task.cancel()
         if cassandra_session:
             cassandra_session.shutdown()
+        if inference_executor:
+            inference_executor.shutdown(wait=False)
         logger.info("Services shut down")
 
 # Create FastAPI app
@@ -137,8 +177,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_embedding(text: str) -> List[float]:
-    """Generate embedding for text using configured model."""
+def _embedding_model_name() -> str:
+    return EMBED_MODEL if embedding_model == "openai" else LOCAL_EMBED_MODEL
+
+def _compute_embedding(text: str) -> List[float]:
+    """Run the configured model (no cache)."""
     if embedding_model == "openai":
         response = openai.embeddings.create(
             model=EMBED_MODEL,
@@ -147,8 +190,49 @@ def get_embedding(text: str) -> List[float]:
         return response.data[0].embedding
     else:
         # Use local sentence transformer
-        embedding = embedding_model.encode(text)
-        return embedding.tolist()
+        return embedding_model.encode(text).tolist()
+
+def get_embedding(text: str) -> List[float]:
+    """Generate embedding for text using configured model (cached)."""
+    return get_embedding_cache().get_or_compute(_embedding_model_name(), text, _compute_embedding)
+
+async def get_embedding_async(text: str) -> List[float]:
+    """Embedding for text without blocking the event loop.
+    
+    Cache hits return immediately; misses run on the bounded inference pool,
+    and callers beyond RETRIEVAL_INFERENCE_QUEUE wait for a slot.
+    """
+    cache = get_embedding_cache()
+    model_name = _embedding_model_name()
+    embedding = cache.get(model_name, text)
+    if embedding is not None:
+        return embedding
+    
+    if inference_executor is None:
+        embedding = await asyncio.to_thread(_compute_embedding, embedding_input(text))
+    else:
+        async with inference_slots:
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(inference_executor, _compute_embedding, embedding_input(text))
+    cache.put(model_name, text, embedding)
+    return embedding
+
+def get_statements() -> StatementRegistry:
+    """Statement registry for the current session (built lazily if needed)."""
+    global statements
+    if statements is None or statements.session is not cassandra_session:
+        statements = StatementRegistry(cassandra_session)
+    return statements
+
+async def refresh_corpus_stats():
+    """Reload the corpus statistics rollup every STATS_REFRESH_SECONDS."""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, corpus_stats.load, get_statements())
+        except Exception as e:
+            logger.warning(f"Corpus statistics refresh failed: {e}")
+        await asyncio.sleep(STATS_REFRESH_SECONDS)
 
 def truncate_to_tokens(text: str, max_tokens: int = 300) -> str:
     """Truncate text to maximum number of tokens for preview."""
@@ -177,16 +261,9 @@ async def read_page(page_id: str):
     if not cassandra_session:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    # Query page by primary key
-    query = """
-    SELECT page_id, title, content, symbol_id, tokens, page_index
-    FROM pages 
-    WHERE page_id = ?
-    """
-    
     try:
-        result = cassandra_session.execute(query, [page_id])
-        row = result.one()
+        # Query page by primary key (token-aware: goes straight to a replica)
+        row = await execute_one(cassandra_session, get_statements().bind('pages.read', [page_id]))
         
         if not row:
             raise HTTPException(status_code=404, detail=f"Page {page_id} not found")
@@ -210,7 +287,6 @@ async def read_page(page_id: str):
 @app.post("/index", response_model=SearchResponse)
 async def semantic_search(query: SearchQuery):
     """Perform semantic search over the corpus."""
-    import time
     start_time = time.time()
     
     if not cassandra_session:
@@ -227,30 +303,24 @@ async def semantic_search(query: SearchQuery):
     
     try:
         # Generate embedding for query
-        query_embedding = get_embedding(query.q)
+        query_embedding = await get_embedding_async(query.q)
         
-        # Prepare CQL query with vector search
+        # Bind the vector search statement
         if query.symbol_id:
             # Filter by character symbol
-            cql_query = """
-            SELECT page_id, title, content, symbol_id, page_index, 
-                   similarity_cosine(embedding, ?) as score
-            FROM pages 
-            WHERE symbol_id = ? AND embedding ANN OF ? LIMIT ?
-            """
-            params = [query_embedding, query.symbol_id, query_embedding, query.top_k]
+            statement = get_statements().bind(
+                'pages.search_by_symbol',
+                [query_embedding, query.symbol_id, query_embedding, query.top_k]
+            )
         else:
             # Search all pages
-            cql_query = """
-            SELECT page_id, title, content, symbol_id, page_index,
-                   similarity_cosine(embedding, ?) as score
-            FROM pages 
-            WHERE embedding ANN OF ? LIMIT ?
-            """
-            params = [query_embedding, query_embedding, query.top_k]
+            statement = get_statements().bind(
+                'pages.search',
+                [query_embedding, query_embedding, query.top_k]
+            )
         
         # Execute search
-        result = cassandra_session.execute(cql_query, params)
+        result = await execute_async(cassandra_session, statement)
         
         # Process results
         search_results = []
@@ -281,43 +351,17 @@ async def semantic_search(query: SearchQuery):
 
 @app.get("/stats")
 async def get_corpus_stats():
-    """Get statistics about the corpus."""
+    """Get statistics about the corpus (served from the in-memory rollup)."""
     if not cassandra_session:
         raise HTTPException(status_code=503, detail="Database not available")
+    if corpus_stats.loaded_at is None:
+        raise HTTPException(status_code=503, detail="Corpus statistics not loaded yet")
     
-    try:
-        # Count total pages
-        total_pages_result = cassandra_session.execute("SELECT COUNT(*) FROM pages")
-        total_pages = total_pages_result.one().count
-        
-        # Count pages by character
-        symbol_counts_result = cassandra_session.execute("""
-            SELECT symbol_id, COUNT(*) as count 
-            FROM pages 
-            GROUP BY symbol_id 
-            ALLOW FILTERING
-        """)
-        
-        symbol_counts = {}
-        for row in symbol_counts_result:
-            if row.symbol_id:
-                symbol_counts[row.symbol_id] = row.count
-        
-        # Get total token count
-        token_sum_result = cassandra_session.execute("SELECT SUM(tokens) FROM pages")
-        total_tokens = token_sum_result.one().system_sum_tokens or 0
-        
-        return {
-            "total_pages": total_pages,
-            "total_tokens": total_tokens,
-            "pages_by_character": symbol_counts,
-            "embedding_model": EMBED_MODEL if embedding_model == "openai" else "local",
-            "tokenizer_available": tokenizer_service is not None
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get statistics")
+    return {
+        **corpus_stats.get_stats(),
+        "embedding_model": EMBED_MODEL if embedding_model == "openai" else "local",
+        "tokenizer_available": tokenizer_service is not None
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,7 +3,7 @@ Stargate REST API client for Cassandra operations
 Provides high-level interface for CRUD operations via Stargate REST API
 """
 
-import aiohttp
+import httpx
 import json
 import uuid
 from typing import Dict, List, Optional, Any, Union
@@ -12,6 +12,7 @@ import logging
 from urllib.parse import urljoin
 
 from app.models import StoryPage, PromptOption, User, Branch, Motif
+from app.http_transport import get_http_transport, loads
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +25,17 @@ class StargateClient:
     def __init__(self, base_url: str = "http://localhost:8082", keyspace: str = "gibsey_network"):
         self.base_url = base_url.rstrip('/')
         self.keyspace = keyspace
-        self.session = None
+        # Pooled HTTP transport shared with every other Stargate caller
+        self.transport = get_http_transport()
         self.auth_token = None  # For future authentication
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the shared transport is closed on app shutdown)"""
+        pass
     
     def _get_url(self, path: str) -> str:
         """Build full URL for Stargate REST API"""
@@ -44,32 +44,31 @@ class StargateClient:
     async def _request(self, method: str, path: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict:
         """Make HTTP request to Stargate API"""
         url = self._get_url(path)
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
+        headers = {}
         
         # Add auth token when available
         if self.auth_token:
             headers['X-Cassandra-Token'] = self.auth_token
         
         try:
-            async with self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
+            # Rows are upserts in Cassandra, so retrying any request is safe
+            response = await self.transport.request(
+                method,
+                url,
                 json=data,
-                params=params
-            ) as response:
-                
-                if response.status >= 400:
-                    error_text = await response.text()
-                    logger.error(f"Stargate API error {response.status}: {error_text}")
-                    raise Exception(f"Stargate API error {response.status}: {error_text}")
-                
-                return await response.json()
+                params=params,
+                headers=headers,
+                endpoint=f"{method} {path.lstrip('/').split('/')[0]}",
+                idempotent=True
+            )
+            
+            if response.status_code >= 400:
+                logger.error(f"Stargate API error {response.status_code}: {response.text}")
+                raise Exception(f"Stargate API error {response.status_code}: {response.text}")
+            
+            return loads(response.content)
                 
-        except aiohttp.ClientError as e:
+        except httpx.HTTPError as e:
             logger.error(f"HTTP client error: {e}")
             raise
     
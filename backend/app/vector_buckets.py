@@ -0,0 +1,184 @@
+"""
+Bucketed layout for stored embeddings.
+
+The original `vector_embeddings` table is keyed by content_type alone, so every
+page embedding lives in one ever-growing partition on a single replica set.
+`vector_embeddings_by_bucket` adds a fixed number of hash buckets to the
+partition key: writes spread across the ring and readers fan out over the
+buckets concurrently.
+
+Run this module to copy rows from the legacy table into the bucketed one. The
+copy is safe while the application is live: rows are written with their
+original write time, so an embedding rewritten since then is never replaced
+by its older copy, and re-running the migration is harmless. A finished copy
+is recorded per content type in `vector_bucket_migrations`; until then
+readers merge the legacy partition under the bucketed rows.
+"""
+
+import logging
+import os
+import zlib
+from datetime import timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Changing the bucket count moves rows between buckets; re-run the migration after doing so
+DEFAULT_BUCKETS = 16
+EMBEDDING_BUCKETS = int(os.getenv('VECTOR_EMBEDDING_BUCKETS', str(DEFAULT_BUCKETS)))
+
+LEGACY_TABLE = 'vector_embeddings'
+BUCKETED_TABLE = 'vector_embeddings_by_bucket'
+
+BUCKETED_TABLE_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS {BUCKETED_TABLE} (
+        content_type text,
+        bucket int,
+        content_id text,
+        embedding list<float>,
+        embedding_model text,
+        created_at timestamp,
+        metadata map<text, text>,
+        PRIMARY KEY ((content_type, bucket), content_id)
+    )
+"""
+
+MIGRATIONS_TABLE = 'vector_bucket_migrations'
+
+MIGRATIONS_TABLE_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+        content_type text PRIMARY KEY,
+        buckets int,
+        migrated_at timestamp
+    )
+"""
+
+# Rows fetched per page while scanning the legacy table
+MIGRATION_FETCH_SIZE = 500
+# Inserts kept in flight while copying
+MIGRATION_CONCURRENCY = 64
+
+
+def embedding_bucket(content_id: str, buckets: int = EMBEDDING_BUCKETS) -> int:
+    """Stable bucket for a content ID (the same in every process, unlike hash())."""
+    return zlib.crc32(content_id.encode('utf-8')) % buckets
+
+
+def _copy_timestamp(row: Any) -> int:
+    """Write time (microseconds) to copy a legacy row with."""
+    if row.written is not None:
+        return row.written
+    if row.created_at is not None:
+        # The driver returns naive UTC datetimes
+        return int(row.created_at.replace(tzinfo=timezone.utc).timestamp() * 1_000_000)
+    # Unknown age: lose against any write made through the application
+    return 1
+
+
+def migrate_vector_embeddings(session: Any,
+                              buckets: int = EMBEDDING_BUCKETS,
+                              content_type: Optional[str] = None) -> Dict[str, int]:
+    """
+    Copy legacy vector_embeddings rows into the bucketed table.
+
+    Args:
+        session: Cassandra session bound to the keyspace
+        buckets: Number of buckets per content type
+        content_type: Only copy this content type (default: all)
+
+    Returns:
+        Rows copied per content type
+    """
+    from cassandra.concurrent import execute_concurrent_with_args
+    from cassandra.query import SimpleStatement
+
+    session.execute(BUCKETED_TABLE_SCHEMA)
+    session.execute(MIGRATIONS_TABLE_SCHEMA)
+
+    select = f"""
+        SELECT content_type, content_id, embedding, embedding_model, created_at, metadata,
+               writetime(embedding_model) AS written
+        FROM {LEGACY_TABLE}
+    """
+    params = None
+    if content_type:
+        select += " WHERE content_type = %s"
+        params = [content_type]
+    insert = session.prepare(f"""
+        INSERT INTO {BUCKETED_TABLE}
+            (content_type, bucket, content_id, embedding, embedding_model, created_at, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        USING TIMESTAMP ?
+    """)
+
+    copied: Dict[str, int] = {}
+    batch = []
+
+    def flush():
+        results = execute_concurrent_with_args(
+            session, insert, batch, concurrency=MIGRATION_CONCURRENCY, raise_on_first_error=True
+        )
+        for success, _ in results:
+            if not success:
+                raise RuntimeError("Embedding copy failed")
+        batch.clear()
+
+    rows = session.execute(SimpleStatement(select, fetch_size=MIGRATION_FETCH_SIZE), params)
+    for row in rows:
+        batch.append((
+            row.content_type,
+            embedding_bucket(row.content_id, buckets),
+            row.content_id,
+            row.embedding,
+            row.embedding_model,
+            row.created_at,
+            row.metadata,
+            _copy_timestamp(row)
+        ))
+        copied[row.content_type] = copied.get(row.content_type, 0) + 1
+        if len(batch) >= MIGRATION_FETCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+    # Readers stop consulting the legacy partition of a content type once it is marked
+    mark = session.prepare(f"""
+        INSERT INTO {MIGRATIONS_TABLE} (content_type, buckets, migrated_at) VALUES (?, ?, toTimestamp(now()))
+    """)
+    for name in set(copied) | ({content_type} if content_type else set()):
+        session.execute(mark, (name, buckets))
+
+    for name, count in copied.items():
+        logger.info(f"Copied {count} {name} embeddings into {buckets} buckets")
+    return copied
+
+
+def run_migration() -> bool:
+    """Connect using the usual environment variables and migrate every content type"""
+    from cassandra.cluster import Cluster
+    from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+
+    hosts = os.getenv('CASSANDRA_HOSTS', 'localhost').split(',')
+    keyspace = os.getenv('CASSANDRA_KEYSPACE', 'gibsey_network')
+
+    cluster = Cluster(hosts, load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy()))
+    try:
+        session = cluster.connect(keyspace)
+        copied = migrate_vector_embeddings(session)
+        logger.info(f"Migration complete: {sum(copied.values())} embeddings copied")
+        return True
+    except Exception as e:
+        logger.error(f"Embedding migration failed: {e}")
+        return False
+    finally:
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    if run_migration():
+        print("✅ vector_embeddings migrated to the bucketed layout")
+    else:
+        print("❌ vector_embeddings migration failed")
+        exit(1)
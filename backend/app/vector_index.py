@@ -0,0 +1,283 @@
+"""
+Resident vector index for semantic page search
+Keeps every embedding of a content type in one normalized float32 matrix so a
+top-k query is a single matrix-vector product plus argpartition. The same
+top-k kernels back VectorEmbeddingService's matrix similarity API.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Approximate search is optional - exact search covers small and mid-size corpora
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    hnswlib = None
+    HNSW_AVAILABLE = False
+
+INDEX_MODES = ('exact', 'hnsw')
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Unit-length float32 rows; all-zero rows stay zero"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def top_k_from_scores(scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best `top_k` columns per row of a (queries, candidates) score matrix, best first"""
+    scores = np.atleast_2d(scores)
+    top_k = min(top_k, scores.shape[1])
+    if top_k <= 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    if top_k < scores.shape[1]:
+        top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    else:
+        top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape).copy()
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+def top_k_similar(queries: np.ndarray, candidates: np.ndarray, top_k: int,
+                  normalized: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosine top-k of every query row against every candidate row in one matrix multiply
+
+    Returns (indices, scores), both shaped (queries, k) with the best match first.
+    Pass normalized=True when both inputs already have unit-length rows.
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    candidates = np.atleast_2d(np.asarray(candidates, dtype=np.float32))
+    if not normalized:
+        queries = normalize_rows(queries)
+        candidates = normalize_rows(candidates)
+    return top_k_from_scores(queries @ candidates.T, top_k)
+
+class VectorIndex:
+    """In-process cosine-similarity index with incremental upserts"""
+
+    def __init__(self,
+                 dimensions: Optional[int] = None,
+                 mode: str = 'exact',
+                 initial_capacity: int = 1024,
+                 hnsw_m: int = 16,
+                 hnsw_ef_construction: int = 200,
+                 hnsw_ef_search: int = 64):
+        """
+        Initialize an empty index
+
+        Args:
+            dimensions: Embedding size (taken from the first vector if omitted)
+            mode: 'exact' (matrix multiply) or 'hnsw' (approximate, needs hnswlib)
+            initial_capacity: Rows preallocated before the first resize
+            hnsw_m: HNSW graph degree
+            hnsw_ef_construction: HNSW build-time candidate list size
+            hnsw_ef_search: HNSW query-time candidate list size
+        """
+        if mode not in INDEX_MODES:
+            raise ValueError(f"Unknown index mode: {mode}")
+        if mode == 'hnsw' and not HNSW_AVAILABLE:
+            logger.warning("hnswlib not installed - vector index falling back to exact search")
+            mode = 'exact'
+
+        self.dimensions = dimensions
+        self.mode = mode
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+
+        self._lock = threading.RLock()
+        self._capacity = max(1, initial_capacity)
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._hnsw = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, content_id: str) -> bool:
+        return content_id in self._rows
+
+    def _allocate(self, dimensions: int):
+        """Create storage once the embedding size is known"""
+        self.dimensions = dimensions
+        self._matrix = np.zeros((self._capacity, dimensions), dtype=np.float32)
+        if self.mode == 'hnsw':
+            self._hnsw = hnswlib.Index(space='ip', dim=dimensions)
+            self._hnsw.init_index(
+                max_elements=self._capacity,
+                M=self.hnsw_m,
+                ef_construction=self.hnsw_ef_construction,
+                allow_replace_deleted=True
+            )
+            self._hnsw.set_ef(self.hnsw_ef_search)
+
+    def _grow(self, needed: int):
+        """Double capacity until `needed` rows fit"""
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        matrix[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = matrix
+        self._capacity = capacity
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def add_many(self, items: Sequence[Tuple[str, Sequence[float]]]):
+        """Insert or replace a batch of (content_id, embedding) pairs"""
+        if not items:
+            return
+
+        vectors = np.asarray([embedding for _, embedding in items], dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must all have the same length")
+
+        with self._lock:
+            if self._matrix is None:
+                self._allocate(vectors.shape[1])
+            if vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Expected {self.dimensions}-dimensional embeddings, got {vectors.shape[1]}")
+
+            vectors = normalize_rows(vectors)
+            rows = []
+            reused = set()
+            for content_id, _ in items:
+                row = self._rows.get(content_id)
+                if row is None:
+                    if self._free_rows:
+                        row = self._free_rows.pop()
+                        reused.add(row)
+                    else:
+                        row = len(self._ids)
+                        self._grow(row + 1)
+                        self._ids.append(None)
+                    self._ids[row] = content_id
+                    self._rows[content_id] = row
+                rows.append(row)
+
+            # Later duplicates in one batch win, matching sequential upserts
+            self._matrix[rows] = vectors
+            if self._hnsw is not None:
+                self._add_to_hnsw(rows, reused)
+
+    def _add_to_hnsw(self, rows: List[int], reused: set):
+        """Mirror matrix rows into the graph
+
+        replace_deleted=True hands the label a deleted graph slot, so it is
+        only used for rows just taken from the free list; a live row given a
+        second slot would come back twice from knn_query.
+        """
+        unique = list(dict.fromkeys(rows))
+        for replace in (False, True):
+            batch = [row for row in unique if (row in reused) == replace]
+            if batch:
+                self._hnsw.add_items(self._matrix[batch], batch, replace_deleted=replace)
+
+    def add(self, content_id: str, embedding: Sequence[float]):
+        """Insert or replace one embedding"""
+        self.add_many([(content_id, embedding)])
+
+    def remove(self, content_id: str) -> bool:
+        """Drop an embedding; its row is reused by the next insert"""
+        with self._lock:
+            row = self._rows.pop(content_id, None)
+            if row is None:
+                return False
+            self._ids[row] = None
+            self._matrix[row] = 0.0
+            self._free_rows.append(row)
+            if self._hnsw is not None:
+                self._hnsw.mark_deleted(row)
+            return True
+
+    def get_vector(self, content_id: str) -> Optional[np.ndarray]:
+        """Stored (normalized) embedding for an id"""
+        with self._lock:
+            row = self._rows.get(content_id)
+            return None if row is None else self._matrix[row].copy()
+
+    def search(self, query_embedding: Sequence[float], top_k: int = 10,
+               exclude: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """Top-k (content_id, cosine similarity) pairs, most similar first"""
+        return self.search_batch([query_embedding], top_k, exclude)[0]
+
+    def search_batch(self, query_embeddings: Sequence[Sequence[float]], top_k: int = 10,
+                     exclude: Optional[Sequence[str]] = None) -> List[List[Tuple[str, float]]]:
+        """Top-k results for several queries with a single kernel call"""
+        queries = normalize_rows(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        with self._lock:
+            if not self._rows or top_k <= 0:
+                return [[] for _ in range(len(queries))]
+            if queries.shape[1] != self.dimensions:
+                raise ValueError(f"Expected {self.dimensions}-dimensional query, got {queries.shape[1]}")
+
+            excluded = {self._rows[c] for c in (exclude or []) if c in self._rows}
+            wanted = min(top_k + len(excluded), len(self._rows))
+
+            labels = None
+            if self._hnsw is not None:
+                labels, scores = self._hnsw_query(queries, wanted)
+            if labels is None:
+                all_scores = queries @ self._matrix[:len(self._ids)].T
+                # Free rows hold zero vectors; push them below every real score
+                if self._free_rows:
+                    all_scores[:, self._free_rows] = -np.inf
+                labels, scores = top_k_from_scores(all_scores, wanted)
+
+            batch = []
+            for row_labels, row_scores in zip(labels.tolist(), scores.tolist()):
+                results = []
+                seen = set()
+                for row, score in zip(row_labels, row_scores):
+                    if row in excluded or row in seen or self._ids[row] is None:
+                        continue
+                    seen.add(row)
+                    results.append((self._ids[row], float(score)))
+                    if len(results) == top_k:
+                        break
+                batch.append(results)
+            return batch
+
+    def _hnsw_query(self, queries: np.ndarray, wanted: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """HNSW top-`wanted` labels and scores, or (None, None) to use exact search
+
+        knn_query raises RuntimeError when the graph walk finds fewer than k
+        live neighbours, which deleted rows make likely at a small ef. Retry
+        once with ef covering every row before giving up on the graph.
+        """
+        try:
+            labels, distances = self._hnsw.knn_query(queries, k=wanted)
+            return labels, 1.0 - distances
+        except RuntimeError:
+            pass
+        self._hnsw.set_ef(max(self.hnsw_ef_search, len(self._ids)))
+        try:
+            labels, distances = self._hnsw.knn_query(queries, k=wanted)
+            return labels, 1.0 - distances
+        except RuntimeError:
+            logger.warning(f"HNSW search could not return {wanted} neighbours - using exact search")
+            return None, None
+        finally:
+            self._hnsw.set_ef(self.hnsw_ef_search)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and memory footprint"""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'vectors': len(self._rows),
+                'dimensions': self.dimensions or 0,
+                'capacity': self._capacity,
+                'matrix_bytes': int(self._matrix.nbytes) if self._matrix is not None else 0
+            }
@@ -6,13 +6,18 @@ Supports both Sentence Transformers (SBERT) and OpenAI embeddings
 import asyncio
 import logging
 import os
+import threading
 from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import openai
 from sklearn.metrics.pairwise import cosine_similarity
 
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import embedding_input, get_embedding_cache
+from .model_registry import get_model_registry
+from .vector_index import top_k_similar
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -42,6 +47,13 @@ class VectorEmbeddingService:
         self.sbert_model = None
         self.openai_client = None
         
+        # One request-coalescing batcher per local model
+        self._batchers: Dict[str, EmbeddingBatcher] = {}
+        self._batcher_lock = threading.Lock()
+        self.batch_max_size = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+        self.batch_max_wait_ms = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+        self.batch_max_queue = int(os.getenv("EMBED_BATCH_MAX_QUEUE", "1024"))
+        
         # Initialize OpenAI if API key provided
         if openai_api_key:
             self.openai_client = openai.OpenAI(api_key=openai_api_key)
@@ -57,20 +69,9 @@ class VectorEmbeddingService:
             "text-embedding-3-large": 3072
         }
     
-    def _initialize_sbert_model(self, model_name: str = None) -> SentenceTransformer:
-        """Initialize or get SBERT model"""
-        model_name = model_name or self.default_model
-        
-        if self.sbert_model is None or getattr(self.sbert_model, '_model_name', None) != model_name:
-            try:
-                logger.info(f"Loading SBERT model: {model_name}")
-                self.sbert_model = SentenceTransformer(model_name)
-                self.sbert_model._model_name = model_name
-                logger.info(f"SBERT model loaded successfully")
-            except Exception as e:
-                logger.error(f"Failed to load SBERT model {model_name}: {e}")
-                raise
-        
+    def _initialize_sbert_model(self, model_name: str = None) -> Any:
+        """Get the shared SBERT model from the process-wide registry"""
+        self.sbert_model = get_model_registry().get(model_name or self.default_model)
         return self.sbert_model
     
     async def embed_text(self, 
@@ -96,12 +97,16 @@ class VectorEmbeddingService:
         metadata = metadata or {}
         
         try:
-            if model.startswith('text-embedding-') and self.openai_client:
-                # OpenAI embedding
-                embedding = await self._embed_openai(text, model)
-            else:
-                # SBERT embedding
-                embedding = await self._embed_sbert(text, model)
+            cache = get_embedding_cache()
+            embedding = cache.get(model, text)
+            if embedding is None:
+                if model.startswith('text-embedding-') and self.openai_client:
+                    # OpenAI embedding
+                    embedding = await self._embed_openai(embedding_input(text), model)
+                else:
+                    # SBERT embedding
+                    embedding = await self._embed_sbert(embedding_input(text), model)
+                cache.put(model, text, embedding)
             
             return EmbeddingResult(
                 content_id=content_id,
@@ -116,17 +121,34 @@ class VectorEmbeddingService:
             logger.error(f"Failed to embed text for {content_id}: {e}")
             raise
     
+    def _get_batcher(self, model: str) -> EmbeddingBatcher:
+        """Get or create the micro-batcher for a local model"""
+        batcher = self._batchers.get(model)
+        if batcher is None:
+            with self._batcher_lock:
+                batcher = self._batchers.get(model)
+                if batcher is None:
+                    def _encode_batch(texts: List[str]):
+                        sbert_model = self._initialize_sbert_model(model)
+                        return sbert_model.encode(texts, convert_to_tensor=False)
+                    
+                    batcher = EmbeddingBatcher(
+                        _encode_batch,
+                        max_batch_size=self.batch_max_size,
+                        max_wait_ms=self.batch_max_wait_ms,
+                        max_queue=self.batch_max_queue,
+                        name=f"embed-{model.rsplit('/', 1)[-1]}"
+                    )
+                    self._batchers[model] = batcher
+        return batcher
+    
     async def _embed_sbert(self, text: str, model: str) -> List[float]:
-        """Generate SBERT embedding"""
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        
-        def _encode():
-            sbert_model = self._initialize_sbert_model(model)
-            embedding = sbert_model.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
-        
-        return await loop.run_in_executor(None, _encode)
+        """Generate SBERT embedding, batched with concurrent requests"""
+        return await self._get_batcher(model).embed(text)
+    
+    def get_batcher_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and batch-size metrics per local model"""
+        return {model: batcher.get_stats() for model, batcher in self._batchers.items()}
     
     async def _embed_openai(self, text: str, model: str) -> List[float]:
         """Generate OpenAI embedding"""
@@ -162,10 +184,34 @@ class VectorEmbeddingService:
         model = model or self.default_model
         metadata_list = metadata_list or [{}] * len(texts)
         
-        if model.startswith('text-embedding-') and self.openai_client:
-            return await self._embed_batch_openai(texts, model, metadata_list)
-        else:
-            return await self._embed_batch_sbert(texts, model, metadata_list)
+        # Only texts missing from the embedding cache go to the model
+        cache = get_embedding_cache()
+        cached = [cache.get(model, text) for text, _, _ in texts]
+        missing = [i for i, embedding in enumerate(cached) if embedding is None]
+        
+        if missing:
+            missing_texts = [(embedding_input(text), content_id, content_type)
+                             for text, content_id, content_type in (texts[i] for i in missing)]
+            missing_metadata = [metadata_list[i] for i in missing]
+            if model.startswith('text-embedding-') and self.openai_client:
+                computed = await self._embed_batch_openai(missing_texts, model, missing_metadata)
+            else:
+                computed = await self._embed_batch_sbert(missing_texts, model, missing_metadata)
+            for i, result in zip(missing, computed):
+                cache.put(model, texts[i][0], result.embedding)
+                cached[i] = result.embedding
+        
+        return [
+            EmbeddingResult(
+                content_id=content_id,
+                content_type=content_type,
+                embedding=embedding,
+                model=model,
+                dimensions=len(embedding),
+                metadata=metadata_list[i]
+            )
+            for i, ((text, content_id, content_type), embedding) in enumerate(zip(texts, cached))
+        ]
     
     async def _embed_batch_sbert(self, 
                                 texts: List[Tuple[str, str, str]], 
@@ -246,6 +292,23 @@ class VectorEmbeddingService:
             logger.error(f"Similarity calculation failed: {e}")
             return 0.0
     
+    def similarity_top_k(self,
+                         query_embeddings: Any,
+                         candidate_matrix: Any,
+                         top_k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine top-k of one or many queries against a candidate matrix
+        
+        Args:
+            query_embeddings: A query vector or a (queries, dims) matrix
+            candidate_matrix: (candidates, dims) matrix of embeddings
+            top_k: Number of matches per query
+            
+        Returns:
+            (indices, scores) arrays shaped (queries, k), best match first
+        """
+        return top_k_similar(query_embeddings, candidate_matrix, top_k)
+    
     def find_most_similar(self, 
                          query_embedding: List[float], 
                          candidate_embeddings: List[Tuple[str, List[float]]], 
@@ -265,27 +328,19 @@ class VectorEmbeddingService:
             if not candidate_embeddings:
                 return []
             
-            # Calculate similarities
-            similarities = []
-            for content_id, embedding in candidate_embeddings:
-                similarity = self.calculate_similarity(query_embedding, embedding)
-                similarities.append((content_id, similarity))
-            
-            # Sort by similarity descending
-            similarities.sort(key=lambda x: x[1], reverse=True)
+            ids = [content_id for content_id, _ in candidate_embeddings]
+            matrix = np.asarray([embedding for _, embedding in candidate_embeddings], dtype=np.float32)
+            indices, scores = self.similarity_top_k(query_embedding, matrix, top_k)
             
-            # Return top k
-            return similarities[:top_k]
+            return [(ids[i], float(score)) for i, score in zip(indices[0].tolist(), scores[0].tolist())]
             
         except Exception as e:
             logger.error(f"Similarity search failed: {e}")
             return []
     
-    async def embed_story_page(self, page_data: Dict[str, Any]) -> EmbeddingResult:
-        """
-        Generate embedding for a story page
-        Combines title, text, and metadata for rich embedding
-        """
+    @staticmethod
+    def _story_page_input(page_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Text and metadata embedded for a story page"""
         # Combine relevant text fields
         text_parts = []
         
@@ -309,6 +364,14 @@ class VectorEmbeddingService:
             'section': page_data.get('section'),
             'author': page_data.get('author')
         }
+        return combined_text, metadata
+    
+    async def embed_story_page(self, page_data: Dict[str, Any]) -> EmbeddingResult:
+        """
+        Generate embedding for a story page
+        Combines title, text, and metadata for rich embedding
+        """
+        combined_text, metadata = self._story_page_input(page_data)
         
         return await self.embed_text(
             text=combined_text,
@@ -317,6 +380,14 @@ class VectorEmbeddingService:
             metadata=metadata
         )
     
+    async def embed_story_pages(self, pages_data: List[Dict[str, Any]]) -> List[EmbeddingResult]:
+        """Embeddings for many story pages in one batched call (same inputs as embed_story_page)"""
+        inputs = [self._story_page_input(page_data) for page_data in pages_data]
+        return await self.embed_batch(
+            [(text, page_data['id'], 'page') for (text, _), page_data in zip(inputs, pages_data)],
+            metadata_list=[metadata for _, metadata in inputs]
+        )
+    
     async def embed_prompt(self, prompt_data: Dict[str, Any]) -> EmbeddingResult:
         """Generate embedding for a prompt"""
         # Combine prompt text with context
@@ -5,6 +5,7 @@ Main FastAPI application for the Gibsey Mycelial Network
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
+import asyncio
 import json
 from typing import Optional
 import uuid
@@ -14,6 +15,9 @@ from app.websocket import manager, mock_stream_ai_response, stream_character_res
 from app.qdpi_websocket import QDPI_WS_HANDLERS
 from app.database import get_database, close_database
 from app.models import WebSocketMessage
+from app.model_registry import get_model_registry, get_preload_models
+from app.http_transport import close_http_transport
+from app.api.qdpi_ecc_endpoints import close_ecc_pool
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -93,7 +97,7 @@ async def health_check():
         if database_url.startswith('cassandra://'):
             database_type = "cassandra"
             # Try a simple operation to test connection
-            await db.get_pages(skip=0, limit=1)
+            await db.get_pages(skip=0, limit=1, summary=True)
             database_status = "connected"
         else:
             database_type = "mock"
@@ -109,7 +113,8 @@ async def health_check():
             "type": database_type,
             "status": database_status
         },
-        "websocket_connections": len(manager.active_connections)
+        "websocket_connections": len(manager.active_connections),
+        "models": get_model_registry().get_stats()
     }
 
 @app.get("/api/v1/stats")
@@ -123,7 +128,7 @@ async def get_api_stats(db = Depends(get_database)):
         if database_url.startswith('cassandra://'):
             # For Cassandra, we'd need to query each table for counts
             # For now, return basic info
-            pages = await db.get_pages(skip=0, limit=1000)
+            pages, _ = await db.get_pages(skip=0, limit=1000, summary=True)
             database_stats = {
                 "type": "cassandra",
                 "pages": len(pages),
@@ -350,6 +355,12 @@ async def startup_event():
     print("🔌 WebSocket: Ready for connections")
     print("📡 API Docs: http://localhost:8000/api/docs")
     print("🧪 Test Page: http://localhost:8000/test")
+    
+    # Warm embedding models in the background; /health reports readiness
+    preload = get_preload_models()
+    if preload:
+        print(f"🧠 Preloading models: {', '.join(preload)}")
+        asyncio.ensure_future(get_model_registry().preload(preload))
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -363,6 +374,12 @@ async def shutdown_event():
     except Exception as e:
         print(f"⚠️ Error closing database: {e}")
     
+    # Close the shared Stargate connection pool
+    await close_http_transport()
+    
+    # Stop the ECC worker processes and close their message store
+    await close_ecc_pool()
+    
     # TODO: Add cleanup for Kafka, etc.
 
 if __name__ == "__main__":
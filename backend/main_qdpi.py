@@ -17,7 +17,7 @@ import uvicorn
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 
 # Import QDPI APIs
-from app.api.qdpi_ecc_endpoints import router as qdpi_ecc_router
+from app.api.qdpi_ecc_endpoints import router as qdpi_ecc_router, close_ecc_pool
 from app.api.qdpi import router as qdpi_router
 from app.api.qdpi_ux import router as qdpi_ux_router
 
@@ -44,6 +44,11 @@ app.include_router(qdpi_ecc_router, prefix="/api/qdpi")
 app.include_router(qdpi_router, prefix="/api/qdpi")
 app.include_router(qdpi_ux_router, prefix="/api/qdpi")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the ECC worker processes and close their message store"""
+    await close_ecc_pool()
+
 # WebSocket connection manager
 class QDPIConnectionManager:
     def __init__(self):
@@ -27,6 +27,9 @@ load_dotenv()
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from backend.app.corpus_stats import ensure_schema, record_ingest
+from backend.app.cql_statements import StatementRegistry
+
 try:
     from backend.app.tokenizer_service import get_tokenizer_service
     TOKENIZER_AVAILABLE = True
@@ -54,6 +57,7 @@ class EmbeddingsSeeder:
     def __init__(self):
         """Initialize the seeder with required services."""
         self.session = None
+        self.statements = None
         self.embedding_model = None
         self.tokenizer_service = None
         self.corpus_path = None
@@ -67,6 +71,9 @@ class EmbeddingsSeeder:
         
         cluster = Cluster([CASSANDRA_HOST], port=CASSANDRA_PORT)
         self.session = cluster.connect(CASSANDRA_KEYSPACE)
+        ensure_schema(self.session)
+        self.statements = StatementRegistry(self.session).listen(cluster)
+        self.statements.prepare_all()
         
         logger.info("✓ Connected to Cassandra")
         
@@ -173,8 +180,7 @@ class EmbeddingsSeeder:
     
     def page_exists(self, page_id: str) -> bool:
         """Check if page already exists in database."""
-        query = "SELECT page_id FROM pages WHERE page_id = %s"
-        result = self.session.execute(query, (page_id,))
+        result = self.session.execute(self.statements.bind('pages.exists', [page_id]))
         return result.one() is not None
     
     def process_page(self, page_path: Path) -> bool:
@@ -209,12 +215,7 @@ class EmbeddingsSeeder:
             embedding = self.get_embedding(content)
             
             # Insert into database
-            insert_query = """
-            INSERT INTO pages (page_id, symbol_id, title, page_index, tokens, content, embedding)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            self.session.execute(insert_query, (
+            self.session.execute(self.statements.bind('pages.insert', [
                 page_id,
                 symbol_id,
                 metadata["title"],
@@ -222,7 +223,9 @@ class EmbeddingsSeeder:
                 token_count,
                 content,
                 embedding
-            ))
+            ]))
+            # Keep the corpus_stats rollup in step (only new pages reach this point)
+            record_ingest(self.statements, symbol_id, token_count, embedding is not None)
             
             self.processed_count += 1
             logger.info(f"✓ Processed page {self.processed_count}: {page_id}")
@@ -4,9 +4,11 @@ import os, io, sys, hashlib, logging, xxhash, json
 from pathlib import Path
 from PIL import Image
 import chromadb
-from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
+sys.path.append(str(Path(__file__).parent.parent))
+from app.model_registry import get_model_registry
+
 MODEL_NAME = os.getenv("SREC_EMBED_MODEL", "sentence-transformers/clip-ViT-B-32")
 COL = os.getenv("SREC_COLLECTION", "corpus_symbols")
 CHOST = os.getenv("CHROMA_HOST", "localhost")
@@ -23,7 +25,7 @@ def _init():
     global _model, _client, _coll
     if _model is None:
         log.info(f"[SREC] loading model {MODEL_NAME}")
-        _model = SentenceTransformer(MODEL_NAME)
+        _model = get_model_registry().get(MODEL_NAME)
     if _client is None:
         _client = chromadb.HttpClient(host=CHOST, port=CPORT)
         _coll = _client.get_or_create_collection(COL)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+QDPI Benchmark Suite
+Repeatable throughput and latency benchmarks for the QDPI codec and ECC pipeline
+
+Covers QDPICodex, QDPIReedSolomon, QDPIMiniSyndrome and QDPICompleteECC across
+sequence lengths, random bit error rates (simulate_transmission_errors) and
+burst patterns (simulate_burst_errors). Latencies go into LatencyHistograms so
+p50/p99 come out of the same buckets the live stack reports.
+
+Usage:
+    python qdpi_benchmark.py run --output benchmarks/qdpi_baseline.json
+    python qdpi_benchmark.py compare benchmarks/qdpi_baseline.json --threshold 0.15
+
+`compare` reruns the suite (or loads --current) and exits non-zero when any
+case loses more than `threshold` of its throughput or its p99 latency grows
+by more than `threshold` relative to the baseline.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional
+
+from qdpi_latency import LatencyHistogram, TARGET_MS
+from qdpi_reed_solomon import QDPIReedSolomon
+from qdpi_mini_syndrome import QDPIMiniSyndrome
+from qdpi_complete_ecc import QDPICompleteECC
+
+BASELINE_FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.15
+
+CODEC_LENGTHS = [64, 1024, 16384]
+BLOCK_LENGTHS = [16, 223]
+STREAM_LENGTHS = [1024, 16384]
+SYNDROME_LENGTHS = [16, 256, 4096]
+ERROR_RATES = [0.0, 0.001, 0.005, 0.01]
+BURST_LENGTHS = [16, 64]
+
+@dataclass
+class BenchmarkCase:
+    """One named benchmark: `prepare` builds an input, `run` is the timed call"""
+    name: str
+    component: str
+    payload_bytes: int
+    prepare: Callable[[], Any]
+    run: Callable[[Any], bool]
+    params: Dict[str, Any]
+
+def _random_bytes(length: int) -> bytes:
+    return bytes(random.randrange(256) for _ in range(length))
+
+def _codex_cases() -> List[BenchmarkCase]:
+    """Bulk glyph-array encode/decode round trips"""
+    # Imported here so ECC-only runs don't pull in the backend's chromadb dependency
+    from backend.app.qdpi import QDPICodex
+    codex = QDPICodex()
+
+    cases = []
+    for length in CODEC_LENGTHS:
+        def run(data: bytes) -> bool:
+            return codex.decode_glyphs(codex.encode_glyphs(data)) == data
+        cases.append(BenchmarkCase(
+            name=f"codex.round_trip.len{length}",
+            component='QDPICodex',
+            payload_bytes=length,
+            prepare=lambda length=length: _random_bytes(length),
+            run=run,
+            params={'length': length}
+        ))
+    return cases
+
+def _reed_solomon_cases() -> List[BenchmarkCase]:
+    """Single-block decode under random bit errors, framed decode under bursts"""
+    rs = QDPIReedSolomon()
+    cases = []
+
+    for length in BLOCK_LENGTHS:
+        for error_rate in ERROR_RATES:
+            def prepare(length=length, error_rate=error_rate):
+                data = _random_bytes(length)
+                block = rs.encode_sequence(data)
+                return data, rs.simulate_transmission_errors(block, error_rate)
+            def run(item) -> bool:
+                data, corrupted = item
+                recovered, stats = rs.decode_block(corrupted, len(data))
+                return recovered == data
+            cases.append(BenchmarkCase(
+                name=f"reed_solomon.decode_block.len{length}.ber{error_rate:g}",
+                component='QDPIReedSolomon',
+                payload_bytes=length,
+                prepare=prepare,
+                run=run,
+                params={'length': length, 'error_rate': error_rate}
+            ))
+
+    for length in STREAM_LENGTHS:
+        for burst in BURST_LENGTHS:
+            def prepare(length=length, burst=burst):
+                data = _random_bytes(length)
+                frame = rs.encode_stream(data)
+                return data, rs.simulate_burst_errors(frame, burst)
+            def run(item) -> bool:
+                data, corrupted = item
+                recovered, stats = rs.decode_stream(corrupted, len(data))
+                return recovered == data
+            cases.append(BenchmarkCase(
+                name=f"reed_solomon.decode_stream.len{length}.burst{burst}",
+                component='QDPIReedSolomon',
+                payload_bytes=length,
+                prepare=prepare,
+                run=run,
+                params={'length': length, 'burst_length': burst,
+                        'interleave_depth': rs.interleave_depth}
+            ))
+
+    for length in STREAM_LENGTHS:
+        cases.append(BenchmarkCase(
+            name=f"reed_solomon.encode_stream.len{length}",
+            component='QDPIReedSolomon',
+            payload_bytes=length,
+            prepare=lambda length=length: _random_bytes(length),
+            run=lambda data: len(rs.encode_stream(data).encoded) > 0,
+            params={'length': length}
+        ))
+    return cases
+
+def _mini_syndrome_cases() -> List[BenchmarkCase]:
+    """Viterbi orientation correction with single-bit rotation flips"""
+    syndrome = QDPIMiniSyndrome()
+    cases = []
+
+    for length in SYNDROME_LENGTHS:
+        for error_rate in ERROR_RATES:
+            def prepare(length=length, error_rate=error_rate):
+                glyphs = [random.randrange(256) for _ in range(length)]
+                # Per-bit rate scaled to a per-glyph chance of one rotation flip
+                for pos in range(length):
+                    if random.random() < error_rate * 8:
+                        glyphs[pos] ^= 1 << random.randint(0, 1)
+                return glyphs
+            def run(glyphs) -> bool:
+                corrected, errors = syndrome.correct_sequence(glyphs)
+                return len(corrected) == len(glyphs)
+            cases.append(BenchmarkCase(
+                name=f"mini_syndrome.correct.len{length}.ber{error_rate:g}",
+                component='QDPIMiniSyndrome',
+                payload_bytes=length,
+                prepare=prepare,
+                run=run,
+                params={'length': length, 'error_rate': error_rate}
+            ))
+    return cases
+
+def _complete_ecc_cases() -> List[BenchmarkCase]:
+    """Full two-tier decode, the path held to the 4ms target"""
+    ecc = QDPICompleteECC()
+    cases = []
+
+    for length in BLOCK_LENGTHS:
+        for error_rate in ERROR_RATES:
+            def prepare(length=length, error_rate=error_rate):
+                data = _random_bytes(length)
+                protected = ecc.encode_with_protection(data)
+                corrupted = ecc.reed_solomon.simulate_transmission_errors(
+                    protected.reed_solomon_block, error_rate
+                )
+                return data, corrupted
+            def run(item) -> bool:
+                data, corrupted = item
+                recovered, stats = ecc.decode_with_correction(corrupted, len(data))
+                return recovered == data
+            cases.append(BenchmarkCase(
+                name=f"complete_ecc.decode.len{length}.ber{error_rate:g}",
+                component='QDPICompleteECC',
+                payload_bytes=length,
+                prepare=prepare,
+                run=run,
+                params={'length': length, 'error_rate': error_rate}
+            ))
+    return cases
+
+def build_cases(components: Optional[List[str]] = None) -> List[BenchmarkCase]:
+    """All benchmark cases, optionally limited to some components"""
+    builders = {
+        'codex': _codex_cases,
+        'reed_solomon': _reed_solomon_cases,
+        'mini_syndrome': _mini_syndrome_cases,
+        'complete_ecc': _complete_ecc_cases
+    }
+    cases = []
+    for key, builder in builders.items():
+        if components is None or key in components:
+            cases.extend(builder())
+    return cases
+
+def run_case(case: BenchmarkCase, iterations: int, warmup: int) -> Dict[str, Any]:
+    """Time `iterations` calls on fresh inputs; only the run call is timed"""
+    inputs = [case.prepare() for _ in range(warmup + iterations)]
+    for item in inputs[:warmup]:
+        case.run(item)
+
+    histogram = LatencyHistogram()
+    successes = 0
+    busy = 0.0
+    for item in inputs[warmup:]:
+        start = time.perf_counter()
+        ok = case.run(item)
+        elapsed = time.perf_counter() - start
+        histogram.record(elapsed)
+        busy += elapsed
+        successes += bool(ok)
+
+    snapshot = histogram.snapshot()
+    return {
+        'component': case.component,
+        'params': case.params,
+        'iterations': iterations,
+        'ops_per_sec': iterations / busy if busy else 0.0,
+        'mb_per_sec': iterations * case.payload_bytes / busy / 1e6 if busy else 0.0,
+        'p50_ms': snapshot['p50_ms'],
+        'p99_ms': snapshot['p99_ms'],
+        'max_ms': snapshot['max_ms'],
+        'under_target_percent': snapshot['under_target_percent'],
+        'success_rate': successes / iterations
+    }
+
+def run_suite(iterations: int = 200, warmup: int = 20, seed: int = 2025,
+              components: Optional[List[str]] = None, verbose: bool = True) -> Dict[str, Any]:
+    """Run every case and return a machine-readable results document"""
+    random.seed(seed)
+    results = {}
+    for case in build_cases(components):
+        results[case.name] = run_case(case, iterations, warmup)
+        if verbose:
+            r = results[case.name]
+            print(f"{case.name:<52} {r['ops_per_sec']:>11.1f} ops/s  "
+                  f"p99 {r['p99_ms']:>8.3f}ms  ok {r['success_rate'] * 100:5.1f}%")
+
+    return {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine()
+        },
+        'config': {'iterations': iterations, 'warmup': warmup, 'seed': seed,
+                   'target_ms': TARGET_MS},
+        'results': results
+    }
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """Regressions of current against baseline, one entry per failing metric
+
+    Throughput regresses when it drops below (1 - threshold) of the baseline;
+    p99 latency regresses when it exceeds (1 + threshold) of the baseline.
+    Cases missing on either side are skipped.
+    """
+    regressions = []
+    for name, base in baseline.get('results', {}).items():
+        now = current.get('results', {}).get(name)
+        if now is None:
+            continue
+
+        if base['ops_per_sec'] > 0 and now['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append({
+                'case': name,
+                'metric': 'ops_per_sec',
+                'baseline': base['ops_per_sec'],
+                'current': now['ops_per_sec'],
+                'change_percent': (now['ops_per_sec'] / base['ops_per_sec'] - 1) * 100
+            })
+        if base['p99_ms'] > 0 and now['p99_ms'] > base['p99_ms'] * (1 + threshold):
+            regressions.append({
+                'case': name,
+                'metric': 'p99_ms',
+                'baseline': base['p99_ms'],
+                'current': now['p99_ms'],
+                'change_percent': (now['p99_ms'] / base['p99_ms'] - 1) * 100
+            })
+    return regressions
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        results = json.load(f)
+    if results.get('format_version') != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark format in {path}: {results.get('format_version')}")
+    return results
+
+def save_results(results: Dict[str, Any], path: str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="QDPI codec and ECC benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name in ('run', 'compare'):
+        sub = subparsers.add_parser(name)
+        sub.add_argument('--iterations', type=int, default=200)
+        sub.add_argument('--warmup', type=int, default=20)
+        sub.add_argument('--seed', type=int, default=2025)
+        sub.add_argument('--component', action='append', dest='components',
+                         choices=['codex', 'reed_solomon', 'mini_syndrome', 'complete_ecc'])
+        sub.add_argument('--output', help="Write results JSON to this path")
+        if name == 'compare':
+            sub.add_argument('baseline', help="Baseline results JSON")
+            sub.add_argument('--current', help="Compare this results JSON instead of rerunning")
+            sub.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare' and args.current:
+        current = load_results(args.current)
+    else:
+        current = run_suite(args.iterations, args.warmup, args.seed, args.components)
+    if args.output:
+        save_results(current, args.output)
+
+    if args.command == 'run':
+        return 0
+
+    regressions = compare_results(load_results(args.baseline), current, args.threshold)
+    if not regressions:
+        print(f"\n✅ No regressions beyond {args.threshold * 100:.0f}%")
+        return 0
+
+    print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold * 100:.0f}%:")
+    for r in regressions:
+        print(f"   {r['case']} {r['metric']}: {r['baseline']:.3f} → {r['current']:.3f} "
+              f"({r['change_percent']:+.1f}%)")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
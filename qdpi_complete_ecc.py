@@ -15,10 +15,13 @@ Based on QDPI documentation requirements:
 
 from qdpi_reed_solomon import QDPIReedSolomon, QDPIBlock
 from qdpi_mini_syndrome import QDPIMiniSyndrome, OrientationError
-from typing import List, Tuple, Dict, Any
+from qdpi_latency import LatencyHistogram
+from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
 import time
 
+import numpy as np
+
 @dataclass 
 class QDPIProtectedSequence:
     """A QDPI sequence with complete error protection"""
@@ -32,13 +35,18 @@ class QDPIProtectedSequence:
 class QDPICompleteECC:
     """Complete two-tier error correction for QDPI sequences"""
     
-    def __init__(self):
+    def __init__(self, erasure_threshold: float = 0.5, max_erasures: Optional[int] = None):
         self.reed_solomon = QDPIReedSolomon()
         self.mini_syndrome = QDPIMiniSyndrome()
         
-        # Performance tracking
-        self.encode_times = []
-        self.decode_times = []
+        # Glyphs whose received rotation has confidence below the threshold become
+        # RS erasure hints; guesses are capped so half the parity stays for unknown errors
+        self.erasure_threshold = erasure_threshold
+        self.max_erasures = self.reed_solomon.parity_size // 2 if max_erasures is None else max_erasures
+        
+        # Performance tracking (bounded memory)
+        self.encode_latency = LatencyHistogram()
+        self.decode_latency = LatencyHistogram()
         self.total_sequences_processed = 0
         
     def encode_with_protection(self, symbol_sequence: bytes, block_id: int = 0) -> QDPIProtectedSequence:
@@ -58,7 +66,7 @@ class QDPICompleteECC:
         overhead_bytes = protected_size - original_size
         
         encode_time = (time.time() - start_time) * 1000
-        self.encode_times.append(encode_time / 1000)
+        self.encode_latency.record(encode_time / 1000)
         
         return QDPIProtectedSequence(
             original_data=symbol_sequence,
@@ -78,20 +86,30 @@ class QDPICompleteECC:
         # Step 1: Apply Reed-Solomon outer code correction
         rs_recovered, rs_stats = self.reed_solomon.decode_block(corrupted_block, original_length)
         
-        # Step 2: Apply mini-syndrome orientation correction
-        symbol_sequence = list(rs_recovered)
-        ms_corrected_sequence, orientation_errors = self.mini_syndrome.correct_with_reference(
-            symbol_sequence, symbol_sequence  # For now, use same sequence as reference
-        )
+        # Step 2: Beyond error capacity, retry with mini-syndrome erasure hints
+        erasures = []
+        erasure_assisted = False
+        if not rs_stats['correction_successful']:
+            erasures = self.find_erasures(corrupted_block, original_length)
+            if erasures:
+                retry_recovered, retry_stats = self.reed_solomon.decode_block(
+                    corrupted_block, original_length, erasures=erasures
+                )
+                if retry_stats['correction_successful']:
+                    rs_recovered, rs_stats = retry_recovered, retry_stats
+                    erasure_assisted = True
         
-        # In a real implementation, we would use context or semantic analysis
-        # For demonstration, we'll show the capability
+        # Step 3: Report which RS repairs were orientation-only flips
+        received_sequence = list(corrupted_block[:original_length])
+        _, orientation_errors = self.mini_syndrome.correct_with_reference(
+            received_sequence, list(rs_recovered)
+        )
         
-        final_sequence = bytes(ms_corrected_sequence)
+        final_sequence = bytes(rs_recovered)
         
         # Combine statistics
         decode_time = (time.time() - start_time) * 1000
-        self.decode_times.append((time.time() - start_time))
+        self.decode_latency.record(decode_time / 1000)
         
         combined_stats = {
             'reed_solomon': rs_stats,
@@ -108,6 +126,11 @@ class QDPICompleteECC:
                     } for err in orientation_errors
                 ]
             },
+            'erasure_decoding': {
+                'attempted': bool(erasures),
+                'erasures': len(erasures),
+                'successful': erasure_assisted
+            },
             'total_decode_time_ms': decode_time,
             'protection_successful': rs_stats['correction_successful'],
             'meets_4ms_target': decode_time < 4.0
@@ -117,6 +140,32 @@ class QDPICompleteECC:
         
         return final_sequence, combined_stats
     
+    def find_erasures(self, corrupted_block: bytes, original_length: int) -> List[int]:
+        """RS erasure positions: non-zero padding bytes, then low-confidence glyphs"""
+        codeword = np.frombuffer(corrupted_block, dtype=np.uint8)
+        data_size = len(codeword) - self.reed_solomon.parity_size
+        
+        # Padding is known to be zero, so any non-zero padding byte is a certain error
+        padding = (original_length + np.flatnonzero(codeword[original_length:data_size])).tolist()
+        padding = padding[:self.reed_solomon.parity_size]
+        
+        budget = self.max_erasures - len(padding)
+        if budget <= 0:
+            return padding
+        suspects = self.mini_syndrome.find_erasures(
+            codeword[:original_length], self.erasure_threshold, budget
+        )
+        return padding + suspects
+        
+    def latency_histograms(self) -> Dict[str, LatencyHistogram]:
+        """Latency histograms for every ECC stage, keyed by stage name"""
+        return {
+            **self.reed_solomon.latency_histograms(),
+            'mini_syndrome_correction': self.mini_syndrome.correction_latency,
+            'ecc_encode': self.encode_latency,
+            'ecc_decode': self.decode_latency
+        }
+    
     def test_complete_protection(self, sequence: bytes, error_simulation: callable) -> Dict[str, Any]:
         """Test complete protection against specified error pattern"""
         
@@ -149,12 +198,8 @@ class QDPICompleteECC:
         rs_stats = self.reed_solomon.get_performance_stats()
         ms_stats = self.mini_syndrome.get_performance_stats()
         
-        if self.decode_times:
-            avg_decode_ms = (sum(self.decode_times) / len(self.decode_times)) * 1000
-            max_decode_ms = max(self.decode_times) * 1000
-        else:
-            avg_decode_ms = 0
-            max_decode_ms = 0
+        avg_decode_ms = self.decode_latency.mean_ms()
+        max_decode_ms = self.decode_latency.max_ms()
             
         return {
             'reed_solomon_performance': rs_stats,
@@ -162,13 +207,14 @@ class QDPICompleteECC:
             'combined_performance': {
                 'avg_total_decode_ms': avg_decode_ms,
                 'max_total_decode_ms': max_decode_ms,
+                'p99_total_decode_ms': self.decode_latency.percentile_ms(99),
                 'meets_4ms_target': max_decode_ms < 4.0,
                 'sequences_processed': self.total_sequences_processed
             },
             'protection_characteristics': {
                 'outer_code': 'Reed-Solomon RS(255,223)',
                 'inner_code': 'Mini-syndrome orientation correction',
-                'error_correction_capacity': '16 byte errors per 255-byte block',
+                'error_correction_capacity': '16 byte errors (or 2*errors + erasures <= 32) per 255-byte block',
                 'orientation_correction': 'Single-bit rotation errors',
                 'typical_overhead_percent': 38
             }
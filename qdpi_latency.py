@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+QDPI Latency Histograms
+Fixed-memory streaming latency tracking for the QDPI error correction stack
+
+HDR-style log-linear buckets over microseconds: exact below 64µs, then 32
+sub-buckets per power of two (~3% relative precision) up to 60 seconds.
+Recording is O(1) and reads scan a fixed number of buckets, so memory and
+stats cost stay flat no matter how many calls are recorded.
+"""
+
+from typing import Dict, Any, Optional
+
+# QDPI decode time target
+TARGET_MS = 4.0
+
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKET_HALF = 1 << _SUB_BUCKET_BITS          # 32 sub-buckets per power of two
+_SUB_BUCKET_COUNT = _SUB_BUCKET_HALF * 2          # values below this are exact
+_MAX_TRACKABLE_US = 60_000_000                    # 60 seconds
+_BUCKET_COUNT = ((_MAX_TRACKABLE_US.bit_length() - _SUB_BUCKET_BITS - 1) + 2) * _SUB_BUCKET_HALF
+
+def _bucket_index(value_us: int) -> int:
+    """Map a microsecond value to its histogram bucket"""
+    if value_us < _SUB_BUCKET_COUNT:
+        return value_us
+    shift = value_us.bit_length() - _SUB_BUCKET_BITS - 1
+    return (shift + 1) * _SUB_BUCKET_HALF + (value_us >> shift) - _SUB_BUCKET_HALF
+
+def _bucket_upper_us(index: int) -> int:
+    """Highest microsecond value that falls in a bucket"""
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift = index // _SUB_BUCKET_HALF - 1
+    sub_bucket = index % _SUB_BUCKET_HALF + _SUB_BUCKET_HALF
+    return ((sub_bucket + 1) << shift) - 1
+
+class LatencyHistogram:
+    """Bounded streaming latency histogram for one ECC stage"""
+
+    __slots__ = ('target_ms', 'counts', 'count', 'total_us', 'min_us', 'max_us', 'under_target')
+
+    def __init__(self, target_ms: float = TARGET_MS):
+        self.target_ms = target_ms
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded values"""
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+        self.under_target = 0
+
+    def record(self, seconds: float, count: int = 1):
+        """Record a duration in seconds, optionally for several equal calls"""
+        value_us = min(max(int(seconds * 1_000_000), 0), _MAX_TRACKABLE_US)
+        self.counts[_bucket_index(value_us)] += count
+        self.count += count
+        self.total_us += value_us * count
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+        if seconds * 1000 < self.target_ms:
+            self.under_target += count
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's counts into this one"""
+        if other.count == 0:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_us += other.total_us
+        if self.min_us is None or other.min_us < self.min_us:
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        self.under_target += other.under_target
+
+    def copy(self) -> 'LatencyHistogram':
+        """Independent copy of this histogram"""
+        clone = LatencyHistogram(self.target_ms)
+        clone.merge(self)
+        return clone
+
+    def percentile_ms(self, percentile: float) -> float:
+        """Latency at a percentile (0-100), accurate to the bucket width"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_upper_us(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def mean_ms(self) -> float:
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+    def max_ms(self) -> float:
+        return self.max_us / 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary statistics for reporting"""
+        return {
+            'count': self.count,
+            'avg_ms': self.mean_ms(),
+            'min_ms': (self.min_us or 0) / 1000,
+            'p50_ms': self.percentile_ms(50),
+            'p95_ms': self.percentile_ms(95),
+            'p99_ms': self.percentile_ms(99),
+            'max_ms': self.max_ms(),
+            'target_ms': self.target_ms,
+            'under_target_percent': (self.under_target / self.count) * 100 if self.count else 100.0
+        }
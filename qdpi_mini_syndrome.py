@@ -8,12 +8,25 @@ Based on QDPI documentation:
 - Mini-syndrome detects single-bit errors in rotation
 - Hamming code approach for orientation nibble
 - Fast correction before Reed-Solomon outer code
+- Rotations decoded as hidden states with Viterbi over the whole sequence (O(n))
 """
 
 from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
+import math
 import time
 
+import numpy as np
+
+from qdpi_latency import LatencyHistogram
+
+# Stand-in for an infinite cost in the (min, +) semiring
+_BIG_COST = 1e9
+
+def _min_plus(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Batched (min, +) product of (..., 4, 4) cost matrices"""
+    return (a[..., :, :, None] + b[..., None, :, :]).min(axis=-2)
+
 @dataclass
 class OrientationError:
     """Detected orientation error in a symbol"""
@@ -23,10 +36,19 @@ class OrientationError:
     corrected_rotation: int # Corrected rotation
     confidence: float      # Correction confidence (0-1)
 
+@dataclass
+class OrientationPath:
+    """Most likely rotation sequence for a glyph array"""
+    rotation_indices: np.ndarray  # Decoded rotation index (0-3) per position
+    observed_indices: np.ndarray  # Received rotation index per position (4 = invalid glyph)
+    confidence: np.ndarray        # Posterior-style confidence (0-1) of the decoded rotation
+    path_cost: float              # Total negative log-likelihood of the path
+    received_confidence: Optional[np.ndarray] = None  # Confidence (0-1) that the received rotation is right
+
 class QDPIMiniSyndrome:
     """Mini-syndrome orientation error correction for QDPI symbols"""
     
-    def __init__(self):
+    def __init__(self, bit_error_rate: float = 0.05, flow_bias: float = 9.0):
         # Hamming code for 2-bit orientation (4 states)
         # Each rotation has a unique syndrome pattern
         self.rotation_syndromes = {
@@ -49,8 +71,16 @@ class QDPIMiniSyndrome:
         # we can correct single-bit errors
         self.error_patterns = self._generate_error_patterns()
         
-        # Performance tracking
-        self.correction_times = []
+        # Viterbi cost tables (negative log-likelihoods). Emission: each of the two
+        # orientation bits flips independently with bit_error_rate. Transition:
+        # compatible rotation pairs are flow_bias times more likely than the rest.
+        self.bit_error_rate = bit_error_rate
+        self.flow_bias = flow_bias
+        self._emission_costs = self._build_emission_costs()
+        self._transition_costs = self._build_transition_costs()
+        
+        # Performance tracking (bounded memory)
+        self.correction_latency = LatencyHistogram()
         
     def _generate_error_patterns(self) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
         """Generate single-bit error correction patterns"""
@@ -88,125 +118,159 @@ class QDPIMiniSyndrome:
         """Calculate syndrome for orientation bits"""
         return self.extract_orientation_bits(glyph_id)
         
+    def _build_emission_costs(self) -> np.ndarray:
+        """Cost of observing rotation index o (rows, 4 = invalid) given true index s (cols)"""
+        flip = -math.log(self.bit_error_rate)
+        keep = -math.log(1.0 - self.bit_error_rate)
+        costs = np.zeros((5, 4))
+        for observed in range(4):
+            for state in range(4):
+                flips = bin(observed ^ state).count('1')
+                costs[observed, state] = flips * flip + (2 - flips) * keep
+        # Invalid glyph IDs carry no orientation evidence
+        return costs
+        
+    def _build_transition_costs(self) -> np.ndarray:
+        """4x4 cost table for moving between rotation indices"""
+        weights = np.ones((4, 4))
+        for prev_index in range(4):
+            for next_index in range(4):
+                if self._rotations_are_compatible(prev_index * 90, next_index * 90):
+                    weights[prev_index, next_index] += self.flow_bias
+        return -np.log(weights / weights.sum(axis=1, keepdims=True))
+        
+    def decode_orientations(self, sequence: Any) -> OrientationPath:
+        """Viterbi decode of the most likely rotation path over a glyph ID array
+        
+        The n-1 transitions are split into ~sqrt(n) chunks. Chunk transfer matrices
+        and the forward/backward passes inside chunks are computed for all chunks
+        at once, so those Python-level loops run ~5*sqrt(n) times instead of n.
+        The backtrack composes back-pointer maps by doubling in ~log2(n) steps.
+        """
+        glyphs = np.asarray(sequence, dtype=np.int64).reshape(-1)
+        n = len(glyphs)
+        observed = np.where((glyphs >= 0) & (glyphs <= 255), glyphs % 4, 4)
+        if n == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return OrientationPath(empty, empty, np.zeros(0), 0.0, np.zeros(0))
+        
+        emission = self._emission_costs[observed]
+        
+        # Step matrices: cost of moving from state a at t-1 to state b at t, incl. emission at t
+        m = n - 1
+        chunk_len = max(1, math.isqrt(max(m - 1, 0)) + 1)
+        chunks = -(-m // chunk_len)
+        identity = np.full((4, 4), _BIG_COST)
+        np.fill_diagonal(identity, 0.0)
+        steps = np.concatenate([
+            self._transition_costs[None, :, :] + emission[1:, None, :],
+            np.broadcast_to(identity, (chunks * chunk_len - m, 4, 4))
+        ]).reshape(chunks, chunk_len, 4, 4)
+        
+        # Chunk transfer matrices, then forward/backward vectors at chunk boundaries
+        transfer = steps[:, 0]
+        for j in range(1, chunk_len):
+            transfer = _min_plus(transfer, steps[:, j])
+        heads = np.empty((chunks + 1, 4))
+        heads[0] = emission[0]
+        for k in range(chunks):
+            heads[k + 1] = (heads[k][:, None] + transfer[k]).min(axis=0)
+        tails = np.zeros((chunks + 1, 4))
+        for k in range(chunks - 1, -1, -1):
+            tails[k] = (transfer[k] + tails[k + 1][None, :]).min(axis=1)
+        
+        # Forward pass with back-pointers inside every chunk at once
+        forward = np.empty((chunks, chunk_len, 4))
+        backptr = np.empty((chunks, chunk_len, 4), dtype=np.int8)
+        current = heads[:chunks]
+        for j in range(chunk_len):
+            costs = current[:, :, None] + steps[:, j]
+            backptr[:, j] = costs.argmin(axis=1)
+            current = costs.min(axis=1)
+            forward[:, j] = current
+        
+        # Backward pass inside every chunk at once
+        backward = np.empty((chunks, chunk_len, 4))
+        current = tails[1:]
+        for j in range(chunk_len - 1, -1, -1):
+            backward[:, j] = current
+            current = (steps[:, j] + current[:, None, :]).min(axis=2)
+        
+        forward = np.concatenate([emission[:1], forward.reshape(-1, 4)[:m]])
+        backward = np.concatenate([tails[:1], backward.reshape(-1, 4)[:m]])
+        
+        # Backtrack: row t maps the state at t+1 to its best predecessor at t.
+        # Composing each row with the rows after it (doubling the span every
+        # pass) maps the final state straight to the state at every position.
+        suffix = backptr.reshape(-1, 4)[:m].astype(np.int64)
+        span = 1
+        while span < m:
+            suffix[:-span] = np.take_along_axis(suffix[:-span], suffix[span:], axis=1)
+            span *= 2
+        final_state = int(forward[-1].argmin())
+        path = np.append(suffix[:, final_state], final_state)
+        
+        # Max-marginal costs give a softmax confidence for the chosen rotation
+        marginals = forward + backward
+        positions = np.arange(n)
+        chosen = marginals[positions, path]
+        confidence = 1.0 / np.exp(-(marginals - chosen[:, None]).clip(max=50.0)).sum(axis=1)
+        
+        # Same softmax for the rotation actually received; invalid glyphs carry no doubt
+        received = marginals[positions, np.minimum(observed, 3)]
+        received_confidence = 1.0 / np.exp(-(marginals - received[:, None]).clip(max=50.0)).sum(axis=1)
+        received_confidence[observed == 4] = 1.0
+        
+        return OrientationPath(
+            rotation_indices=path,
+            observed_indices=observed,
+            confidence=confidence,
+            path_cost=float(forward[-1].min()),
+            received_confidence=received_confidence
+        )
+        
     def detect_orientation_errors(self, sequence: List[int]) -> List[OrientationError]:
         """Detect orientation errors in a sequence of glyph IDs"""
         
         start_time = time.time()
-        errors = []
-        
-        for pos, glyph_id in enumerate(sequence):
-            if glyph_id < 0 or glyph_id > 255:
-                continue  # Skip invalid glyph IDs
-                
-            # Extract symbol ID and rotation
-            symbol_id = glyph_id // 4
-            detected_rotation_index = glyph_id % 4
-            detected_rotation = detected_rotation_index * 90
-            
-            # Calculate syndrome
-            syndrome = self.calculate_syndrome(glyph_id)
-            
-            # Check if syndrome matches expected pattern
-            expected_rotation = self.syndrome_to_rotation.get(syndrome, detected_rotation)
-            
-            # For error detection, we need additional context
-            # For now, detect obvious impossible rotations or inconsistencies
-            if self._is_suspicious_rotation(symbol_id, detected_rotation, sequence, pos):
-                # Attempt correction
-                corrected_rotation = self._correct_orientation_error(
-                    symbol_id, detected_rotation, syndrome, sequence, pos
-                )
-                
-                if corrected_rotation != detected_rotation:
-                    error = OrientationError(
-                        position=pos,
-                        symbol_id=symbol_id,
-                        detected_rotation=detected_rotation,
-                        corrected_rotation=corrected_rotation,
-                        confidence=0.8  # TODO: Calculate actual confidence
-                    )
-                    errors.append(error)
+        errors = self._errors_from_path(sequence, self.decode_orientations(sequence))
         
         correction_time = time.time() - start_time
-        self.correction_times.append(correction_time)
+        self.correction_latency.record(correction_time)
         
         return errors
         
-    def _is_suspicious_rotation(self, symbol_id: int, rotation: int, sequence: List[int], pos: int) -> bool:
-        """Detect if a rotation seems suspicious based on context"""
-        
-        # 1. Check for impossible rotation values
-        if rotation not in [0, 90, 180, 270]:
-            return True
-            
-        # 2. Check for unusual patterns (e.g., all symbols same rotation)
-        if len(sequence) > 3:
-            rotations = [(gid % 4) * 90 for gid in sequence if 0 <= gid <= 255]
-            if len(set(rotations)) == 1 and len(rotations) > 2:
-                return True  # Suspicious: all same rotation
-                
-        # 3. Check for semantic flow inconsistencies
-        if pos > 0:
-            prev_rotation = (sequence[pos-1] % 4) * 90
-            if not self._rotations_are_compatible(prev_rotation, rotation):
-                return True  # Suspicious flow
-                
-        # 4. Always check for potential single-bit errors
-        # This is the key enhancement - be more aggressive about detection
-        return True  # For now, check all rotations for potential errors
-        
-    def _correct_orientation_error(self, symbol_id: int, detected_rotation: int, 
-                                 syndrome: Tuple[int, int], sequence: List[int], pos: int) -> int:
-        """Attempt to correct an orientation error"""
-        
-        # For single-bit errors, try flipping each bit and see if result makes sense
-        corrections = []
-        
-        for expected_syndrome, error_patterns in self.error_patterns.items():
-            if syndrome in error_patterns:
-                # This syndrome could be a single-bit error of expected_syndrome
-                corrected_rotation = self.syndrome_to_rotation[expected_syndrome]
-                
-                # Score this correction based on context
-                score = self._score_correction(symbol_id, corrected_rotation, sequence, pos)
-                corrections.append((corrected_rotation, score))
-        
-        # Return highest-scoring correction, or original if no good corrections
-        if corrections:
-            corrections.sort(key=lambda x: x[1], reverse=True)
-            best_correction, best_score = corrections[0]
-            
-            if best_score > 0.5:  # Threshold for accepting correction
-                return best_correction
-                
-        return detected_rotation  # No correction
-        
-    def _score_correction(self, symbol_id: int, rotation: int, sequence: List[int], pos: int) -> float:
-        """Score a potential correction based on context"""
-        
-        score = 0.5  # Base score
-        
-        # 1. Semantic consistency (placeholder)
-        # Would check if corrected symbol makes semantic sense in context
-        
-        # 2. Pattern consistency
-        # Check if correction fits common patterns
-        if rotation in [0, 90]:  # READ and ASK are common
-            score += 0.2
-            
-        # 3. Sequence flow logic
-        # Check if rotation makes sense in the flow
-        if pos > 0:
-            prev_rotation = (sequence[pos-1] % 4) * 90
-            if self._rotations_are_compatible(prev_rotation, rotation):
-                score += 0.2
-                
-        if pos < len(sequence) - 1:
-            next_rotation = (sequence[pos+1] % 4) * 90
-            if self._rotations_are_compatible(rotation, next_rotation):
-                score += 0.1
-                
-        return min(score, 1.0)
+    def glyph_confidence(self, sequence: Any) -> np.ndarray:
+        """Per-glyph confidence (0-1) that each received rotation is correct"""
+        return self.decode_orientations(sequence).received_confidence
+        
+    def find_erasures(self, sequence: Any, threshold: float = 0.5,
+                      max_erasures: Optional[int] = None) -> List[int]:
+        """Positions whose received rotation is doubtful, least confident first
+        
+        Intended as erasure hints for the Reed-Solomon outer code.
+        """
+        confidence = self.glyph_confidence(sequence)
+        suspects = np.flatnonzero(confidence < threshold)
+        suspects = suspects[np.argsort(confidence[suspects], kind='stable')]
+        if max_erasures is not None:
+            suspects = suspects[:max_erasures]
+        return suspects.tolist()
+        
+    def _errors_from_path(self, sequence: Any, path: OrientationPath) -> List[OrientationError]:
+        """Positions where the decoded rotation differs from the received one"""
+        glyphs = np.asarray(sequence, dtype=np.int64).reshape(-1)
+        positions = np.flatnonzero((path.observed_indices < 4)
+                                   & (path.rotation_indices != path.observed_indices))
+        return [
+            OrientationError(
+                position=pos,
+                symbol_id=int(glyphs[pos]) // 4,
+                detected_rotation=int(path.observed_indices[pos]) * 90,
+                corrected_rotation=int(path.rotation_indices[pos]) * 90,
+                confidence=float(path.confidence[pos])
+            ) for pos in positions.tolist()
+        ]
         
     def _rotations_are_compatible(self, rotation1: int, rotation2: int) -> bool:
         """Check if two rotations make sense in sequence"""
@@ -229,24 +293,23 @@ class QDPIMiniSyndrome:
     def correct_sequence(self, sequence: List[int]) -> Tuple[List[int], List[OrientationError]]:
         """Correct orientation errors in a glyph ID sequence"""
         
-        errors = self.detect_orientation_errors(sequence)
-        corrected_sequence = sequence.copy()
+        start_time = time.time()
+        path = self.decode_orientations(sequence)
+        errors = self._errors_from_path(sequence, path)
         
-        for error in errors:
-            # Apply correction
-            old_glyph_id = corrected_sequence[error.position]
-            symbol_id = old_glyph_id // 4
-            corrected_rotation_index = error.corrected_rotation // 90
-            new_glyph_id = symbol_id * 4 + corrected_rotation_index
-            
-            corrected_sequence[error.position] = new_glyph_id
-            
-        return corrected_sequence, errors
+        # Keep each symbol, swap in the decoded rotation
+        glyphs = np.asarray(sequence, dtype=np.int64).reshape(-1)
+        valid = path.observed_indices < 4
+        corrected = np.where(valid, glyphs - path.observed_indices + path.rotation_indices, glyphs)
+        
+        self.correction_latency.record(time.time() - start_time)
+        return corrected.tolist(), errors
         
     def correct_with_reference(self, corrupted_sequence: List[int], 
                              reference_sequence: List[int]) -> Tuple[List[int], List[OrientationError]]:
         """Correct sequence using a reference (for testing)"""
         
+        start_time = time.time()
         errors = []
         corrected_sequence = corrupted_sequence.copy()
         
@@ -271,18 +334,20 @@ class QDPIMiniSyndrome:
                     errors.append(error)
                     corrected_sequence[pos] = reference_glyph
                     
+        self.correction_latency.record(time.time() - start_time)
         return corrected_sequence, errors
         
     def get_performance_stats(self) -> Dict[str, float]:
         """Get performance statistics"""
         
-        if not self.correction_times:
+        if not self.correction_latency.count:
             return {'avg_correction_time_ms': 0, 'total_corrections': 0}
             
         return {
-            'avg_correction_time_ms': (sum(self.correction_times) / len(self.correction_times)) * 1000,
-            'max_correction_time_ms': max(self.correction_times) * 1000,
-            'total_corrections': len(self.correction_times)
+            'avg_correction_time_ms': self.correction_latency.mean_ms(),
+            'max_correction_time_ms': self.correction_latency.max_ms(),
+            'p99_correction_time_ms': self.correction_latency.percentile_ms(99),
+            'total_corrections': self.correction_latency.count
         }
 
 def test_mini_syndrome_correction():
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Stand-ins for the Cassandra driver's session, prepared statements and
+response futures, shared by the tests that talk CQL.
+"""
+
+
+class FakePrepared:
+    """Prepared statement whose bound form is a (cql, params) pair."""
+
+    def __init__(self, cql):
+        self.cql = cql
+
+    def bind(self, params):
+        return (self.cql, params)
+
+
+class FakeResponseFuture:
+    """ResponseFuture answering add_callbacks with one page of rows or an error."""
+
+    def __init__(self, rows=None, error=None):
+        self.rows = [] if rows is None else rows
+        self.error = error
+        self.has_more_pages = False
+
+    def add_callbacks(self, callback, errback):
+        if self.error:
+            errback(self.error)
+        else:
+            callback(self.rows)
+
+
+class FakeCQLSession:
+    """
+    Session that records prepared and executed statements.
+
+    Subclasses override answer() to serve results; an exception raised there
+    is raised by execute() and delivered through the errback by execute_async().
+    """
+
+    def __init__(self):
+        self.prepared = []
+        self.executed = []
+
+    def prepare(self, cql):
+        self.prepared.append(cql)
+        return FakePrepared(cql)
+
+    def answer(self, statement):
+        raise AssertionError(f"unexpected statement: {statement!r}")
+
+    def execute(self, statement, parameters=None):
+        rows = self.answer(statement)
+        self.executed.append(statement)
+        return rows
+
+    def execute_async(self, statement, parameters=None):
+        try:
+            return FakeResponseFuture(self.execute(statement, parameters))
+        except Exception as e:
+            return FakeResponseFuture(error=e)
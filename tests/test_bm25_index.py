@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental BM25 inverted index.
+"""
+
+import math
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.bm25_index import BM25Index
+
+
+class TestBM25Index(unittest.TestCase):
+    """Test scoring, posting-list intersection and incremental updates."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.docs = {
+            0: "the fox runs through the garden".split(),
+            1: "the garden is quiet".split(),
+            2: "a fox and a fox and a hound".split(),
+            3: "nothing here".split(),
+        }
+        self.index = BM25Index()
+        for doc_id, tokens in self.docs.items():
+            self.index.add(doc_id, tokens)
+
+    def _reference(self, terms, doc_id):
+        n = len(self.docs)
+        avgdl = sum(len(t) for t in self.docs.values()) / n
+        tokens = self.docs[doc_id]
+        score = 0.0
+        for term in terms:
+            df = sum(term in t for t in self.docs.values())
+            tf = tokens.count(term)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            score += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * len(tokens) / avgdl))
+        return score
+
+    def test_matches_reference_formula(self):
+        doc_ids, scores = self.index.search(['fox', 'garden'])
+
+        self.assertEqual(sorted(doc_ids.tolist()), [0, 1, 2])
+        for doc_id, score in zip(doc_ids.tolist(), scores.tolist()):
+            self.assertAlmostEqual(score, self._reference(['fox', 'garden'], doc_id), places=5)
+
+    def test_rare_terms_weigh_more(self):
+        self.assertGreater(self.index.idf('hound'), self.index.idf('the'))
+
+    def test_intersection_and_restrict(self):
+        self.assertEqual(self.index.intersect(['fox', 'garden']), {0})
+        self.assertEqual(self.index.intersect(['fox', 'missing']), set())
+
+        doc_ids, _ = self.index.search(['fox', 'garden'], require_all=True)
+        self.assertEqual(doc_ids.tolist(), [0])
+
+        doc_ids, _ = self.index.search(['fox'], restrict={2, 3})
+        self.assertEqual(doc_ids.tolist(), [2])
+
+    def test_incremental_updates(self):
+        self.index.add(1, "a fox in the garden".split())
+        self.index.remove(2)
+        del self.docs[2]
+        self.docs[1] = "a fox in the garden".split()
+
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.document_frequency('hound'), 0)
+        doc_ids, scores = self.index.search(['fox'])
+        self.assertEqual(sorted(doc_ids.tolist()), [0, 1])
+        for doc_id, score in zip(doc_ids.tolist(), scores.tolist()):
+            self.assertAlmostEqual(score, self._reference(['fox'], doc_id), places=5)
+
+    def test_empty_query(self):
+        doc_ids, scores = self.index.search([])
+        self.assertEqual(len(doc_ids), 0)
+        self.assertEqual(len(scores), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for bulk page ingest.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Mock dependencies before importing the database
+sys.modules.setdefault('cassandra', Mock())
+sys.modules.setdefault('cassandra.cluster', Mock())
+sys.modules.setdefault('cassandra.auth', Mock())
+sys.modules.setdefault('cassandra.policies', Mock())
+sys.modules.setdefault('cassandra.query', Mock())
+
+from backend.app import bulk_ingest
+from backend.app.bulk_ingest import AdaptiveWindow, BulkRowWriter, IngestReport
+from backend.app.cassandra_database_v2 import ProductionCassandraDatabase
+from backend.app.models import StoryPage
+from cql_fakes import FakeCQLSession, FakeResponseFuture
+
+
+class WriteTimeout(Exception):
+    """Stands in for the driver's WriteTimeout (matched by name)."""
+
+
+class FakeBatch:
+    def __init__(self, batch_type=None):
+        self.batch_type = batch_type
+        self.statements = []
+
+    def add(self, statement):
+        self.statements.append(statement)
+
+
+class FakeSession(FakeCQLSession):
+    """Acknowledges every request; fails the first `timeouts` of them."""
+
+    def __init__(self, timeouts=0):
+        super().__init__()
+        self.timeouts = timeouts
+
+    def answer(self, statement):
+        if self.timeouts:
+            self.timeouts -= 1
+            raise WriteTimeout("timed out")
+        return []
+
+
+class TestAdaptiveWindow(unittest.TestCase):
+    """Test additive increase / multiplicative decrease."""
+
+    def test_grows_slowly_and_halves_on_backpressure(self):
+        window = AdaptiveWindow(maximum=64, initial=16)
+        for _ in range(16):
+            window.on_success()
+        self.assertAlmostEqual(window.limit, 17, delta=0.1)
+
+        window.on_backpressure()
+        self.assertAlmostEqual(window.limit, 8.5, delta=0.1)
+
+        for _ in range(10):
+            window.on_backpressure()
+        self.assertEqual(window.limit, 1.0)
+
+    def test_never_exceeds_maximum(self):
+        window = AdaptiveWindow(maximum=4, initial=4)
+        for _ in range(100):
+            window.on_success()
+        self.assertEqual(window.limit, 4.0)
+
+
+@patch.object(bulk_ingest, 'BatchStatement', FakeBatch)
+@patch.object(bulk_ingest, 'UNSET_VALUE', 'UNSET')
+class TestBulkRowWriter(unittest.TestCase):
+    """Test partition grouping, batching and retries."""
+
+    def test_groups_rows_by_partition(self):
+        session = FakeSession()
+        writer = BulkRowWriter(session, max_batch_statements=2)
+        rows = [
+            ('pages_by_symbol', {'symbol_id': 'london-fox', 'page_type': 'primary', 'id': 'a', 'title': None}),
+            ('pages_by_symbol', {'symbol_id': 'london-fox', 'page_type': 'primary', 'id': 'b', 'title': 'B'}),
+            ('pages_by_symbol', {'symbol_id': 'london-fox', 'page_type': 'primary', 'id': 'c', 'title': 'C'}),
+            ('pages_by_symbol', {'symbol_id': 'glyph-marrow', 'page_type': 'primary', 'id': 'd', 'title': 'D'}),
+            ('story_pages', {'id': 'a', 'text': 'x'}),
+        ]
+        report = IngestReport()
+
+        asyncio.run(writer.write(rows, report))
+
+        batches = [request for request in session.executed if isinstance(request, FakeBatch)]
+        singles = [request for request in session.executed if not isinstance(request, FakeBatch)]
+        # london-fox: one batch of 2 + one single; glyph-marrow and story_pages: singles
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(singles), 3)
+        self.assertEqual(report.rows, 5)
+        self.assertEqual(report.requests, 4)
+        self.assertEqual(report.batches, 1)
+        # Missing values are left unset instead of written as null
+        first = batches[0].statements[0]
+        self.assertEqual(first[1], ['london-fox', 'primary', 'a', 'UNSET'])
+        # One prepared statement per table and column set
+        self.assertEqual(len(session.prepared), 2)
+
+    def test_retries_after_timeouts_and_shrinks_window(self):
+        session = FakeSession(timeouts=2)
+        writer = BulkRowWriter(session, max_in_flight=32, retry_delay=0)
+        report = IngestReport()
+
+        asyncio.run(writer.write([('story_pages', {'id': 'a'})], report))
+
+        self.assertEqual(len(session.executed), 1)
+        self.assertEqual(report.retries, 2)
+        self.assertLess(writer.window.limit, 8)
+
+    def test_gives_up_after_max_retries(self):
+        session = FakeSession(timeouts=10)
+        writer = BulkRowWriter(session, max_retries=2, retry_delay=0)
+
+        with self.assertRaises(WriteTimeout):
+            asyncio.run(writer.write([('story_pages', {'id': 'a'})], IngestReport()))
+
+
+@patch.object(bulk_ingest, 'BatchStatement', FakeBatch)
+@patch.object(bulk_ingest, 'UNSET_VALUE', 'UNSET')
+class TestCreatePages(unittest.TestCase):
+    """Test the bulk path of ProductionCassandraDatabase."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.db = ProductionCassandraDatabase()
+        self.db.vector_service = None
+        self.db.session = FakeSession()
+
+    def pages(self, count):
+        return [
+            StoryPage(id=f'page-{i}', symbol_id='london-fox', page_type='primary', text=f'text {i}',
+                      author='AI', section=1 + i % 2, title=f'Page {i}')
+            for i in range(count)
+        ]
+
+    def test_writes_every_table_in_few_requests(self):
+        report = asyncio.run(self.db.create_pages(self.pages(10), chunk_size=4))
+
+        self.assertEqual(report.pages, 10)
+        self.assertEqual(report.failed, [])
+        # story_pages, pages_by_symbol, pages_by_section, embeddings and recent_pages per page
+        self.assertEqual(report.rows, 50)
+        self.assertLess(report.requests, report.rows)
+        self.assertGreater(report.pages_per_second, 0)
+        tables = {cql.split()[2] for cql in self.db.session.prepared}
+        self.assertEqual(tables, {'story_pages', 'pages_by_symbol', 'pages_by_section',
+                                  'vector_embeddings_by_bucket', 'recent_pages'})
+
+    def test_failed_chunk_is_reported(self):
+        self.db.session.execute_async = Mock(return_value=FakeResponseFuture(error=ValueError("bad row")))
+
+        report = asyncio.run(self.db.create_pages(self.pages(3), chunk_size=2))
+
+        self.assertEqual(report.pages, 0)
+        self.assertEqual(report.failed, ['page-0', 'page-1', 'page-2'])
+
+    def test_embedding_row_matches_create_page(self):
+        embedding = SimpleNamespace(content_type='page', content_id='page-0', embedding=[0.1, 0.2],
+                                    model='m', metadata={'chunk': 3, 'score': 0.5, 'note': None})
+        self.db._stargate_request = AsyncMock(return_value={'id': 'page-0'})
+
+        asyncio.run(self.db._insert_vector_embedding(embedding))
+        posted = self.db._stargate_request.await_args.kwargs['data']
+        bulk = dict(self.db._page_rows(self.pages(1)[0], embedding))['vector_embeddings_by_bucket']
+
+        self.assertEqual(posted['metadata'], {'chunk': '3', 'score': '0.5'})
+        self.assertEqual({key: value for key, value in posted.items() if key != 'created_at'},
+                         {key: value for key, value in bulk.items() if key != 'created_at'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio bridge over the Cassandra driver's execute_async.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.cassandra_async import execute_async, execute_one
+
+
+class ThreadedResponseFuture:
+    """Delivers result pages from another thread, like the driver's I/O loop."""
+
+    def __init__(self, pages, error=None, delay=0.0):
+        self.pages = list(pages)
+        self.error = error
+        self.delay = delay
+        self.fetches = 0
+
+    @property
+    def has_more_pages(self):
+        return self.fetches < len(self.pages)
+
+    def add_callbacks(self, callback, errback):
+        self.callback, self.errback = callback, errback
+        self.start_fetching_next_page()
+
+    def start_fetching_next_page(self):
+        def deliver():
+            time.sleep(self.delay)
+            if self.error:
+                self.errback(self.error)
+                return
+            page = self.pages[self.fetches]
+            self.fetches += 1
+            self.callback(page)
+        threading.Thread(target=deliver).start()
+
+
+class FakeSession:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.calls = []
+
+    def execute_async(self, query, parameters=None):
+        self.calls.append((query, parameters))
+        return ThreadedResponseFuture(**self.kwargs)
+
+
+class TestExecuteAsync(unittest.TestCase):
+    """Test paging, errors and overlap of concurrent queries."""
+
+    def test_follows_all_pages(self):
+        session = FakeSession(pages=[[1, 2], [3], [4, 5]])
+
+        rows = asyncio.run(execute_async(session, "SELECT * FROM pages", ["x"]))
+
+        self.assertEqual(rows, [1, 2, 3, 4, 5])
+        self.assertEqual(session.calls, [("SELECT * FROM pages", ["x"])])
+
+    def test_execute_one_reads_first_page_only(self):
+        self.assertEqual(asyncio.run(execute_one(FakeSession(pages=[["a", "b"], ["c"]]), "q")), "a")
+        self.assertIsNone(asyncio.run(execute_one(FakeSession(pages=[[]]), "q")))
+
+    def test_errors_propagate(self):
+        session = FakeSession(pages=[[1]], error=RuntimeError("coordinator timeout"))
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(execute_async(session, "q"))
+
+    def test_concurrent_queries_overlap(self):
+        session = FakeSession(pages=[[1]], delay=0.1)
+
+        async def run():
+            started = time.perf_counter()
+            await asyncio.gather(*(execute_async(session, "q") for _ in range(10)))
+            return time.perf_counter() - started
+
+        self.assertLess(asyncio.run(run()), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
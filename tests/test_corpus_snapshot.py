@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the resident corpus snapshot behind context retrieval.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.corpus_snapshot import CorpusSnapshot
+from backend.app.cql_statements import StatementRegistry
+from cql_fakes import FakeCQLSession
+
+
+def make_row(page_id, title, content, symbol_id, embedding=None, page_index=0):
+    return SimpleNamespace(page_id=page_id, title=title, content=content,
+                           symbol_id=symbol_id, page_index=page_index, embedding=embedding)
+
+
+class FakeSession(FakeCQLSession):
+    """Answers the two prepared statements CorpusSnapshot.refresh binds."""
+
+    def __init__(self, rows, versions=None):
+        super().__init__()
+        self.rows = {row.page_id: row for row in rows}
+        self.versions = versions or {row.page_id: 1 for row in rows}
+        self.fetched = []
+
+    def answer(self, statement):
+        query, params = statement
+        if 'writetime' in query:
+            return [SimpleNamespace(page_id=page_id, content_written=self.versions[page_id],
+                                    embedding_written=self.versions[page_id])
+                    for page_id in self.rows]
+        page_ids = params[0]
+        self.fetched.extend(page_ids)
+        return [self.rows[page_id] for page_id in page_ids if page_id in self.rows]
+
+
+class TestCorpusSnapshot(unittest.TestCase):
+    """Test hybrid scoring and incremental refresh."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rows = [
+            make_row('p1', 'The Garden', 'a hedge maze full of mirrors', 'london-fox', [1.0, 0.0, 0.0]),
+            make_row('p2', 'Mirrors', 'reflections of the author', 'glyph-marrow', [0.0, 1.0, 0.0]),
+            make_row('p3', 'Silence', 'nothing happens here', 'london-fox', [0.0, 0.0, 1.0]),
+        ]
+        self.session = FakeSession(self.rows)
+        self.snapshot = CorpusSnapshot(initial_capacity=1)
+        self.statements = StatementRegistry(self.session)
+        self.snapshot.refresh(self.statements)
+
+    def test_hybrid_score_combines_bm25_and_cosine(self):
+        results = self.snapshot.search('mirrors', query_embedding=[0.0, 2.0, 0.0], top_k=5)
+
+        scores = {page.page_id: score for page, score in results}
+        title_bm25 = self.snapshot._title_index.search(['mirrors'])
+        content_bm25 = self.snapshot._content_index.search(['mirrors'])
+        # p2 (row 1): title hit weighted x2 plus cosine 1.0 weighted x5
+        self.assertAlmostEqual(scores['p2'], 2 * float(title_bm25[1][0]) + 5.0, places=5)
+        # p1 (row 0): content hit only, orthogonal embedding
+        self.assertAlmostEqual(scores['p1'], float(content_bm25[1][0]), places=5)
+        # p3 scores zero and is dropped
+        self.assertNotIn('p3', scores)
+        self.assertEqual(results[0][0].page_id, 'p2')
+
+    def test_symbol_filter(self):
+        results = self.snapshot.search('mirrors', query_embedding=[0.0, 1.0, 0.0],
+                                       symbol_id='london-fox', top_k=5)
+
+        self.assertEqual([page.page_id for page, _ in results], ['p1'])
+        self.assertEqual(self.snapshot.search('mirrors', symbol_id='unknown'), [])
+
+    def test_dimension_mismatch_falls_back_to_keywords(self):
+        results = self.snapshot.search('silence', query_embedding=[1.0] * 8, top_k=5)
+
+        self.assertEqual([page.page_id for page, _ in results], ['p3'])
+        self.assertGreater(results[0][1], 0)
+
+    def test_refresh_fetches_only_changes(self):
+        self.session.rows['p2'] = make_row('p2', 'Echoes', 'a new draft', 'glyph-marrow', [0.0, 1.0, 0.0])
+        self.session.versions['p2'] = 2
+        self.session.rows['p4'] = make_row('p4', 'Tunnels', 'mirrors underground', 'princhetta')
+        self.session.versions['p4'] = 1
+        del self.session.rows['p3']
+        self.session.fetched = []
+
+        stats = self.snapshot.refresh(self.statements)
+
+        self.assertEqual(stats, {'added': 1, 'updated': 1, 'removed': 1})
+        self.assertEqual(sorted(self.session.fetched), ['p2', 'p4'])
+        self.assertEqual(len(self.snapshot), 3)
+        # Each statement was prepared once across both refreshes
+        self.assertEqual(len(self.session.prepared), 2)
+
+        ids = {page.page_id for page, _ in self.snapshot.search('mirrors', top_k=5)}
+        self.assertEqual(ids, {'p1', 'p4'})
+        self.assertEqual(self.snapshot.search('silence'), [])
+
+    def test_matches_brute_force_at_scale(self):
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(300, 16)).astype(np.float32)
+        snapshot = CorpusSnapshot(initial_capacity=8)
+        for i, vector in enumerate(vectors):
+            snapshot.upsert(make_row(f"p{i}", f"title {i}", f"page {i}", f"s{i % 4}", vector.tolist()))
+
+        query = rng.normal(size=16).astype(np.float32)
+        results = snapshot.search('unmatched', query.tolist(), symbol_id='s1', top_k=4)
+
+        rows = np.arange(1, 300, 4)
+        normed = vectors[rows] / np.linalg.norm(vectors[rows], axis=1, keepdims=True)
+        expected = 5 * normed @ (query / np.linalg.norm(query))
+        expected_ids = [f"p{rows[i]}" for i in np.argsort(-expected) if expected[i] > 0][:4]
+        self.assertEqual([page.page_id for page, _ in results], expected_ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incrementally maintained corpus statistics.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.corpus_stats import CorpusStats, STATS_SCOPE, reconcile, record_ingest
+from backend.app.cql_statements import DEFAULT_STATEMENTS, RECONCILE_STATEMENTS, StatementRegistry
+from cql_fakes import FakeCQLSession
+
+
+class FakeCounterSession(FakeCQLSession):
+    """Keeps corpus_stats counters in a dict and serves a fixed pages table."""
+
+    def __init__(self, pages=()):
+        super().__init__()
+        self.pages = list(pages)
+        self.counters = {}
+        self.lease = None
+
+    def answer(self, statement):
+        query, params = statement
+        if 'INSERT INTO corpus_stats_lease' in query:
+            applied = self.lease is None
+            if applied:
+                self.lease = params[1]
+            return SimpleNamespace(was_applied=applied)
+        if 'DELETE FROM corpus_stats_lease' in query:
+            if self.lease == params[1]:
+                self.lease = None
+            return SimpleNamespace(was_applied=True)
+        if 'UPDATE corpus_stats' in query:
+            pages, tokens, embedded, scope, symbol_id = params
+            current = self.counters.get((scope, symbol_id), (0, 0, 0))
+            self.counters[(scope, symbol_id)] = (current[0] + pages, current[1] + tokens, current[2] + embedded)
+            return []
+        if 'FROM corpus_stats' in query:
+            return [SimpleNamespace(symbol_id=symbol_id, pages=p, tokens=t, embedded=e)
+                    for (scope, symbol_id), (p, t, e) in self.counters.items() if scope == params[0]]
+        if 'FROM pages' in query:
+            return self.pages
+        return super().answer(statement)
+
+
+def page(symbol_id, tokens, embedded=True):
+    return SimpleNamespace(symbol_id=symbol_id, tokens=tokens, embedding_written=1 if embedded else None)
+
+
+class TestCorpusStats(unittest.TestCase):
+    """Test ingest counters, loading, reconciling and in-memory reads."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.session = FakeCounterSession([
+            page('london-fox', 100),
+            page('london-fox', 50, embedded=False),
+            page('jacklyn-variance', 30),
+            page(None, 10)
+        ])
+        self.statements = StatementRegistry(self.session)
+        self.reconcile_statements = StatementRegistry(self.session, {**DEFAULT_STATEMENTS, **RECONCILE_STATEMENTS})
+        self.stats = CorpusStats()
+
+    def test_load_never_scans_pages(self):
+        self.stats.load(self.statements)
+
+        self.assertEqual(self.stats.get_stats()['total_pages'], 0)
+        self.assertIsNotNone(self.stats.get_stats()['loaded_at'])
+        self.assertTrue(all('FROM pages' not in query for query, _ in self.session.executed))
+
+    def test_reconcile_counts_existing_corpus(self):
+        reconcile(self.reconcile_statements)
+        self.stats.load(self.statements)
+
+        result = self.stats.get_stats()
+        self.assertEqual(result['total_pages'], 4)
+        self.assertEqual(result['total_tokens'], 190)
+        self.assertEqual(result['embedded_pages'], 3)
+        self.assertAlmostEqual(result['embedding_coverage'], 0.75)
+        self.assertEqual(result['pages_by_character'], {'london-fox': 2, 'jacklyn-variance': 1})
+        self.assertEqual(self.session.counters[(STATS_SCOPE, 'london-fox')], (2, 150, 1))
+        self.assertIsNone(self.session.lease)
+
+    def test_reconcile_adds_only_the_difference(self):
+        # One of the pages was recorded by an ingest before the reconcile ran
+        record_ingest(self.statements, 'jacklyn-variance', 30, True)
+        reconcile(self.reconcile_statements)
+        reconcile(self.reconcile_statements)
+        self.stats.load(self.statements)
+
+        self.assertEqual(self.stats.get_stats()['total_pages'], 4)
+        self.assertEqual(self.session.counters[(STATS_SCOPE, 'jacklyn-variance')], (1, 30, 1))
+
+    def test_reconcile_refuses_while_leased(self):
+        self.session.lease = 'another-worker'
+
+        with self.assertRaises(RuntimeError):
+            reconcile(self.reconcile_statements)
+        self.assertEqual(self.session.counters, {})
+        self.assertEqual(self.session.lease, 'another-worker')
+
+    def test_ingest_is_visible_after_reload(self):
+        reconcile(self.reconcile_statements)
+        self.stats.load(self.statements)
+        record_ingest(self.statements, 'london-fox', 20, True)
+        record_ingest(self.statements, 'glyph-marrow', 5, False)
+
+        self.assertEqual(self.stats.get_stats()['total_pages'], 4)
+        self.stats.load(self.statements)
+
+        result = self.stats.get_stats()
+        self.assertEqual(result['total_pages'], 6)
+        self.assertEqual(result['total_tokens'], 215)
+        self.assertEqual(result['pages_by_character']['london-fox'], 3)
+        self.assertEqual(result['pages_by_character']['glyph-marrow'], 1)
+
+    def test_record_page_updates_rollup_in_place(self):
+        self.stats.record_page('london-fox', 40, True)
+        self.stats.record_page('london-fox', 40, True)
+        self.stats.record_page('london-fox', 40, True, sign=-1)
+
+        result = self.stats.get_stats()
+        self.assertEqual(result['total_pages'], 1)
+        self.assertEqual(result['total_tokens'], 40)
+        self.assertEqual(result['pages_by_character'], {'london-fox': 1})
+        self.assertIsNone(result['loaded_at'])
+
+    def test_empty_corpus(self):
+        session = FakeCounterSession()
+        stats = CorpusStats()
+        stats.load(StatementRegistry(session))
+
+        result = stats.get_stats()
+        self.assertEqual(result['total_pages'], 0)
+        self.assertEqual(result['embedding_coverage'], 0.0)
+        self.assertIsNotNone(result['loaded_at'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the prepared-statement registry.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.cql_statements import DEFAULT_STATEMENTS, StatementRegistry
+
+
+class TestStatementRegistry(unittest.TestCase):
+    """Test one-time preparation, binding and re-preparation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.session = Mock()
+        self.session.prepare.side_effect = lambda cql: Mock(cql=cql)
+        self.registry = StatementRegistry(self.session)
+
+    def test_prepare_all_at_connect(self):
+        failures = self.registry.prepare_all()
+
+        self.assertEqual(failures, {})
+        self.assertEqual(self.session.prepare.call_count, len(DEFAULT_STATEMENTS))
+
+        # Binding reuses the prepared handle
+        bound = self.registry.bind('pages.read', ['001-page'])
+        self.assertEqual(self.session.prepare.call_count, len(DEFAULT_STATEMENTS))
+        self.registry.get('pages.read').bind.assert_called_once_with(['001-page'])
+        self.assertIs(bound, self.registry.get('pages.read').bind.return_value)
+
+    def test_lazy_prepare_on_first_bind(self):
+        self.registry.bind('pages.exists', ['a'])
+        self.registry.bind('pages.exists', ['b'])
+
+        self.assertEqual(self.session.prepare.call_count, 1)
+        self.assertIn('WHERE page_id = ?', self.session.prepare.call_args[0][0])
+
+    def test_failed_prepare_is_reported_not_fatal(self):
+        def prepare(cql):
+            if 'ANN OF' in cql:
+                raise Exception("vector search not supported")
+            return Mock()
+
+        self.session.prepare.side_effect = prepare
+        failures = self.registry.prepare_all()
+
+        self.assertEqual(set(failures), {'pages.search', 'pages.search_by_symbol'})
+        with self.assertRaises(Exception):
+            self.registry.prepare_all(strict=True)
+
+    def test_reprepares_when_host_comes_up(self):
+        cluster = Mock()
+        self.registry.listen(cluster)
+        cluster.register_listener.assert_called_once_with(self.registry)
+
+        self.registry.prepare_all()
+        self.registry.on_up('10.0.0.2')
+
+        self.assertEqual(self.session.prepare.call_count, 2 * len(DEFAULT_STATEMENTS))
+
+    def test_register_replaces_statement(self):
+        self.registry.bind('pages.read', ['x'])
+        self.registry.register('pages.read', "SELECT page_id FROM pages WHERE page_id = ?")
+        self.registry.bind('pages.read', ['x'])
+
+        self.assertEqual(self.session.prepare.call_count, 2)
+        self.assertEqual(self.session.prepare.call_args[0][0], "SELECT page_id FROM pages WHERE page_id = ?")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the request-coalescing embedding batcher.
+"""
+
+import asyncio
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.embedding_batcher import EmbeddingBatcher, EmbeddingQueueFull
+
+
+class TestEmbeddingBatcher(unittest.TestCase):
+    """Test batching, error propagation and backpressure."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.batches = []
+
+    def _encode(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def test_concurrent_requests_share_batches(self):
+        batcher = EmbeddingBatcher(self._encode, max_batch_size=8, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(*(batcher.embed("x" * i) for i in range(20)))
+
+        results = asyncio.run(run())
+        batcher.shutdown()
+
+        self.assertEqual(results, [[float(i), 1.0] for i in range(20)])
+        self.assertLess(len(self.batches), 20)
+        self.assertTrue(all(len(batch) <= 8 for batch in self.batches))
+        stats = batcher.get_stats()
+        self.assertEqual(stats['requests'], 20)
+        self.assertEqual(stats['batches'], len(self.batches))
+        self.assertGreater(stats['mean_batch_size'], 1.0)
+        self.assertEqual(sum(size * n for size, n in stats['batch_size_histogram'].items()), 20)
+
+    def test_encode_errors_reach_every_caller(self):
+        def failing(texts):
+            raise ValueError("model exploded")
+
+        batcher = EmbeddingBatcher(failing, max_wait_ms=10)
+
+        async def run():
+            return await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+        results = asyncio.run(run())
+        batcher.shutdown()
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(batcher.get_stats()['failed_batches'], batcher.get_stats()['batches'])
+
+    def test_bounded_queue_rejects(self):
+        release = threading.Event()
+
+        def blocking(texts):
+            release.wait(5)
+            return [[0.0] for _ in texts]
+
+        batcher = EmbeddingBatcher(blocking, max_batch_size=1, max_wait_ms=0, max_queue=2)
+
+        async def run():
+            first = asyncio.ensure_future(batcher.embed("busy"))
+            await asyncio.sleep(0.05)  # inference thread is now blocked on "busy"
+            queued = [asyncio.ensure_future(batcher.embed(f"q{i}")) for i in range(2)]
+            await asyncio.sleep(0)
+            with self.assertRaises(EmbeddingQueueFull):
+                await batcher.embed("overflow")
+            release.set()
+            return await asyncio.gather(first, *queued)
+
+        results = asyncio.run(run())
+        batcher.shutdown()
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(batcher.get_stats()['rejected'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
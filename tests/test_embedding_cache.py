@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared embedding cache.
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Mock dependencies before importing the call sites
+for _module in ('cassandra', 'cassandra.cluster', 'cassandra.auth', 'cassandra.policies', 'cassandra.query',
+                'openai', 'sentence_transformers', 'sklearn', 'sklearn.metrics', 'sklearn.metrics.pairwise'):
+    sys.modules.setdefault(_module, Mock())
+
+from backend.app import retrieval_api, vector_service
+from backend.app.embedding_cache import MAX_EMBED_CHARS, EmbeddingCache, cache_key
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test keying, LRU eviction and the persistent tier."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.calls = []
+
+    def _encode(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 1.0, -0.5]
+
+    def test_keys_normalize_whitespace_and_separate_models(self):
+        self.assertEqual(cache_key('m', 'hello   world '), cache_key('m', ' hello world'))
+        self.assertNotEqual(cache_key('m', 'hello'), cache_key('other', 'hello'))
+        self.assertNotEqual(cache_key('m', 'hello'), cache_key('m', 'Hello'))
+
+    def test_keys_use_canonical_model_and_embedded_text(self):
+        self.assertEqual(cache_key('all-MiniLM-L6-v2', 'fox'),
+                         cache_key('sentence-transformers/all-MiniLM-L6-v2', 'fox'))
+        self.assertTrue(cache_key('text-embedding-3-small', 'fox').startswith('text-embedding-3-small:'))
+        long_text = 'x' * MAX_EMBED_CHARS
+        self.assertEqual(cache_key('m', long_text + 'tail'), cache_key('m', long_text))
+
+    def test_compute_sees_the_capped_text(self):
+        cache = EmbeddingCache()
+
+        cache.get_or_compute('m', '  the fox ' + 'x' * MAX_EMBED_CHARS, self._encode)
+
+        self.assertEqual(len(self.calls[0]), MAX_EMBED_CHARS)
+        self.assertTrue(self.calls[0].startswith('the fox x'))
+
+    def test_repeat_queries_skip_the_model(self):
+        cache = EmbeddingCache(max_entries=10)
+
+        first = cache.get_or_compute('m', 'the fox', self._encode)
+        second = cache.get_or_compute('m', 'the  fox', self._encode)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, ['the fox'])
+        self.assertEqual(cache.get_stats()['hits'], 1)
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put('m', 'a', [1.0])
+        cache.put('m', 'b', [2.0])
+        cache.get('m', 'a')
+        cache.put('m', 'c', [3.0])
+
+        self.assertIsNone(cache.get('m', 'b'))
+        self.assertEqual(cache.get('m', 'a'), [1.0])
+        self.assertEqual(cache.get('m', 'c'), [3.0])
+
+    def test_async_compute(self):
+        cache = EmbeddingCache()
+
+        async def encode(text):
+            return self._encode(text)
+
+        result = asyncio.run(cache.aget_or_compute('m', 'query', encode))
+        again = asyncio.run(cache.aget_or_compute('m', 'query', encode))
+
+        self.assertEqual(result, again)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(disk_path=tmp)
+            vector = np.linspace(-1, 1, 384).astype(np.float32)
+            cache.put('m', 'persisted', vector)
+            cache.put('m', 'short', [0.25, 0.5])
+            cache.close()
+
+            reopened = EmbeddingCache(disk_path=tmp)
+            np.testing.assert_array_equal(reopened.get('m', 'persisted'), vector)
+            self.assertEqual(reopened.get('m', 'short'), [0.25, 0.5])
+            self.assertEqual(reopened.get_stats()['disk_hits'], 2)
+            reopened.close()
+
+    def test_disk_ring_overwrites_oldest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(max_entries=1, disk_path=tmp, disk_entries=2)
+            for i in range(3):
+                cache.put('m', f"text {i}", [float(i)])
+            cache.close()
+
+            reopened = EmbeddingCache(disk_path=tmp, disk_entries=2)
+            self.assertIsNone(reopened.get('m', 'text 0'))
+            self.assertEqual(reopened.get('m', 'text 1'), [1.0])
+            self.assertEqual(reopened.get('m', 'text 2'), [2.0])
+
+            # Writes continue from the persisted cursor
+            reopened.put('m', 'text 3', [3.0])
+            reopened.clear()
+            self.assertIsNone(reopened.get('m', 'text 1'))
+            self.assertEqual(reopened.get('m', 'text 2'), [2.0])
+            reopened.close()
+
+    def test_caches_sharing_a_directory_keep_their_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = EmbeddingCache(disk_path=tmp, disk_entries=4)
+            second = EmbeddingCache(disk_path=tmp, disk_entries=4)
+            first.put('m', 'hello', [1.0, 1.0])
+            second.put('m', 'world', [2.0, 2.0])
+            first.clear()
+            second.clear()
+
+            self.assertEqual(first.get('m', 'hello'), [1.0, 1.0])
+            self.assertEqual(first.get('m', 'world'), [2.0, 2.0])
+            self.assertEqual(second.get('m', 'hello'), [1.0, 1.0])
+
+            # A new embedding size written by one process is found by the other
+            second.put('m', 'wide', [3.0, 3.0, 3.0])
+            self.assertEqual(first.get('m', 'wide'), [3.0, 3.0, 3.0])
+            first.close()
+            second.close()
+
+    def test_concurrent_writer_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with multiprocessing.get_context('spawn').Pool(2) as pool:
+                pool.starmap(_write_embeddings, [(tmp, 'a'), (tmp, 'b')])
+
+            cache = EmbeddingCache(disk_path=tmp, disk_entries=64)
+            for prefix in ('a', 'b'):
+                for i in range(20):
+                    self.assertEqual(cache.get('m', f"{prefix} {i}"), [float(i), float(ord(prefix))])
+            self.assertEqual(cache.get_stats()['disk_entries'], 40)
+            cache.close()
+
+
+class TestSharedCallSites(unittest.TestCase):
+    """Test that embedding call sites share cache entries for the same model."""
+
+    def test_vector_service_and_retrieval_api_share_entries(self):
+        cache = EmbeddingCache()
+        local_model = Mock()
+        service = vector_service.VectorEmbeddingService()
+        service._embed_sbert = AsyncMock(return_value=[0.5, 0.25])
+
+        with patch.object(vector_service, 'get_embedding_cache', return_value=cache), \
+                patch.object(retrieval_api, 'get_embedding_cache', return_value=cache), \
+                patch.object(retrieval_api, 'embedding_model', local_model):
+            asyncio.run(service.embed_text('the  fox', 'page-1', 'page'))
+            from_sync = retrieval_api.get_embedding('the fox')
+            from_async = asyncio.run(retrieval_api.get_embedding_async(' the fox'))
+
+        self.assertEqual(from_sync, [0.5, 0.25])
+        self.assertEqual(from_async, [0.5, 0.25])
+        local_model.encode.assert_not_called()
+        self.assertEqual(cache.get_stats()['hits'], 2)
+
+
+def _write_embeddings(directory, prefix):
+    cache = EmbeddingCache(disk_path=directory, disk_entries=64)
+    for i in range(20):
+        cache.put('m', f"{prefix} {i}", [float(i), float(ord(prefix))])
+    cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
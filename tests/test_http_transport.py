@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared HTTP transport.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app import http_transport
+from backend.app.http_transport import CircuitOpenError, HTTPTransport, TransportConfig, loads
+
+URL = "http://stargate:8082/v2/keyspaces/gibsey_network/story_pages"
+
+
+class TestHTTPTransport(unittest.TestCase):
+    """Test retries, circuit breaking and metrics."""
+
+    def transport(self, handler, **config):
+        settings = dict(retries=2, backoff=0, breaker_failures=3, breaker_reset_seconds=60)
+        settings.update(config)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return HTTPTransport(TransportConfig(**settings), client=client)
+
+    def responder(self, *statuses):
+        """Handler answering with the given statuses in turn (then 200)."""
+        self.requests = []
+        remaining = list(statuses)
+
+        def handler(request):
+            self.requests.append(request)
+            status = remaining.pop(0) if remaining else 200
+            if isinstance(status, Exception):
+                raise status
+            return httpx.Response(status, content=b'{"data": [{"id": "a"}]}')
+        return handler
+
+    def test_retries_idempotent_request_on_503(self):
+        transport = self.transport(self.responder(503, 503))
+
+        response = asyncio.run(transport.request('GET', URL, endpoint='GET story_pages'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(loads(response.content), {'data': [{'id': 'a'}]})
+        self.assertEqual(len(self.requests), 3)
+        stats = transport.get_stats()['endpoints']['GET story_pages']
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['errors'], 2)
+        self.assertEqual(stats['retries'], 2)
+
+    def test_does_not_retry_non_idempotent_response(self):
+        transport = self.transport(self.responder(503))
+
+        response = asyncio.run(transport.request('POST', URL, json={'id': 'a'}))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_retries_any_request_when_connect_failed(self):
+        transport = self.transport(self.responder(httpx.ConnectError("refused")))
+
+        response = asyncio.run(transport.request('POST', URL, json={'id': 'a'}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(json.loads(self.requests[-1].content), {'id': 'a'})
+        self.assertEqual(self.requests[-1].headers['content-type'], 'application/json')
+
+    def test_read_timeout_on_post_is_not_retried(self):
+        transport = self.transport(self.responder(httpx.ReadTimeout("slow")))
+
+        with self.assertRaises(httpx.ReadTimeout):
+            asyncio.run(transport.request('POST', URL, json={'id': 'a'}))
+        self.assertEqual(len(self.requests), 1)
+
+    def test_breaker_opens_and_fails_fast(self):
+        transport = self.transport(self.responder(*[500] * 10), retries=0)
+
+        async def run():
+            for _ in range(3):
+                await transport.request('GET', URL)
+            with self.assertRaises(CircuitOpenError):
+                await transport.request('GET', URL)
+
+        asyncio.run(run())
+
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(transport.get_stats()['breakers'], {'stargate:8082': 'open'})
+
+    def test_half_open_probe_closes_breaker(self):
+        transport = self.transport(self.responder(500, 500, 500), retries=0, breaker_reset_seconds=0)
+
+        async def run():
+            for _ in range(3):
+                await transport.request('GET', URL)
+            return await transport.request('GET', URL)
+
+        response = asyncio.run(run())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(transport.get_stats()['breakers'], {'stargate:8082': 'closed'})
+
+    def test_cancelled_probe_does_not_lock_breaker(self):
+        outcomes = [httpx.ConnectError("refused"), 'hang']
+
+        async def handler(request):
+            outcome = outcomes.pop(0) if outcomes else 200
+            if isinstance(outcome, Exception):
+                raise outcome
+            if outcome == 'hang':
+                await asyncio.sleep(10)
+            return httpx.Response(200, content=b'{}')
+
+        transport = self.transport(handler, retries=0, breaker_failures=1, breaker_reset_seconds=0)
+
+        async def run():
+            with self.assertRaises(httpx.ConnectError):
+                await transport.request('GET', URL)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(transport.request('GET', URL), timeout=0.01)
+            return await transport.request('GET', URL)
+
+        response = asyncio.run(run())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(transport.get_stats()['breakers'], {'stargate:8082': 'closed'})
+
+    def test_stdlib_json_fallback(self):
+        with patch.object(http_transport, 'ORJSON_AVAILABLE', False):
+            self.assertEqual(http_transport.loads(http_transport.dumps({'a': [1, 2]})), {'a': [1, 2]})
+            self.assertEqual(http_transport.loads(b''), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the process-wide model registry.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.model_registry import ModelRegistry, canonical_model_name
+
+
+class FakeTensor:
+    def __init__(self, count):
+        self.count = count
+
+    def numel(self):
+        return self.count
+
+    def element_size(self):
+        return 4
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+    def parameters(self):
+        return iter([FakeTensor(1000), FakeTensor(24)])
+
+    def buffers(self):
+        return iter([FakeTensor(8)])
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Test single loading, name aliasing, preload readiness and stats."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.loads = []
+
+        def loader(name):
+            self.loads.append(name)
+            time.sleep(0.02)
+            return FakeModel(name)
+
+        self.registry = ModelRegistry(loader=loader)
+
+    def test_aliases_share_one_instance(self):
+        short = self.registry.get('all-MiniLM-L6-v2')
+        full = self.registry.get('sentence-transformers/all-MiniLM-L6-v2')
+
+        self.assertIs(short, full)
+        self.assertEqual(self.loads, ['sentence-transformers/all-MiniLM-L6-v2'])
+        self.assertEqual(canonical_model_name('sentence-transformers/clip-ViT-B-32'),
+                         'sentence-transformers/clip-ViT-B-32')
+
+    def test_concurrent_first_use_loads_once(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.get('clip-ViT-B-32')))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.loads), 1)
+        self.assertTrue(all(model is results[0] for model in results))
+
+    def test_preload_signals_readiness_and_reports_memory(self):
+        self.assertFalse(self.registry.ready)
+
+        asyncio.run(self.registry.preload(['all-MiniLM-L6-v2', 'clip-ViT-B-32']))
+
+        self.assertTrue(self.registry.wait_until_ready(0))
+        stats = self.registry.get_stats()
+        self.assertTrue(stats['ready'])
+        self.assertEqual(stats['models']['sentence-transformers/all-MiniLM-L6-v2']['memory_bytes'], 1032 * 4)
+        self.assertEqual(stats['total_memory_bytes'], 2 * 1032 * 4)
+
+    def test_failed_preload_is_reported_and_retried_lazily(self):
+        attempts = []
+
+        def flaky(name):
+            attempts.append(name)
+            if len(attempts) == 1:
+                raise OSError("download failed")
+            return FakeModel(name)
+
+        registry = ModelRegistry(loader=flaky)
+        registry.preload_sync(['all-MiniLM-L6-v2'])
+
+        self.assertTrue(registry.ready)
+        self.assertIn('sentence-transformers/all-MiniLM-L6-v2', registry.get_stats()['failed'])
+        self.assertIsInstance(registry.get('all-MiniLM-L6-v2'), FakeModel)
+        self.assertEqual(registry.get_stats()['failed'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
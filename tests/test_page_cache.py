@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the read-through page cache and its use by the production database.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Mock dependencies before importing the database
+sys.modules.setdefault('cassandra', Mock())
+sys.modules.setdefault('cassandra.cluster', Mock())
+sys.modules.setdefault('cassandra.auth', Mock())
+sys.modules.setdefault('cassandra.policies', Mock())
+sys.modules.setdefault('cassandra.query', Mock())
+
+from backend.app.cassandra_database_v2 import ProductionCassandraDatabase
+from backend.app.models import StoryPage
+from backend.app.page_cache import LocalSharedTier, PageCache
+
+
+def story_page(page_id, text='text'):
+    return StoryPage(id=page_id, symbol_id='london-fox', page_type='primary', author='AI', text=text)
+
+
+class TestPageCache(unittest.TestCase):
+    """Test the two cache tiers, negative entries and invalidation."""
+
+    def test_local_hit_and_lru_eviction(self):
+        cache = PageCache(max_entries=2)
+
+        async def run():
+            await cache.put_many({'a': story_page('a'), 'b': story_page('b')})
+            await cache.get_many(['a'])  # 'a' becomes most recently used
+            await cache.put_many({'c': story_page('c')})
+            return await cache.get_many(['a', 'b', 'c'])
+
+        found = asyncio.run(run())
+
+        self.assertEqual(sorted(found), ['a', 'c'])
+        self.assertEqual(cache.local_hits, 3)
+        self.assertEqual(cache.misses, 1)
+
+    def test_cached_pages_are_copies(self):
+        cache = PageCache()
+
+        async def run():
+            await cache.put_many({'a': story_page('a', text='original')})
+            (await cache.get_many(['a']))['a'].text = 'changed'
+            return await cache.get_many(['a'])
+
+        self.assertEqual(asyncio.run(run())['a'].text, 'original')
+
+    def test_negative_entries(self):
+        cache = PageCache(negative_ttl_seconds=60)
+
+        async def run():
+            await cache.put_many({'missing': None})
+            return await cache.get_many(['missing'])
+
+        self.assertEqual(asyncio.run(run()), {'missing': None})
+        self.assertEqual(cache.negative_hits, 1)
+
+    def test_shared_tier_fills_local_tier(self):
+        shared = LocalSharedTier()
+        writer, reader = PageCache(shared=shared), PageCache(shared=shared)
+
+        async def run():
+            await writer.put_many({'a': story_page('a', text='shared'), 'gone': None})
+            first = await reader.get_many(['a', 'gone'])
+            second = await reader.get_many(['a'])
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first['a'].text, 'shared')
+        self.assertIsNone(first['gone'])
+        self.assertEqual(second['a'].text, 'shared')
+        self.assertEqual((reader.shared_hits, reader.local_hits, reader.negative_hits), (1, 1, 1))
+
+    def test_invalidate_clears_both_tiers(self):
+        shared = LocalSharedTier()
+        cache = PageCache(shared=shared)
+
+        async def run():
+            await cache.put_many({'a': story_page('a')})
+            await cache.invalidate(['a'])
+            return await cache.get_many(['a'])
+
+        self.assertEqual(asyncio.run(run()), {})
+        self.assertTrue(shared._values['gibsey:page:a'][0].startswith(b'tombstone:'))
+
+    def test_read_older_than_invalidation_is_not_stored(self):
+        cache = PageCache()
+
+        async def run():
+            token = cache.begin_read()
+            await cache.invalidate(['a'])  # a write lands while the read is in flight
+            await cache.put_many({'a': story_page('a', text='stale'), 'b': story_page('b')}, token=token)
+            return await cache.get_many(['a', 'b'])
+
+        self.assertEqual(sorted(asyncio.run(run())), ['b'])
+
+    def test_slow_read_in_other_process_cannot_restore_old_page(self):
+        shared = LocalSharedTier()
+        writer, reader = PageCache(shared=shared), PageCache(shared=shared)
+
+        async def run():
+            token = reader.begin_read()  # reader fetches the old page...
+            await writer.invalidate(['a'])  # ...while the writer updates it
+            await reader.put_many({'a': story_page('a', text='old')}, token=token)
+            seen_by_writer = await writer.get_many(['a'])
+            seen_by_reader = await reader.get_many(['a'])
+            return seen_by_writer, seen_by_reader
+
+        seen_by_writer, seen_by_reader = asyncio.run(run())
+
+        self.assertEqual(seen_by_writer, {})
+        self.assertEqual(seen_by_reader, {})
+        self.assertTrue(shared._values['gibsey:page:a'][0].startswith(b'tombstone:'))
+
+    def test_read_after_write_replaces_tombstone(self):
+        shared = LocalSharedTier()
+        writer, other = PageCache(shared=shared), PageCache(shared=shared)
+
+        async def run():
+            await writer.put_many({'a': story_page('a', text='old')})
+            await writer.invalidate(['a'])
+            await writer.put_many({'a': story_page('a', text='new')}, token=writer.begin_read())
+            local = await writer.get_many(['a'])
+            shared_copy = await other.get_many(['a'])
+            return local, shared_copy
+
+        local, shared_copy = asyncio.run(run())
+
+        self.assertEqual(local['a'].text, 'new')
+        self.assertEqual(writer.local_hits, 1)
+        self.assertEqual(shared_copy['a'].text, 'new')
+        self.assertEqual(other.shared_hits, 1)
+
+    def test_read_after_seeing_tombstone_replaces_it(self):
+        shared = LocalSharedTier()
+        writer, reader = PageCache(shared=shared), PageCache(shared=shared)
+
+        async def run():
+            await writer.invalidate(['a'])
+            self.assertEqual(await reader.get_many(['a']), {})  # sees the tombstone, then reads
+            await reader.put_many({'a': story_page('a', text='new')}, token=reader.begin_read())
+            return await writer.get_many(['a'])
+
+        self.assertEqual(asyncio.run(run())['a'].text, 'new')
+
+    def test_later_write_blocks_tombstone_replacement(self):
+        shared = LocalSharedTier()
+        first, second = PageCache(shared=shared), PageCache(shared=shared)
+
+        async def run():
+            await first.invalidate(['a'])
+            token = first.begin_read()  # first reads the page after its own write...
+            await second.invalidate(['a'])  # ...while another process writes it again
+            await first.put_many({'a': story_page('a', text='stale')}, token=token)
+            return await first.get_many(['a']), await second.get_many(['a'])
+
+        self.assertEqual(asyncio.run(run()), ({}, {}))
+
+    def test_reads_older_than_tombstone_skip_shared_tier(self):
+        shared = LocalSharedTier()
+        cache = PageCache(shared=shared, tombstone_seconds=0)
+
+        asyncio.run(cache.put_many({'a': story_page('a')}, token=(cache.generation, 0.0)))
+
+        self.assertEqual(shared._values, {})
+
+    def test_failing_shared_tier_degrades_to_misses(self):
+        shared = Mock()
+        shared.get_many = AsyncMock(side_effect=ConnectionError('redis down'))
+        cache = PageCache(shared=shared)
+
+        self.assertEqual(asyncio.run(cache.get_many(['a'])), {})
+        self.assertEqual(cache.shared_errors, 1)
+        self.assertEqual(cache.misses, 1)
+
+
+class TestDatabasePageCache(unittest.TestCase):
+    """Test that the production database reads through and invalidates the cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.db = ProductionCassandraDatabase()
+        self.stored = {'p1': {'id': 'p1', 'symbol_id': 'london-fox', 'page_type': 'primary',
+                              'text': 'first draft', 'author': 'AI', 'rotation': 0, 'title': 'P1',
+                              'created_at': 1700000000000}}
+
+        async def request(method, table, data=None, params=None):
+            if method == 'PATCH':
+                self.stored[table.split('/')[1]].update(data)
+                return {'data': data}
+            if method == 'POST':
+                return {'id': data.get('id')}
+            ids = json.loads(params['where'])['id']['$in']
+            return {'count': 1, 'data': [self.stored[page_id] for page_id in ids if page_id in self.stored]}
+
+        self.db._stargate_request = AsyncMock(side_effect=request)
+
+    def reads(self):
+        return [call for call in self.db._stargate_request.await_args_list if call.args[0] == 'GET']
+
+    def test_repeated_reads_hit_cache(self):
+        async def run():
+            await self.db.get_page('p1')
+            await self.db.get_pages_many(['p1', 'nope'])
+            return await self.db.get_pages_many(['p1', 'nope'])
+
+        pages = asyncio.run(run())
+
+        self.assertEqual([page.id for page in pages], ['p1'])
+        # One read for p1, one for the unknown ID; the rest came from the cache
+        self.assertEqual(len(self.reads()), 2)
+        stats = asyncio.run(self.db.get_stats())['page_cache']
+        self.assertEqual(stats['negative_hits'], 1)
+        self.assertGreater(stats['hit_rate'], 0.5)
+
+    def test_failed_read_is_not_cached_as_missing(self):
+        self.db._stargate_request = AsyncMock(return_value={})
+
+        self.assertIsNone(asyncio.run(self.db.get_page('p1')))
+        self.assertEqual(len(self.db.page_cache), 0)
+
+    def test_update_page_invalidates(self):
+        async def run():
+            await self.db.get_page('p1')
+            updated = await self.db.update_page('p1', {'text': 'second draft'})
+            return updated, await self.db.get_page('p1')
+
+        updated, reread = asyncio.run(run())
+
+        self.assertEqual(updated.text, 'second draft')
+        self.assertEqual(reread.text, 'second draft')
+        # The changed text is copied into the index summaries, on the page's existing feed row
+        posted = {call.args[1]: call.kwargs['data'] for call in self.db._stargate_request.await_args_list
+                  if call.args[0] == 'POST'}
+        self.assertEqual(sorted(posted), ['pages_by_symbol', 'recent_pages'])
+        self.assertEqual(posted['recent_pages']['bucket'], '2023-11-14-22')
+        self.assertEqual(posted['recent_pages']['text'], 'second draft')
+
+    def test_update_page_rejects_index_keys_and_unknown_pages(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.db.update_page('p1', {'symbol_id': 'an-author'}))
+        self.assertIsNone(asyncio.run(self.db.update_page('nope', {'text': 'x'})))
+        self.assertNotIn('nope', self.stored)
+
+    def test_create_page_clears_negative_entry(self):
+        async def run():
+            self.assertIsNone(await self.db.get_page('p2'))
+            page = story_page('p2', text='new page')
+            await self.db.create_page(page)
+            self.stored['p2'] = {'id': 'p2', 'symbol_id': 'london-fox', 'page_type': 'primary', 'text': 'new page'}
+            return await self.db.get_page('p2')
+
+        self.db.vector_service = None
+        self.assertEqual(asyncio.run(run()).text, 'new page')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batched page fetches in the production Cassandra database.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Mock dependencies before importing the database
+sys.modules.setdefault('cassandra', Mock())
+sys.modules.setdefault('cassandra.cluster', Mock())
+sys.modules.setdefault('cassandra.auth', Mock())
+sys.modules.setdefault('cassandra.policies', Mock())
+sys.modules.setdefault('cassandra.query', Mock())
+
+from backend.app import cassandra_database_v2
+from backend.app.cassandra_database_v2 import ProductionCassandraDatabase
+
+
+def page_row(page_id, symbol_id='london-fox'):
+    return {'id': page_id, 'symbol_id': symbol_id, 'page_type': 'primary', 'text': f'text of {page_id}',
+            'author': 'AI', 'rotation': 0, 'title': f'title {page_id}'}
+
+
+class TestPageMultiGet(unittest.TestCase):
+    """Test that listing and search paths fetch pages in a few batched requests."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.db = ProductionCassandraDatabase()
+        self.stored = {f'p{i}': page_row(f'p{i}') for i in range(120)}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def request(method, table, data=None, params=None):
+            where = json.loads(params['where'])
+            if table == 'story_pages':
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(0)
+                self.in_flight -= 1
+                ids = where['id']['$in']
+                return {'data': [self.stored[page_id] for page_id in ids if page_id in self.stored]}
+            # Index tables hold the denormalized summaries
+            return {'data': [dict(row, text=row['text'][:5]) for row in list(self.stored.values())[:params['page-size']]]}
+
+        self.db._stargate_request = AsyncMock(side_effect=request)
+
+    def story_page_calls(self):
+        return [call for call in self.db._stargate_request.await_args_list if call.args[1] == 'story_pages']
+
+    def test_many_pages_in_few_requests(self):
+        ids = [f'p{i}' for i in range(100)] + ['missing', 'p3']
+
+        with patch.object(cassandra_database_v2, 'MULTIGET_BATCH_SIZE', 25), \
+                patch.object(cassandra_database_v2, 'MULTIGET_CONCURRENCY', 2):
+            pages = asyncio.run(self.db.get_pages_many(ids))
+
+        # Order preserved, missing skipped, duplicates repeated
+        self.assertEqual([page.id for page in pages], [f'p{i}' for i in range(100)] + ['p3'])
+        self.assertEqual(len(self.story_page_calls()), 5)  # 101 distinct ids
+        self.assertLessEqual(self.max_in_flight, 2)
+
+    def test_list_by_symbol_is_two_round_trips(self):
+        pages = asyncio.run(self.db.get_pages_by_symbol('london-fox', limit=40))
+
+        self.assertEqual(len(pages), 40)
+        self.assertEqual(pages[0].text, 'text of p0')
+        self.assertEqual(self.db._stargate_request.await_count, 2)
+
+    def test_summary_listing_skips_story_pages(self):
+        pages = asyncio.run(self.db.get_pages_by_section(1, limit=10, summary=True))
+
+        self.assertEqual(len(pages), 10)
+        self.assertEqual(pages[0].title, 'title p0')
+        self.assertEqual(pages[0].text, 'text ')
+        self.assertEqual(self.story_page_calls(), [])
+
+    def test_get_pages_applies_skip(self):
+        pages, total = asyncio.run(self.db.get_pages(skip=5, limit=5))
+
+        self.assertEqual([page.id for page in pages], ['p5', 'p6', 'p7', 'p8', 'p9'])
+        self.assertEqual(total, 5)
+
+    def test_empty_ids(self):
+        self.assertEqual(asyncio.run(self.db.get_pages_many([])), [])
+        self.db._stargate_request.assert_not_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()
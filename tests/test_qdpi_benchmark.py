@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the QDPI benchmark suite and regression gate.
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from qdpi_benchmark import (
+    BASELINE_FORMAT_VERSION, compare_results, load_results, main, run_suite, save_results
+)
+
+
+def _results(ops_per_sec, p99_ms):
+    return {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'results': {'case': {'ops_per_sec': ops_per_sec, 'p99_ms': p99_ms}}
+    }
+
+
+class TestRegressionGate(unittest.TestCase):
+    """Test baseline comparison."""
+
+    def test_within_threshold_passes(self):
+        """Small slowdowns inside the threshold are not regressions."""
+        regressions = compare_results(_results(1000, 2.0), _results(900, 2.2), threshold=0.15)
+
+        self.assertEqual(regressions, [])
+
+    def test_throughput_and_p99_regressions(self):
+        """Both throughput drops and p99 growth beyond the threshold are reported."""
+        regressions = compare_results(_results(1000, 2.0), _results(800, 2.5), threshold=0.15)
+
+        self.assertEqual({r['metric'] for r in regressions}, {'ops_per_sec', 'p99_ms'})
+
+    def test_missing_cases_are_skipped(self):
+        """Cases absent from the current run are ignored."""
+        current = {'format_version': BASELINE_FORMAT_VERSION, 'results': {}}
+
+        self.assertEqual(compare_results(_results(1000, 2.0), current), [])
+
+    def test_compare_exit_code(self):
+        """compare exits non-zero on regression."""
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / 'baseline.json'
+            current = Path(tmp) / 'current.json'
+            save_results(_results(1000, 2.0), str(baseline))
+            save_results(_results(500, 2.0), str(current))
+
+            self.assertEqual(main(['compare', str(baseline), '--current', str(baseline)]), 0)
+            self.assertEqual(main(['compare', str(baseline), '--current', str(current)]), 1)
+
+
+class TestBenchmarkRun(unittest.TestCase):
+    """Test a short benchmark run."""
+
+    def test_reed_solomon_suite_round_trips(self):
+        """Results are JSON-serialisable and clean inputs always decode."""
+        results = run_suite(iterations=3, warmup=1, components=['reed_solomon'], verbose=False)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'results.json'
+            save_results(results, str(path))
+            self.assertEqual(load_results(str(path))['results'], json.loads(json.dumps(results['results'])))
+
+        clean = results['results']['reed_solomon.decode_block.len223.ber0']
+        self.assertEqual(clean['success_rate'], 1.0)
+        self.assertGreater(clean['ops_per_sec'], 0)
+        self.assertGreaterEqual(clean['p99_ms'], clean['p50_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
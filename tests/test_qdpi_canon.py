@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared QDPI canon tables.
+"""
+
+import pickle
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Mock ChromaDB before importing the QDPI codex
+sys.modules.setdefault('chromadb', Mock())
+
+from backend.app.qdpi import QDPICodex
+from backend.app.qdpi_canon import CANON, QDPINarrative
+
+
+class TestQDPICanon(unittest.TestCase):
+    """Test canon tables and columnar narratives."""
+
+    def test_tables_match_codex(self):
+        """Every glyph row agrees with the codex symbols."""
+        codex = QDPICodex()
+        for glyph_id in range(256):
+            symbol = codex.get_symbol_by_id(glyph_id)
+            self.assertEqual(CANON.symbol_ids[glyph_id], symbol.id - 1)
+            self.assertEqual(CANON.rotations[glyph_id], symbol.rotation)
+            self.assertEqual(CANON.orientations[glyph_id], symbol.orientation.value)
+
+    def test_name_lookup(self):
+        """Codex names, narrative names and meta-verbs resolve to the same ids."""
+        self.assertEqual(CANON.symbol_id('london_fox'), 1)
+        self.assertEqual(CANON.symbol_id('hidden_symbol_40'), CANON.symbol_id('VALIDATE'))
+        self.assertEqual(CANON.glyph_id('VALIDATE', 270), 55 * 4 + 3)
+        self.assertIsNone(CANON.symbol_id('not_a_symbol'))
+        self.assertEqual(CANON.symbol_types[55], 'meta_verb')
+
+    def test_tables_are_immutable(self):
+        """Shared tables cannot be modified in place."""
+        with self.assertRaises(ValueError):
+            CANON.meanings[0] = 'tampered'
+
+    def test_narrative_columns(self):
+        """Columnar narratives expose per-glyph columns and records."""
+        narrative = CANON.narrative(bytes([8 * 4 + 1, 55 * 4 + 3]))
+
+        self.assertEqual(narrative.names.tolist(), ['cop-e-right', 'VALIDATE'])
+        self.assertEqual(narrative.modes.tolist(), ['ask', 'receive'])
+        self.assertEqual(narrative.narrative_meaning(),
+                         'ASK Security & Permissions → RECEIVE VALIDATE operation')
+        self.assertEqual(narrative.to_records()[1], {
+            'position': 1,
+            'symbol_name': 'VALIDATE',
+            'rotation': 270,
+            'glyph_id': 223,
+            'canon_meaning': 'RECEIVE VALIDATE operation'
+        })
+
+    def test_narrative_pickles_glyphs_only(self):
+        """Narratives cross process boundaries without copying the tables."""
+        narrative = CANON.narrative(np.arange(256, dtype=np.uint8))
+        payload = pickle.dumps(narrative)
+
+        self.assertLess(len(payload), 1024)
+        self.assertEqual(pickle.loads(payload).narrative_meaning(), narrative.narrative_meaning())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the QDPI codex bulk codec path.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Mock ChromaDB before importing the codex
+sys.modules.setdefault('chromadb', Mock())
+
+from backend.app.qdpi import QDPICodex, QDPIGlyphSequence
+
+
+class TestQDPIBulkCodec(unittest.TestCase):
+    """Test glyph-array encoding and decoding."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.codex = QDPICodex()
+
+    def test_encode_glyphs_round_trip(self):
+        """Bytes survive a glyph-array round trip."""
+        data = bytes(range(256)) * 4
+        glyph_ids = self.codex.encode_glyphs(data)
+
+        self.assertEqual(glyph_ids.dtype, np.uint8)
+        self.assertEqual(len(glyph_ids), len(data))
+        self.assertEqual(self.codex.decode_glyphs(glyph_ids), data)
+
+    def test_bulk_matches_symbol_path(self):
+        """Lazy sequence yields the same symbols as encode_data."""
+        message = "Glyph Marrow reads the map"
+        sequence = self.codex.encode_bulk(message)
+        symbols = self.codex.encode_data(message)
+
+        self.assertIsInstance(sequence, QDPIGlyphSequence)
+        self.assertEqual(len(sequence), len(symbols))
+        self.assertEqual([s.glyph_id for s in sequence], [s.glyph_id for s in symbols])
+        self.assertIs(sequence[0], symbols[0])
+
+    def test_decode_symbols_accepts_both_forms(self):
+        """decode_symbols handles symbol lists and glyph sequences."""
+        message = '{"page": 42}'
+        sequence = self.codex.encode_bulk(message)
+
+        self.assertEqual(self.codex.decode_symbols(sequence), message.encode('utf-8'))
+        self.assertEqual(self.codex.decode_symbols(sequence.to_symbols()), message.encode('utf-8'))
+
+    def test_decode_glyphs_rejects_out_of_range(self):
+        """Out-of-range glyph IDs raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.codex.decode_glyphs([1, 2, 300])
+        with self.assertRaises(ValueError):
+            self.codex.decode_glyphs(np.array([1, -1], dtype=np.int32))
+
+    def test_sequence_slicing(self):
+        """Slicing a sequence stays lazy."""
+        sequence = self.codex.encode_bulk("abcdef")
+        head = sequence[:3]
+
+        self.assertIsInstance(head, QDPIGlyphSequence)
+        self.assertEqual(head.to_bytes(), b"abc")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the two-tier QDPI error correction pipeline.
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from qdpi_complete_ecc import QDPICompleteECC
+
+
+class TestErasureAssistedDecode(unittest.TestCase):
+    """Test mini-syndrome erasure hints feeding the RS decoder."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        random.seed(21)
+        self.ecc = QDPICompleteECC()
+        self.sequence = bytes([33, 223, 15, 6] * 4)
+        self.protected = self.ecc.encode_with_protection(self.sequence)
+
+    def test_padding_errors_become_erasures(self):
+        """Damage beyond 16 unknown errors is recovered once padding is erased."""
+        positions = random.sample(range(len(self.sequence), self.ecc.reed_solomon.data_size), 24)
+        corrupted = bytearray(self.protected.reed_solomon_block.encoded)
+        for pos in positions:
+            corrupted[pos] ^= random.randint(1, 255)
+
+        recovered, stats = self.ecc.decode_with_correction(bytes(corrupted), len(self.sequence))
+
+        self.assertEqual(recovered, self.sequence)
+        self.assertTrue(stats['protection_successful'])
+        self.assertTrue(stats['erasure_decoding']['successful'])
+        self.assertEqual(sorted(self.ecc.find_erasures(bytes(corrupted), len(self.sequence))), sorted(positions))
+
+    def test_orientation_repairs_reported(self):
+        """RS repairs that only changed a rotation show up as orientation errors."""
+        corrupted = bytearray(self.protected.reed_solomon_block.encoded)
+        corrupted[2] ^= 1
+
+        recovered, stats = self.ecc.decode_with_correction(bytes(corrupted), len(self.sequence))
+
+        self.assertEqual(recovered, self.sequence)
+        self.assertFalse(stats['erasure_decoding']['attempted'])
+        self.assertEqual(
+            [d['position'] for d in stats['orientation_correction']['correction_details']], [2]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
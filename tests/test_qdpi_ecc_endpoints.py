@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Integration tests for the /qdpi/ecc endpoints and their worker pool.
+"""
+
+import base64
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+# Add project root and backend directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Mock ChromaDB before importing the QDPI codex
+sys.modules.setdefault('chromadb', Mock())
+
+# Keep the protected message store out of the working tree
+os.environ.setdefault("QDPI_ECC_STORE_DIR", tempfile.mkdtemp(prefix="qdpi_ecc_store_"))
+
+from app.api import qdpi_ecc_endpoints
+
+LOGIN_FLOW = [
+    {"symbol_name": "cop-e-right", "rotation": 90},
+    {"symbol_name": "VALIDATE", "rotation": 270},
+    {"symbol_name": "phillip_bafflemint", "rotation": 270},
+    {"symbol_name": "london_fox", "rotation": 180},
+]
+
+
+class TestQDPIECCEndpoints(unittest.TestCase):
+    """Test ECC endpoints running through the process pool."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up a small app with the ECC router."""
+        qdpi_ecc_endpoints.ecc_pool.max_workers = 2
+        app = FastAPI()
+        app.include_router(qdpi_ecc_endpoints.router)
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop worker processes."""
+        qdpi_ecc_endpoints.ecc_pool.shutdown()
+        qdpi_ecc_endpoints.ecc_backend.protected_messages.close()
+
+    def test_encode_decode_round_trip(self):
+        """Single encode/decode runs in the pool and stores the message."""
+        response = self.client.post("/qdpi/ecc/encode", json={
+            "description": "User login flow",
+            "symbol_sequence": LOGIN_FLOW,
+        })
+        self.assertEqual(response.status_code, 200)
+        encoded = response.json()
+        self.assertIn(encoded["block_id"], qdpi_ecc_endpoints.ecc_backend.protected_messages)
+
+        response = self.client.post("/qdpi/ecc/decode", json={
+            "protected_data": encoded["protected_data_base64"],
+            "original_length": len(LOGIN_FLOW),
+            "block_id": encoded["block_id"],
+        })
+        self.assertEqual(response.status_code, 200)
+        decoded = response.json()
+        self.assertTrue(decoded["recovery_successful"])
+        self.assertEqual(decoded["narrative_meaning"], encoded["narrative_meaning"])
+
+    def test_batch_round_trip(self):
+        """Batch endpoints preserve order across workers."""
+        narratives = [
+            {"description": f"Narrative {i}", "symbol_sequence": LOGIN_FLOW[:(i % 4) + 1]}
+            for i in range(10)
+        ]
+        response = self.client.post("/qdpi/ecc/encode-batch", json={"narratives": narratives})
+        self.assertEqual(response.status_code, 200)
+        encoded = response.json()
+        self.assertEqual(encoded["count"], 10)
+        block_ids = [result["block_id"] for result in encoded["results"]]
+        self.assertEqual(block_ids, sorted(block_ids))
+
+        # Corrupt one message so the batch mixes clean and corrected blocks
+        corrupted = bytearray(base64.b64decode(encoded["results"][3]["protected_data_base64"]))
+        for pos in (0, 40, 80):
+            corrupted[pos] ^= 0xff
+        messages = [
+            {
+                "protected_data": result["protected_data_base64"],
+                "original_length": len(narrative["symbol_sequence"]),
+                "block_id": result["block_id"],
+            }
+            for narrative, result in zip(narratives, encoded["results"])
+        ]
+        messages[3]["protected_data"] = base64.b64encode(bytes(corrupted)).decode("utf-8")
+
+        response = self.client.post("/qdpi/ecc/decode-batch", json={"messages": messages})
+        self.assertEqual(response.status_code, 200)
+        decoded = response.json()
+        self.assertEqual(decoded["recovered_count"], 10)
+        for result, original in zip(decoded["results"], encoded["results"]):
+            self.assertEqual(result["narrative_meaning"], original["narrative_meaning"])
+
+    def test_empty_batch_rejected(self):
+        """Empty batches are a client error."""
+        response = self.client.post("/qdpi/ecc/decode-batch", json={"messages": []})
+        self.assertEqual(response.status_code, 400)
+
+    def test_performance_reports_pool(self):
+        """Performance summary includes worker pool counters."""
+        response = self.client.get("/qdpi/ecc/performance")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("worker_pool", response.json())
+
+    def test_stats_merge_worker_latency(self):
+        """Latency recorded in worker processes shows up in /stats."""
+        self.client.post("/qdpi/ecc/encode", json={
+            "description": "Stats probe",
+            "symbol_sequence": LOGIN_FLOW,
+        })
+        response = self.client.get("/qdpi/ecc/stats")
+        self.assertEqual(response.status_code, 200)
+        stages = response.json()["stages"]
+        for stage in ("reed_solomon_encode", "ecc_encode", "narrative_encode"):
+            self.assertGreater(stages[stage]["count"], 0)
+            self.assertIn("p99_ms", stages[stage])
+
+
+if __name__ == '__main__':
+    unittest.main()
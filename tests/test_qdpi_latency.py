@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for bounded QDPI latency histograms.
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from qdpi_latency import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test streaming latency histograms."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        random.seed(11)
+        self.samples = [random.expovariate(1 / 0.002) for _ in range(20000)]
+
+    def _exact_percentile_ms(self, percentile):
+        ordered = sorted(self.samples)
+        rank = max(1, -(-len(ordered) * percentile // 100))
+        return ordered[int(rank) - 1] * 1000
+
+    def test_percentiles_within_bucket_precision(self):
+        """Reported percentiles stay within ~3% of the exact value."""
+        histogram = LatencyHistogram()
+        for sample in self.samples:
+            histogram.record(sample)
+
+        for percentile in (50, 95, 99):
+            exact = self._exact_percentile_ms(percentile)
+            self.assertAlmostEqual(histogram.percentile_ms(percentile), exact, delta=exact * 0.04)
+        self.assertAlmostEqual(histogram.max_ms(), max(self.samples) * 1000, delta=0.001)
+
+    def test_under_target_share_is_exact(self):
+        """Share of calls under the 4ms target is counted exactly."""
+        histogram = LatencyHistogram()
+        for sample in self.samples:
+            histogram.record(sample)
+
+        expected = sum(sample < 0.004 for sample in self.samples) / len(self.samples) * 100
+        self.assertAlmostEqual(histogram.snapshot()['under_target_percent'], expected)
+
+    def test_memory_is_bounded(self):
+        """Bucket storage does not grow with the number of records."""
+        histogram = LatencyHistogram()
+        bucket_count = len(histogram.counts)
+        for sample in self.samples:
+            histogram.record(sample)
+        histogram.record(3600.0)
+
+        self.assertEqual(len(histogram.counts), bucket_count)
+        self.assertEqual(histogram.count, len(self.samples) + 1)
+
+    def test_merge_matches_single_histogram(self):
+        """Merging per-worker histograms equals recording everything in one."""
+        combined = LatencyHistogram()
+        workers = [LatencyHistogram() for _ in range(4)]
+        for i, sample in enumerate(self.samples):
+            combined.record(sample)
+            workers[i % 4].record(sample)
+
+        merged = LatencyHistogram()
+        for worker in workers:
+            merged.merge(worker)
+
+        self.assertEqual(merged.snapshot(), combined.snapshot())
+
+    def test_empty_histogram(self):
+        """An empty histogram reports zeros."""
+        snapshot = LatencyHistogram().snapshot()
+
+        self.assertEqual(snapshot['count'], 0)
+        self.assertEqual(snapshot['p99_ms'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the QDPI mini-syndrome Viterbi orientation corrector.
+"""
+
+import itertools
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from qdpi_mini_syndrome import QDPIMiniSyndrome
+
+
+class TestViterbiOrientation(unittest.TestCase):
+    """Test orientation path decoding."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        random.seed(7)
+        self.corrector = QDPIMiniSyndrome()
+
+    def _path_cost(self, observed, path):
+        emission = self.corrector._emission_costs
+        transition = self.corrector._transition_costs
+        cost = emission[observed[0], path[0]]
+        for t in range(1, len(path)):
+            cost += transition[path[t - 1], path[t]] + emission[observed[t], path[t]]
+        return cost
+
+    def test_matches_exhaustive_search(self):
+        """Decoded path is the minimum-cost path for short sequences."""
+        for _ in range(50):
+            sequence = [random.randrange(256) for _ in range(random.randint(1, 6))]
+            observed = [g % 4 for g in sequence]
+            result = self.corrector.decode_orientations(sequence)
+
+            best = min(
+                self._path_cost(observed, path)
+                for path in itertools.product(range(4), repeat=len(sequence))
+            )
+            self.assertAlmostEqual(result.path_cost, best)
+            self.assertAlmostEqual(self._path_cost(observed, result.rotation_indices), best)
+
+    def test_confidence_per_position(self):
+        """Every position gets a confidence in (0, 1]."""
+        sequence = [random.randrange(256) for _ in range(1000)]
+        result = self.corrector.decode_orientations(sequence)
+
+        self.assertEqual(len(result.confidence), 1000)
+        self.assertTrue(((result.confidence > 0) & (result.confidence <= 1)).all())
+
+    def test_flow_violation_corrected(self):
+        """A glyph that breaks a strongly compatible flow is corrected."""
+        # READ -> ASK -> RECEIVE -> INDEX repeated, with one RECEIVE flipped to INDEX
+        clean = [s * 4 + r for s, r in zip(range(40), [0, 1, 3, 2] * 10)]
+        corrupted = list(clean)
+        corrupted[14] ^= 1
+
+        corrected, errors = self.corrector.correct_sequence(corrupted)
+
+        self.assertEqual(corrected, clean)
+        self.assertEqual([e.position for e in errors], [14])
+        self.assertEqual(errors[0].corrected_rotation, 270)
+
+    def test_received_confidence_flags_flow_violation(self):
+        """The flipped glyph is the least trusted position and the only erasure."""
+        clean = [s * 4 + r for s, r in zip(range(40), [0, 1, 3, 2] * 10)]
+        corrupted = list(clean)
+        corrupted[14] ^= 1
+
+        confidence = self.corrector.glyph_confidence(corrupted)
+
+        self.assertEqual(int(confidence.argmin()), 14)
+        self.assertEqual(self.corrector.find_erasures(corrupted), [14])
+        self.assertEqual(self.corrector.find_erasures(corrupted, threshold=1.01, max_erasures=3)[0], 14)
+
+    def test_invalid_glyphs_left_untouched(self):
+        """Out-of-range glyph IDs are never reported or rewritten."""
+        corrected, errors = self.corrector.correct_sequence([4, -1, 300, 5])
+
+        self.assertEqual(corrected[1:3], [-1, 300])
+        self.assertNotIn(1, [e.position for e in errors])
+        self.assertNotIn(2, [e.position for e in errors])
+
+    def test_empty_sequence(self):
+        """Empty input decodes to an empty path."""
+        corrected, errors = self.corrector.correct_sequence([])
+
+        self.assertEqual(corrected, [])
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
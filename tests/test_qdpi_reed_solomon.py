@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Unit tests for QDPI Reed-Solomon framing.
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from qdpi_reed_solomon import QDPIReedSolomon
+
+
+class TestMultiBlockFraming(unittest.TestCase):
+    """Test interleaved multi-block encode/decode."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        random.seed(1234)
+        self.rs = QDPIReedSolomon(interleave_depth=4)
+        self.payload = bytes(random.randrange(256) for _ in range(5000))
+
+    def test_batched_encode_matches_reedsolo(self):
+        """Batched encoder produces the same codewords as reedsolo."""
+        data = bytes(random.randrange(256) for _ in range(self.rs.data_size))
+        codewords = self.rs.encode_blocks(np.frombuffer(data, dtype=np.uint8)[None, :])
+
+        self.assertEqual(codewords.tobytes(), bytes(self.rs.rs.encode(data)))
+        self.assertFalse(self.rs.calculate_syndromes(codewords).any())
+
+    def test_clean_round_trip(self):
+        """Clean frames decode without touching the corrector."""
+        frame = self.rs.encode_stream(self.payload)
+        recovered, stats = self.rs.decode_stream(frame.encoded, len(self.payload))
+
+        self.assertEqual(frame.block_count, 23)
+        self.assertEqual(len(frame.encoded), 23 * self.rs.block_size)
+        self.assertEqual(recovered, self.payload)
+        self.assertEqual(stats['blocks_with_errors'], 0)
+        self.assertTrue(stats['correction_successful'])
+
+    def test_burst_spread_across_codewords(self):
+        """A burst longer than one codeword's capacity is recovered by interleaving."""
+        frame = self.rs.encode_stream(self.payload)
+        corrupted = self.rs.simulate_burst_errors(frame, burst_length=60, start=1100)
+        recovered, stats = self.rs.decode_stream(corrupted, len(self.payload))
+
+        self.assertEqual(recovered, self.payload)
+        self.assertEqual(stats['errors_corrected'], 60)
+        self.assertEqual(stats['blocks_with_errors'], 4)
+
+    def test_burst_without_interleaving_fails(self):
+        """The same burst is unrecoverable at depth 1."""
+        frame = self.rs.encode_stream(self.payload, interleave_depth=1)
+        corrupted = self.rs.simulate_burst_errors(frame, burst_length=60, start=1100)
+        _, stats = self.rs.decode_stream(corrupted, len(self.payload), interleave_depth=1)
+
+        self.assertFalse(stats['correction_successful'])
+        self.assertTrue(stats['failed_blocks'])
+
+    def test_partial_group_and_short_sequences(self):
+        """Block counts that are not a multiple of the depth round-trip."""
+        for length in (0, 3, 223, 224, 223 * 5 + 7):
+            payload = self.payload[:length]
+            frame = self.rs.encode_stream(payload)
+            recovered, _ = self.rs.decode_stream(frame.encoded, length)
+            self.assertEqual(recovered, payload)
+
+    def test_burst_in_tail_group_is_recovered(self):
+        """Short tail groups and short frames keep the full burst tolerance."""
+        burst = self.rs.interleave_depth * 16
+        for length in (1024, 300):  # 5 blocks (tail of 1) and 2 blocks at depth 4
+            payload = self.payload[:length]
+            frame = self.rs.encode_stream(payload)
+            for start in range(0, len(frame.encoded) - burst + 1, 17):
+                corrupted = self.rs.simulate_burst_errors(frame, burst_length=burst, start=start)
+                recovered, stats = self.rs.decode_stream(corrupted, length)
+                self.assertTrue(stats['correction_successful'], (length, start))
+                self.assertEqual(recovered, payload)
+
+    def test_short_frame_is_padded_to_depth(self):
+        """Frames with fewer blocks than the depth carry zero codewords."""
+        frame = self.rs.encode_stream(self.payload[:300])
+
+        self.assertEqual(frame.block_count, 2)
+        self.assertEqual(len(frame.encoded), 4 * self.rs.block_size)
+
+    def test_invalid_depth_rejected(self):
+        """Depths below 1 are errors rather than the default."""
+        frame = self.rs.encode_stream(self.payload)
+        for depth in (0, -2):
+            with self.assertRaises(ValueError):
+                self.rs.encode_stream(self.payload, interleave_depth=depth)
+            with self.assertRaises(ValueError):
+                self.rs.decode_stream(frame.encoded, len(self.payload), interleave_depth=depth)
+
+    def test_frame_length_mismatch(self):
+        """Truncated frames are rejected."""
+        frame = self.rs.encode_stream(self.payload)
+        with self.assertRaises(ValueError):
+            self.rs.decode_stream(frame.encoded[:-1], len(self.payload))
+
+
+class TestSyndromeDecoder(unittest.TestCase):
+    """Test the table-driven single-block decoder."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        random.seed(99)
+        self.rs = QDPIReedSolomon()
+        self.sequence = bytes([33, 223, 15, 6])
+        self.block = self.rs.encode_sequence(self.sequence)
+
+    def test_clean_block_reports_no_errors(self):
+        """Zero syndromes short-circuit the decoder."""
+        recovered, stats = self.rs.decode_block(self.block.encoded, len(self.sequence))
+
+        self.assertEqual(recovered, self.sequence)
+        self.assertTrue(stats['correction_successful'])
+        self.assertEqual(stats['errors_corrected'], 0)
+
+    def test_error_positions_reported(self):
+        """Errata positions come back from the decoder, not a re-encode diff."""
+        positions = random.sample(range(self.rs.block_size), 16)
+        corrupted = bytearray(self.block.encoded)
+        for pos in positions:
+            corrupted[pos] ^= random.randint(1, 255)
+
+        recovered, stats = self.rs.decode_block(bytes(corrupted), len(self.sequence))
+
+        self.assertEqual(recovered, self.sequence)
+        self.assertEqual(stats['errors_corrected'], 16)
+        self.assertEqual(stats['correction_info']['error_positions'], sorted(positions))
+
+    def test_beyond_capacity_fails(self):
+        """More than 16 errors is reported as a failed correction."""
+        corrupted = bytearray(self.block.encoded)
+        for pos in range(0, 200, 10):
+            corrupted[pos] ^= 0x5a
+
+        _, stats = self.rs.decode_block(bytes(corrupted), len(self.sequence))
+
+        self.assertFalse(stats['correction_successful'])
+
+    def test_block_length_outside_codeword_range_fails(self):
+        """Blocks longer than 255 bytes or shorter than the parity are rejected."""
+        for block in (self.block.encoded + b'\x00', self.block.encoded[:self.rs.parity_size - 1], b''):
+            recovered, stats = self.rs.decode_block(block, len(self.sequence))
+
+            self.assertFalse(stats['correction_successful'])
+            self.assertIn(f"got {len(block)}", stats['correction_info'])
+            self.assertEqual(recovered, block[:len(self.sequence)])
+
+        with self.assertRaises(ValueError):
+            self.rs.calculate_syndromes(np.zeros((1, 256), dtype=np.uint8))
+
+    def test_shortened_block_decodes(self):
+        """Leading zero data bytes may be dropped from a codeword."""
+        data = np.zeros((1, self.rs.data_size), dtype=np.uint8)
+        data[0, -5:] = [1, 2, 3, 4, 5]
+        shortened = self.rs.encode_blocks(data)[0, 200:].tobytes()
+        corrupted = bytearray(shortened)
+        corrupted[3] ^= 0x11
+
+        recovered, stats = self.rs.decode_block(bytes(corrupted), len(shortened))
+
+        self.assertTrue(stats['correction_successful'])
+        self.assertEqual(recovered, shortened[:-self.rs.parity_size])
+
+
+class TestErasureDecoding(unittest.TestCase):
+    """Test errors-and-erasures decoding."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        random.seed(5)
+        self.rs = QDPIReedSolomon()
+        self.sequence = bytes(random.randrange(256) for _ in range(self.rs.data_size))
+        self.block = self.rs.encode_sequence(self.sequence)
+
+    def _corrupt(self, positions):
+        corrupted = bytearray(self.block.encoded)
+        for pos in positions:
+            corrupted[pos] ^= random.randint(1, 255)
+        return bytes(corrupted)
+
+    def test_erasures_extend_capacity(self):
+        """Any mix with 2 * errors + erasures <= 32 is recovered."""
+        for erasure_count in (32, 20, 10):
+            error_count = (self.rs.parity_size - erasure_count) // 2
+            positions = random.sample(range(self.rs.block_size), erasure_count + error_count)
+            corrupted = self._corrupt(positions)
+
+            recovered, stats = self.rs.decode_block(
+                corrupted, len(self.sequence), erasures=positions[:erasure_count]
+            )
+
+            self.assertEqual(recovered, self.sequence)
+            self.assertEqual(stats['errors_corrected'], len(positions))
+            self.assertEqual(stats['erasures_used'], erasure_count)
+
+    def test_clean_erasures_are_harmless(self):
+        """Erasing intact positions corrects nothing there."""
+        corrupted = self._corrupt([7])
+
+        recovered, stats = self.rs.decode_block(corrupted, len(self.sequence), erasures=[3, 7, 100])
+
+        self.assertEqual(recovered, self.sequence)
+        self.assertEqual(stats['correction_info']['error_positions'], [7])
+
+    def test_too_many_erasures_fail(self):
+        """More erasures than parity symbols is reported as a failed correction."""
+        positions = list(range(40))
+        corrupted = self._corrupt(positions)
+
+        _, stats = self.rs.decode_block(corrupted, len(self.sequence), erasures=positions)
+
+        self.assertFalse(stats['correction_successful'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the disk-backed QDPI segment store.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from dataclasses import dataclass
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.app.qdpi_segment_store import QDPISegmentStore
+
+
+@dataclass
+class Block:
+    """Minimal stored record."""
+    block_id: int
+    payload: bytes
+    label: str
+
+    def to_record(self):
+        return {'label': self.label}, self.payload
+
+    @classmethod
+    def from_record(cls, block_id, meta, data):
+        return cls(block_id, bytes(data), meta['label'])
+
+
+class TestQDPISegmentStore(unittest.TestCase):
+    """Test the append-only segment store."""
+
+    def setUp(self):
+        """Set up a store in a scratch directory."""
+        self.directory = tempfile.mkdtemp()
+        self.store = self._open_store()
+
+    def tearDown(self):
+        """Close the store and remove its files."""
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def _open_store(self, **kwargs):
+        options = {'segment_bytes': 4096, 'cache_size': 8, 'compaction_interval': 0}
+        options.update(kwargs)
+        return QDPISegmentStore(self.directory, Block, **options)
+
+    def _block(self, block_id):
+        return Block(block_id, bytes([block_id % 256]) * 255, f"block {block_id}")
+
+    def test_round_trip_and_restart(self):
+        """Blocks survive a restart and are served from disk."""
+        for block_id in range(100):
+            self.store[block_id] = self._block(block_id)
+        self.store.close()
+
+        self.store = self._open_store()
+        self.assertEqual(len(self.store), 100)
+        self.assertEqual(self.store.max_block_id(), 99)
+        self.assertEqual(self.store[42], self._block(42))
+        self.assertNotIn(100, self.store)
+        self.assertIsNone(self.store.get(100))
+
+    def test_cache_is_bounded(self):
+        """Only the hot entries stay decoded in memory."""
+        for block_id in range(100):
+            self.store[block_id] = self._block(block_id)
+        for block_id in range(100):
+            self.assertEqual(self.store[block_id].label, f"block {block_id}")
+
+        stats = self.store.get_stats()
+        self.assertEqual(stats['cached_blocks'], 8)
+        self.assertGreater(stats['segments'], 1)
+
+    def test_compaction_reclaims_deleted_blocks(self):
+        """Compaction drops dead records and deletes stay deleted across restarts."""
+        for block_id in range(100):
+            self.store[block_id] = self._block(block_id)
+        for block_id in range(90):
+            del self.store[block_id]
+        self.store[95] = Block(95, b'rewritten', 'block 95 v2')
+        disk_before = self.store.get_stats()['disk_bytes']
+
+        self.assertGreater(self.store.compact(), 0)
+        self.assertLess(self.store.get_stats()['disk_bytes'], disk_before)
+        self.store.close()
+
+        self.store = self._open_store()
+        self.assertEqual(sorted(self.store), list(range(90, 100)))
+        self.assertEqual(self.store[95].payload, b'rewritten')
+        self.assertEqual(self.store[91], self._block(91))
+
+    def test_retention_drops_oldest_blocks(self):
+        """Past max_blocks the least recently written blocks are tombstoned and reclaimed."""
+        self.store.close()
+        self.store = self._open_store(max_blocks=10)
+        for block_id in range(100):
+            self.store[block_id] = self._block(block_id)
+        self.store[90] = self._block(90)  # rewriting makes a block the newest again
+        self.store[100] = self._block(100)
+
+        self.assertEqual(sorted(self.store), [90] + list(range(92, 101)))
+        self.assertEqual(self.store.get_stats()['evictions'], 91)
+        self.assertGreater(self.store.compact(), 0)
+        self.store.close()
+
+        # Limits also apply to what an earlier, unbounded run left behind
+        self.store = self._open_store(max_blocks=5)
+        self.assertEqual(sorted(self.store), [90, 97, 98, 99, 100])
+
+    def test_retention_by_live_bytes(self):
+        """max_live_bytes bounds the data kept on disk."""
+        self.store.close()
+        record = len(QDPISegmentStore._pack(0, 0, 0, {'label': 'block 10'}, b'x' * 255))
+        self.store = self._open_store(max_live_bytes=3 * record)
+        for block_id in range(10, 20):
+            self.store[block_id] = self._block(block_id)
+
+        self.assertEqual(sorted(self.store), [17, 18, 19])
+        self.assertLessEqual(self.store.get_stats()['live_bytes'], 3 * record)
+
+    def test_torn_tail_is_dropped(self):
+        """A partially written record from a crash is truncated on recovery."""
+        for block_id in range(3):
+            self.store[block_id] = self._block(block_id)
+        self.store.close()
+
+        segment = sorted(Path(self.directory).glob("segment-*.qseg"))[-1]
+        with open(segment, 'ab') as f:
+            f.write(b'\x01\x02\x03partial')
+
+        self.store = self._open_store()
+        self.assertEqual(len(self.store), 3)
+        self.store[3] = self._block(3)
+        self.assertEqual(self.store[3], self._block(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
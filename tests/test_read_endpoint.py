@@ -13,6 +13,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from fastapi.testclient import TestClient
 
+from cql_fakes import FakeResponseFuture
+
 # Mock Cassandra and other dependencies before importing the app
 sys.modules['cassandra.cluster'] = Mock()
 sys.modules['cassandra.auth'] = Mock()
@@ -55,9 +57,7 @@ class TestReadEndpoint(unittest.TestCase):
             page_index=1
         )
         
-        mock_result = Mock()
-        mock_result.one.return_value = mock_row
-        mock_session.execute.return_value = mock_result
+        mock_session.execute_async.return_value = FakeResponseFuture([mock_row])
         
         # Make request
         response = self.client.post("/read/001-test-page")
@@ -77,9 +77,7 @@ class TestReadEndpoint(unittest.TestCase):
     def test_read_nonexistent_page(self, mock_session):
         """Test reading a page that doesn't exist."""
         # Mock database returning no results
-        mock_result = Mock()
-        mock_result.one.return_value = None
-        mock_session.execute.return_value = mock_result
+        mock_session.execute_async.return_value = FakeResponseFuture([])
         
         # Make request
         response = self.client.post("/read/nonexistent-page")
@@ -103,7 +101,9 @@ class TestReadEndpoint(unittest.TestCase):
     def test_read_page_database_error(self, mock_session):
         """Test handling database errors."""
         # Mock database raising an exception
-        mock_session.execute.side_effect = Exception("Database connection error")
+        mock_session.execute_async.return_value = FakeResponseFuture(
+            error=Exception("Database connection error")
+        )
         
         # Make request
         response = self.client.post("/read/test-page")
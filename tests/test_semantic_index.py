@@ -13,6 +13,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from fastapi.testclient import TestClient
 
+from cql_fakes import FakeResponseFuture
+
 # Mock dependencies before importing the app
 sys.modules['cassandra.cluster'] = Mock()
 sys.modules['cassandra.auth'] = Mock()
@@ -37,10 +39,14 @@ class TestSemanticIndex(unittest.TestCase):
         """Set up test fixtures."""
         # Import after mocking dependencies
         from backend.app.retrieval_api import app
+        from backend.app.embedding_cache import get_embedding_cache
         self.client = TestClient(app)
+        
+        # Each test supplies its own embedding; start from a cold cache
+        get_embedding_cache().clear()
     
     @patch('backend.app.retrieval_api.cassandra_session')
-    @patch('backend.app.retrieval_api.get_embedding')
+    @patch('backend.app.retrieval_api._compute_embedding')
     @patch('backend.app.retrieval_api.tokenizer_service')
     @patch('backend.app.retrieval_api.truncate_to_tokens')
     def test_semantic_search_basic(self, mock_truncate, mock_tokenizer, mock_embedding, mock_session):
@@ -74,7 +80,7 @@ class TestSemanticIndex(unittest.TestCase):
             )
         ]
         
-        mock_session.execute.return_value = mock_rows
+        mock_session.execute_async.return_value = FakeResponseFuture(mock_rows)
         
         # Make search request
         response = self.client.post("/index", json={
@@ -104,7 +110,7 @@ class TestSemanticIndex(unittest.TestCase):
         self.assertEqual(results[1]["score"], 0.87)
     
     @patch('backend.app.retrieval_api.cassandra_session')
-    @patch('backend.app.retrieval_api.get_embedding')
+    @patch('backend.app.retrieval_api._compute_embedding')
     @patch('backend.app.retrieval_api.tokenizer_service')
     @patch('backend.app.retrieval_api.truncate_to_tokens')
     def test_semantic_search_with_character_filter(self, mock_truncate, mock_tokenizer, mock_embedding, mock_session):
@@ -130,7 +136,7 @@ class TestSemanticIndex(unittest.TestCase):
             )
         ]
         
-        mock_session.execute.return_value = mock_rows
+        mock_session.execute_async.return_value = FakeResponseFuture(mock_rows)
         
         # Make filtered search request
         response = self.client.post("/index", json={
@@ -178,7 +184,7 @@ class TestSemanticIndex(unittest.TestCase):
         self.assertIn("Database not available", data["detail"])
     
     @patch('backend.app.retrieval_api.cassandra_session')
-    @patch('backend.app.retrieval_api.get_embedding')
+    @patch('backend.app.retrieval_api._compute_embedding')
     @patch('backend.app.retrieval_api.tokenizer_service')
     def test_semantic_search_embedding_error(self, mock_tokenizer, mock_embedding, mock_session):
         """Test handling of embedding generation errors."""
@@ -222,7 +228,7 @@ class TestSemanticIndex(unittest.TestCase):
         self.assertEqual(response.status_code, 422)
     
     @patch('backend.app.retrieval_api.cassandra_session')
-    @patch('backend.app.retrieval_api.get_embedding')
+    @patch('backend.app.retrieval_api._compute_embedding')
     @patch('backend.app.retrieval_api.tokenizer_service')
     @patch('backend.app.retrieval_api.truncate_to_tokens')
     def test_preview_truncation(self, mock_truncate, mock_tokenizer, mock_embedding, mock_session):
@@ -249,7 +255,7 @@ class TestSemanticIndex(unittest.TestCase):
             )
         ]
         
-        mock_session.execute.return_value = mock_rows
+        mock_session.execute_async.return_value = FakeResponseFuture(mock_rows)
         
         # Make search request
         response = self.client.post("/index", json={
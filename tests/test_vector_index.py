@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the resident vector index behind semantic page search.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Mock dependencies before importing the database
+sys.modules.setdefault('cassandra', Mock())
+sys.modules.setdefault('cassandra.cluster', Mock())
+sys.modules.setdefault('cassandra.auth', Mock())
+sys.modules.setdefault('cassandra.policies', Mock())
+sys.modules.setdefault('cassandra.query', Mock())
+
+from backend.app.vector_buckets import embedding_bucket
+from backend.app import vector_index
+from backend.app.vector_index import VectorIndex, top_k_similar
+from backend.app.cassandra_database_v2 import ProductionCassandraDatabase
+
+
+class TestVectorIndex(unittest.TestCase):
+    """Test exact top-k search and incremental updates."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(3)
+        self.vectors = rng.normal(size=(500, 32)).astype(np.float32)
+        self.ids = [f"page-{i}" for i in range(500)]
+        self.index = VectorIndex(initial_capacity=16)
+        self.index.add_many(list(zip(self.ids, self.vectors)))
+
+    def _brute_force(self, query, top_k):
+        normed = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        scores = normed @ (query / np.linalg.norm(query))
+        order = np.argsort(-scores)[:top_k]
+        return [self.ids[i] for i in order], scores[order]
+
+    def test_matches_brute_force(self):
+        """Top-k ids and cosine scores match a full sort."""
+        query = self.vectors[7] + 0.1
+        expected_ids, expected_scores = self._brute_force(query, 10)
+
+        results = self.index.search(query, top_k=10)
+
+        self.assertEqual([r[0] for r in results], expected_ids)
+        np.testing.assert_allclose([r[1] for r in results], expected_scores, rtol=1e-5)
+
+    def test_upsert_and_remove(self):
+        """Replacing and removing vectors is reflected in search."""
+        self.index.add('page-3', -self.vectors[3])
+        self.assertEqual(len(self.index), 500)
+        self.assertNotEqual(self.index.search(self.vectors[3], top_k=1)[0][0], 'page-3')
+
+        self.assertTrue(self.index.remove('page-9'))
+        self.assertNotIn('page-9', [r[0] for r in self.index.search(self.vectors[9], top_k=5)])
+
+        self.index.add('page-new', self.vectors[9])
+        self.assertEqual(self.index.search(self.vectors[9], top_k=1)[0][0], 'page-new')
+        self.assertEqual(self.index.get_stats()['vectors'], 500)
+
+    def test_exclude(self):
+        """Excluded ids are skipped without shrinking the result list."""
+        results = self.index.search(self.vectors[0], top_k=3, exclude=['page-0'])
+
+        self.assertEqual(len(results), 3)
+        self.assertNotIn('page-0', [r[0] for r in results])
+
+    def test_dimension_mismatch(self):
+        """Vectors of the wrong size are rejected."""
+        with self.assertRaises(ValueError):
+            self.index.add('bad', [1.0, 2.0])
+
+    def test_search_batch_matches_single_queries(self):
+        """A batch of queries returns what each query returns alone."""
+        queries = self.vectors[:4] + 0.05
+
+        batch = self.index.search_batch(queries, top_k=5)
+
+        for results, query in zip(batch, queries):
+            single = self.index.search(query, top_k=5)
+            self.assertEqual([r[0] for r in results], [r[0] for r in single])
+            np.testing.assert_allclose([r[1] for r in results], [r[1] for r in single], rtol=1e-5)
+
+
+class FakeHnswIndex:
+    """Brute-force stand-in for hnswlib.Index with its label and slot bookkeeping."""
+
+    def __init__(self, space, dim):
+        self.vectors, self.labels, self.deleted = [], [], set()
+        self.ef = 10
+        self.failures = 0
+
+    def init_index(self, max_elements, M, ef_construction, allow_replace_deleted):
+        pass
+
+    def resize_index(self, capacity):
+        pass
+
+    def set_ef(self, ef):
+        self.ef = ef
+
+    def add_items(self, data, ids, replace_deleted=False):
+        for vector, label in zip(data, ids):
+            if replace_deleted and self.deleted:
+                # Like hnswlib, any deleted slot may be recycled for the label
+                slot = min(self.deleted)
+                self.deleted.discard(slot)
+                self.vectors[slot], self.labels[slot] = vector, label
+            elif label in self.labels:
+                self.vectors[self.labels.index(label)] = vector
+            else:
+                self.vectors.append(vector)
+                self.labels.append(label)
+
+    def mark_deleted(self, label):
+        self.deleted.add(self.labels.index(label))
+
+    def knn_query(self, queries, k):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Cannot return the results in a contiguous 2D array. Probably ef or M is too small")
+        live = [slot for slot in range(len(self.labels)) if slot not in self.deleted]
+        scores = queries @ np.asarray([self.vectors[slot] for slot in live]).T
+        order = np.argsort(-scores, axis=1)[:, :k]
+        labels = np.asarray([[self.labels[live[i]] for i in row] for row in order])
+        return labels, 1.0 - np.take_along_axis(scores, order, axis=1)
+
+
+class TestHnswIndex(unittest.TestCase):
+    """Test graph bookkeeping in HNSW mode."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        for patcher in (patch.object(vector_index, 'HNSW_AVAILABLE', True),
+                        patch.object(vector_index, 'hnswlib', Mock(Index=FakeHnswIndex))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.vectors = np.eye(4, dtype=np.float32)
+        self.index = VectorIndex(mode='hnsw', initial_capacity=4)
+        self.index.add_many([(f"page-{i}", vector) for i, vector in enumerate(self.vectors)])
+
+    def test_updating_live_row_does_not_take_deleted_slot(self):
+        self.index.remove('page-0')
+        self.index.add('page-1', self.vectors[1] + 0.1 * self.vectors[2])
+
+        results = self.index.search(self.vectors[1], top_k=3)
+
+        self.assertEqual([r[0] for r in results], ['page-1', 'page-2', 'page-3'])
+        self.assertEqual(len(self.index._hnsw.deleted), 1)
+
+    def test_reinsert_reuses_deleted_slot(self):
+        self.index.remove('page-2')
+        self.index.add_many([('page-new', self.vectors[2]), ('page-new', self.vectors[2])])
+
+        self.assertEqual(self.index.search(self.vectors[2], top_k=1)[0][0], 'page-new')
+        self.assertEqual((len(self.index._hnsw.labels), self.index._hnsw.deleted), (4, set()))
+
+    def test_short_graph_walk_retries_then_falls_back_to_exact(self):
+        self.index._hnsw.failures = 1
+        self.assertEqual(self.index.search(self.vectors[3], top_k=1)[0][0], 'page-3')
+
+        self.index._hnsw.failures = 2
+        self.assertEqual(self.index.search(self.vectors[0], top_k=1)[0][0], 'page-0')
+        self.assertEqual(self.index._hnsw.ef, self.index.hnsw_ef_search)
+
+
+class TestMatrixSimilarity(unittest.TestCase):
+    """Test the top-k kernel shared with VectorEmbeddingService."""
+
+    def test_top_k_similar_batch(self):
+        """Every query row gets its own best-first top-k."""
+        rng = np.random.default_rng(8)
+        candidates = rng.normal(size=(300, 16))
+        queries = rng.normal(size=(3, 16))
+
+        indices, scores = top_k_similar(queries, candidates, 7)
+
+        normed = candidates / np.linalg.norm(candidates, axis=1, keepdims=True)
+        for row, query in enumerate(queries):
+            expected = normed @ (query / np.linalg.norm(query))
+            np.testing.assert_array_equal(indices[row], np.argsort(-expected)[:7])
+            np.testing.assert_allclose(scores[row], np.sort(expected)[::-1][:7], rtol=1e-5)
+
+    def test_top_k_larger_than_candidates(self):
+        """Asking for more matches than candidates returns them all, sorted."""
+        indices, scores = top_k_similar([1.0, 0.0], [[0.0, 1.0], [1.0, 0.0]], 10)
+
+        self.assertEqual(indices.tolist(), [[1, 0]])
+        self.assertTrue((np.diff(scores[0]) <= 0).all())
+
+
+class TestSearchSimilarPages(unittest.TestCase):
+    """Test the database search path against the resident index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.db = ProductionCassandraDatabase()
+        self.db.vector_service = Mock()
+        self.db.vector_service.embed_text = AsyncMock(
+            return_value=Mock(embedding=[1.0, 0.0, 0.0])
+        )
+        self.db.get_page = AsyncMock(side_effect=lambda page_id: Mock(id=page_id))
+        self.db.get_pages_many = AsyncMock(side_effect=lambda page_ids: [Mock(id=page_id) for page_id in page_ids])
+
+    def stargate_buckets(self, rows, legacy=None, page_size=None, migrated=True):
+        """Fake Stargate serving embeddings from their buckets and the legacy partition."""
+        async def request(method, table, data=None, params=None):
+            where = {column: cond['$eq'] for column, cond in json.loads(params['where']).items()}
+            if table == 'vector_bucket_migrations':
+                return {'data': [{'content_type': where['content_type'], 'buckets': 16}] if migrated else []}
+            if table == 'vector_embeddings':
+                matching = legacy or []
+            else:
+                matching = [row for row in rows
+                            if embedding_bucket(row['content_id'], self.db.embedding_buckets) == where['bucket']]
+            start = int(params.get('page-state') or 0)
+            end = start + (page_size or len(matching) or 1)
+            response = {'data': matching[start:end]}
+            if end < len(matching):
+                response['pageState'] = str(end)
+            return response
+        return AsyncMock(side_effect=request)
+
+    def bucket_reads(self):
+        return [call for call in self.db._stargate_request.await_args_list
+                if call.args[1] == 'vector_embeddings_by_bucket']
+
+    def test_loads_once_and_pages_through_stargate(self):
+        """Embeddings are loaded page by page once, then served from memory."""
+        self.db.embedding_buckets = 1
+        self.db._stargate_request = self.stargate_buckets([
+            {'content_id': 'a', 'embedding': [1.0, 0.0, 0.0]},
+            {'content_id': 'b', 'embedding': [0.0, 1.0, 0.0]},
+        ], page_size=1)
+
+        async def run():
+            first = await self.db.search_similar_pages("query", limit=2)
+            second = await self.db.search_similar_pages("query", limit=1)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual([page.id for page, _ in first], ['a', 'b'])
+        self.assertEqual([page.id for page, _ in second], ['a'])
+        bucket_reads = self.bucket_reads()
+        self.assertEqual(len(bucket_reads), 2)
+        self.assertEqual(bucket_reads[1].kwargs['params']['page-state'], '1')
+
+    def test_fans_out_over_buckets(self):
+        """Every bucket of the content type is read and the results merged."""
+        rows = [{'content_id': f'page-{i}', 'embedding': [1.0, i / 10.0, 0.0]} for i in range(10)]
+        self.db._stargate_request = self.stargate_buckets(rows)
+
+        index = asyncio.run(self.db._get_vector_index('page'))
+
+        self.assertEqual(len(index), 10)
+        buckets = {json.loads(call.kwargs['params']['where'])['bucket']['$eq'] for call in self.bucket_reads()}
+        self.assertEqual(buckets, set(range(self.db.embedding_buckets)))
+        self.assertGreater(len({embedding_bucket(row['content_id']) for row in rows}), 1)
+
+    def test_merges_legacy_partition_until_migrated(self):
+        """Before the bucket migration, legacy embeddings load under the bucketed ones."""
+        self.db._stargate_request = self.stargate_buckets([
+            {'content_id': 'new', 'embedding': [0.0, 1.0, 0.0]},
+            {'content_id': 'a', 'embedding': [0.0, 0.0, 1.0]},
+        ], legacy=[
+            {'content_id': 'a', 'embedding': [1.0, 0.0, 0.0]},
+            {'content_id': 'old', 'embedding': [1.0, 1.0, 0.0]},
+        ], migrated=False)
+
+        index = asyncio.run(self.db._get_vector_index('page'))
+
+        self.assertEqual(len(index), 3)
+        self.assertIn('old', index)
+        # The bucketed copy of 'a' wins over the legacy one
+        self.assertEqual(index.search([0.0, 0.0, 1.0], top_k=1)[0][0], 'a')
+
+    def test_skips_legacy_partition_after_migration(self):
+        """Once the migration is recorded, the legacy partition is not read."""
+        self.db._stargate_request = self.stargate_buckets([], legacy=[
+            {'content_id': 'old', 'embedding': [1.0, 0.0, 0.0]},
+        ])
+
+        index = asyncio.run(self.db._get_vector_index('page'))
+
+        self.assertNotIn('old', index)
+        tables = {call.args[1] for call in self.db._stargate_request.await_args_list}
+        self.assertNotIn('vector_embeddings', tables)
+
+    def test_failed_bucket_leaves_index_unloaded(self):
+        """A failed bucket read is retried on the next search instead of serving a partial index."""
+        self.db._stargate_request = AsyncMock(return_value={})
+
+        asyncio.run(self.db.load_vector_index('page'))
+
+        self.assertNotIn('page', self.db.vector_indexes)
+
+    def test_embeddings_written_to_their_bucket(self):
+        """New embeddings go to the bucketed table under their hash bucket."""
+        self.db._stargate_request = AsyncMock(return_value={})
+
+        asyncio.run(self.db._insert_vector_embedding(
+            Mock(content_type='page', content_id='page-7', embedding=[1.0], model='m', metadata={})
+        ))
+
+        args = self.db._stargate_request.await_args
+        self.assertEqual(args.args[:2], ('POST', 'vector_embeddings_by_bucket'))
+        self.assertEqual(args.kwargs['data']['bucket'], embedding_bucket('page-7'))
+
+    def test_new_embeddings_indexed_incrementally(self):
+        """Stored embeddings join the loaded index without a reload."""
+        self.db._stargate_request = AsyncMock(return_value={'data': []})
+
+        async def run():
+            await self.db._get_vector_index('page')
+            self.db._index_embedding(Mock(content_type='page', content_id='c', embedding=[1.0, 0.0, 0.0]))
+            return await self.db.search_similar_pages("query", limit=1)
+
+        results = asyncio.run(run())
+
+        self.assertEqual([page.id for page, _ in results], ['c'])
+        # Buckets, the migration marker and the (unmigrated) legacy partition, each read once
+        self.assertEqual(self.db._stargate_request.await_count, self.db.embedding_buckets + 2)
+
+    def test_related_pages_reuse_indexed_vector(self):
+        """Related pages come from the stored vector, excluding the page itself."""
+        self.db._stargate_request = self.stargate_buckets([
+            {'content_id': 'a', 'embedding': [1.0, 0.0, 0.0]},
+            {'content_id': 'b', 'embedding': [0.9, 0.1, 0.0]},
+            {'content_id': 'c', 'embedding': [0.0, 0.0, 1.0]},
+        ])
+
+        results = asyncio.run(self.db.get_related_pages('a', limit=2))
+
+        self.assertEqual([page.id for page, _ in results], ['b', 'c'])
+        self.db.vector_service.embed_text.assert_not_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()